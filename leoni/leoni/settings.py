@@ -68,6 +68,7 @@ SIMPLE_JWT = {
 #
 
 MIDDLEWARE = [
+    'xmlprocessor.middleware.StageTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -178,3 +179,89 @@ DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'     
 
+# Uploads are hashed (SHA-256) as they stream in and kept in memory up to
+# SBOM_UPLOAD_SPILL_BYTES, then spooled to a temporary file
+FILE_UPLOAD_HANDLERS = ['xmlprocessor.upload_handlers.HashingFileUploadHandler']
+SBOM_UPLOAD_SPILL_BYTES = int(os.environ.get('SBOM_UPLOAD_SPILL_BYTES', 2.5 * 1024 * 1024))
+
+# SBOM validation
+SBOM_NLP_MODEL = 'en_core_web_sm'
+SBOM_NLP_PREWARM = os.environ.get('SBOM_NLP_PREWARM', '0') == '1'
+
+# Validation results keyed by SBOM/DPF content hashes, shared by all workers on the host.
+# MAX_ENTRIES and TIMEOUT bound the cache by count and age.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'validation_results': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'validation_results',
+        'TIMEOUT': 60 * 60 * 24 * 7,
+        'OPTIONS': {
+            'MAX_ENTRIES': 500,
+            'CULL_FREQUENCY': 4,
+        },
+    },
+}
+SBOM_RESULT_CACHE_ENABLED = True
+SBOM_RESULT_CACHE_MAX_ENTRY_BYTES = 5 * 1024 * 1024
+
+# Background validation jobs (python manage.py run_validation_workers)
+SBOM_JOB_CONCURRENCY = int(os.environ.get('SBOM_JOB_CONCURRENCY', os.cpu_count() or 2))
+SBOM_JOB_QUEUE_MAX = 50
+SBOM_JOB_POLL_INTERVAL = 1.0
+# A job still 'running' this long after it started is taken to have lost its worker and is
+# queued again, up to SBOM_JOB_MAX_ATTEMPTS runs in total (then it is marked failed)
+SBOM_JOB_LEASE_SECONDS = 30 * 60
+SBOM_JOB_MAX_ATTEMPTS = 3
+
+# Per-stage timings of validation requests: Server-Timing header, 'xmlprocessor.timing' log lines
+# and histograms at /api/metrics/. TRACE_MEMORY adds tracemalloc peaks (slow, diagnostics only).
+SBOM_INSTRUMENTATION_ENABLED = os.environ.get('SBOM_INSTRUMENTATION', '0') == '1'
+SBOM_INSTRUMENTATION_TRACE_MEMORY = os.environ.get('SBOM_INSTRUMENTATION_TRACE_MEMORY', '0') == '1'
+# Bearer token /api/metrics/ requires (set it as the scraper's bearer_token); unset, it isn't served
+SBOM_METRICS_TOKEN = os.environ.get('SBOM_METRICS_TOKEN', '')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'xmlprocessor.timing': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+        'xmlprocessor.jobs': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Processes the twisted wire and wire length checks are spread over, per sbom. 1 keeps
+# validation in the request process, 0 uses one per core. Each web worker process gets its own
+# pool, so size this against the server's worker count; background jobs validate in-process.
+SBOM_VALIDATION_WORKERS = int(os.environ.get('SBOM_VALIDATION_WORKERS', '1'))
+
+# Parsed SBOM/DPF snapshots keyed by file content, shared by every process on the host
+SBOM_ARTIFACT_CACHE_ENABLED = True
+SBOM_ARTIFACT_CACHE_DIR = BASE_DIR / 'cache' / 'artifacts'
+SBOM_ARTIFACT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Bulk validation (validate/batch/ and manage.py validate_batch): worker processes for the
+# SBOM x DPF pairs (1, the default, = in-process, 0 = one per core), and limits on a single
+# batch. As with SBOM_VALIDATION_WORKERS every web worker process gets its own pool, so size
+# this against the server's worker count; manage.py validate_batch --workers overrides it.
+SBOM_BATCH_WORKERS = int(os.environ.get('SBOM_BATCH_WORKERS', '1'))
+SBOM_BATCH_MAX_ITEMS = 1000
+SBOM_BATCH_MAX_ARCHIVE_BYTES = 500 * 1024 * 1024
+
+# SBOM XML parser: 'stdlib' (streaming ElementTree, memory bounded by document depth) or
+# 'lxml' (one libxml2 parse + compiled XPath; a little faster with the validation projection
+# but holds the whole tree). lxml falls back to stdlib when it isn't installed.
+SBOM_XML_ENGINE = os.environ.get('SBOM_XML_ENGINE', 'stdlib')
+
+# Read the DPF workbook concurrently with the SBOM XML while building a validator:
+# 'process' (spawned workers, sidesteps the GIL; the parsed workbook is pickled back),
+# 'thread', or 'none' (the default) to parse one after the other. Measure before turning it
+# on: the overlap only pays off when both files are large. SBOM_PARSE_WORKERS sizes the pool.
+# Background jobs always parse in-process.
+SBOM_PARSE_CONCURRENCY = os.environ.get('SBOM_PARSE_CONCURRENCY', 'none')
+SBOM_PARSE_WORKERS = int(os.environ.get('SBOM_PARSE_WORKERS', '2'))
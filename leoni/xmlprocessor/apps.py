@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class XmlprocessorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'xmlprocessor'
+
+    def ready(self):
+        # Load the spaCy pipeline once per worker at boot instead of on the first NLP request
+        if getattr(settings, 'SBOM_NLP_PREWARM', False):
+            from .nlp import warm_up
+            warm_up()
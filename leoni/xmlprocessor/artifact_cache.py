@@ -0,0 +1,136 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+from django.conf import settings
+
+from . import columnar, hierarchy, utils, xml_engines
+
+# Bump when the snapshot layout changes in a way the parser source hash wouldn't catch
+SNAPSHOT_FORMAT = 1
+_MAGIC = b'SBOMSNAP'
+_SUFFIX = '.snap'
+
+
+def _parser_version():
+    digest = hashlib.sha256(str(SNAPSHOT_FORMAT).encode())
+    for module in (utils, columnar, hierarchy, xml_engines):
+        with open(module.__file__, 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:16]
+
+
+# Snapshots written by other parser code are never read back (LRU eviction removes them)
+PARSER_VERSION = _parser_version()
+
+
+def content_sha256(source):
+    """SHA-256 of a file path or file object (rewound afterwards); uploads carry it already."""
+    if getattr(source, 'sha256', None):
+        return source.sha256
+    digest = hashlib.sha256()
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    source.seek(0)
+    chunks = source.chunks() if hasattr(source, 'chunks') else iter(lambda: source.read(1024 * 1024), b'')
+    for chunk in chunks:
+        digest.update(chunk)
+    source.seek(0)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """
+    Parsed SBOM/DPF structures stored on local disk as versioned pickles, keyed by the
+    content hash of the source file. Files are written atomically, so any number of worker
+    processes can share the directory; a file's mtime is its last use, and the least
+    recently used snapshots are deleted once the directory outgrows max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, kind, source, variant=''):
+        parts = [PARSER_VERSION, kind, content_sha256(source), repr(variant)]
+        return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def load(self, key):
+        """The snapshot stored under key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(_MAGIC)) != _MAGIC:
+                    return None
+                data = pickle.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Truncated or stale snapshot: drop it and reparse
+            self._remove(path)
+            return None
+        return data
+
+    def store(self, key, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_MAGIC)
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used snapshots until the directory fits in max_bytes."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            self._remove(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_cache = None
+
+
+def get_artifact_cache():
+    """The configured cache, or None when SBOM_ARTIFACT_CACHE_ENABLED is off."""
+    global _cache
+    if not getattr(settings, 'SBOM_ARTIFACT_CACHE_ENABLED', False):
+        return None
+    if _cache is None:
+        _cache = ArtifactCache(settings.SBOM_ARTIFACT_CACHE_DIR, settings.SBOM_ARTIFACT_CACHE_MAX_BYTES)
+    return _cache
@@ -0,0 +1,208 @@
+import os
+import time
+import zipfile
+from concurrent.futures import BrokenExecutor, as_completed
+
+from django.conf import settings
+
+from .parallel import discard
+from .utils import SBOMValidator
+
+ISSUE_KEYS = ("workcenter_validation", "mismatches", "wire_length_validation", "component_validation")
+
+SBOM_EXTENSIONS = ('.xml',)
+DPF_EXTENSIONS = ('.xlsx', '.xlsm')
+
+# Parsed DPFs kept by each worker process, so a DPF is read once per worker, not once per SBOM
+_dpf_cache = {}
+_DPF_CACHE_SIZE = 8
+
+
+class BatchError(Exception):
+    pass
+
+
+def _load_dpf(path, artifact_cache=None):
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    excel_data = _dpf_cache.get(key)
+    if excel_data is None:
+        dpf = SBOMValidator(
+            excel_file_path=path,
+            excel_sheets=SBOMValidator.VALIDATION_SHEETS,
+            excel_columns=SBOMValidator.VALIDATION_COLUMNS,
+            artifact_cache=artifact_cache
+        )
+        dpf.close()
+        excel_data = dpf.excel_data
+        if len(_dpf_cache) >= _DPF_CACHE_SIZE:
+            _dpf_cache.pop(next(iter(_dpf_cache)))
+        _dpf_cache[key] = excel_data
+    return excel_data
+
+
+def validate_item(sbom, dpf, workcenter, artifact_cache=None):
+    """
+    Validate one (label, path) SBOM against one (label, path) DPF and return the item result.
+    Runs in the batch worker processes, so it only takes picklable arguments.
+    """
+    started = time.perf_counter()
+    item = {'sbom': sbom[0], 'dpf': dpf[0]}
+    try:
+        validator = SBOMValidator(
+            xml_file_path=sbom[1],
+            xml_attributes=SBOMValidator.VALIDATION_ATTRIBUTES,
+            artifact_cache=artifact_cache
+        )
+        # Validation only reads the DPF structures, so one parsed copy serves every SBOM
+        validator.excel_data = _load_dpf(dpf[1], artifact_cache)
+        for attribute, value in workcenter.items():
+            setattr(validator, attribute, value)
+        results = validator.validate()
+        item['status'] = results['status']
+        item['message'] = results['message']
+        item['issues'] = {key: results.get(key, []) for key in ISSUE_KEYS}
+    except Exception as e:
+        item['status'] = 'error'
+        item['message'] = str(e)
+        item['issues'] = {}
+    item['seconds'] = round(time.perf_counter() - started, 3)
+    return item
+
+
+class BatchSummary:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.items = 0
+        self.statuses = {}
+        self.issues = {key: 0 for key in ISSUE_KEYS}
+
+    def add(self, item):
+        self.items += 1
+        self.statuses[item['status']] = self.statuses.get(item['status'], 0) + 1
+        for key, messages in item['issues'].items():
+            self.issues[key] += len(messages)
+
+    def as_dict(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            'items': self.items,
+            'statuses': self.statuses,
+            'issues': self.issues,
+            'seconds': round(elapsed, 3),
+            'items_per_second': round(self.items / elapsed, 2) if elapsed else None,
+        }
+
+
+def run_batch(sboms, dpfs, workcenter, executor=None, artifact_cache=None):
+    """
+    Validate every SBOM against every DPF ((label, path) pairs). Checks the batch right away
+    (raising BatchError) and returns a generator yielding one {'type': 'item', ...} per pair as
+    it finishes, then a {'type': 'summary', ...}. With an executor the pairs run across its
+    worker processes.
+    """
+    if not sboms:
+        raise BatchError("No SBOM files to validate")
+    if not dpfs:
+        raise BatchError("No DPF files to validate against")
+    max_items = getattr(settings, 'SBOM_BATCH_MAX_ITEMS', 1000)
+    if len(sboms) * len(dpfs) > max_items:
+        raise BatchError(f"Batch of {len(sboms) * len(dpfs)} validations exceeds the limit of {max_items}")
+    return _iter_batch(sboms, dpfs, workcenter, executor, artifact_cache)
+
+
+def _iter_batch(sboms, dpfs, workcenter, executor, artifact_cache):
+    summary = BatchSummary()
+    pairs = [(sbom, dpf) for dpf in dpfs for sbom in sboms]
+
+    if executor is None:
+        try:
+            for sbom, dpf in pairs:
+                item = validate_item(sbom, dpf, workcenter, artifact_cache)
+                summary.add(item)
+                yield dict(item, type='item')
+        finally:
+            _dpf_cache.clear()
+    else:
+        if artifact_cache is not None:
+            # Parse each DPF once up front; the workers then only load the snapshots
+            for _, path in dpfs:
+                SBOMValidator(
+                    excel_file_path=path,
+                    excel_sheets=SBOMValidator.VALIDATION_SHEETS,
+                    excel_columns=SBOMValidator.VALIDATION_COLUMNS,
+                    artifact_cache=artifact_cache
+                ).close()
+        futures = []
+        try:
+            futures = [executor.submit(validate_item, sbom, dpf, workcenter, artifact_cache) for sbom, dpf in pairs]
+            for future in as_completed(futures):
+                item = future.result()
+                summary.add(item)
+                yield dict(item, type='item')
+        except BrokenExecutor:
+            # Let the next batch start a new pool
+            discard(executor)
+            raise
+        finally:
+            # Client went away mid-stream: don't leave the rest of the batch queued
+            for future in futures:
+                future.cancel()
+
+    yield dict(summary.as_dict(), type='summary')
+
+
+def extract_archive(archive, directory):
+    """
+    Unpack the SBOMs (.xml) and DPFs (.xlsx) of a zip into directory (flattened, other
+    members ignored) and return (sboms, dpfs) as (label, path) lists.
+    """
+    max_bytes = getattr(settings, 'SBOM_BATCH_MAX_ARCHIVE_BYTES', 500 * 1024 * 1024)
+    try:
+        zf = zipfile.ZipFile(archive)
+    except zipfile.BadZipFile:
+        raise BatchError("Archive is not a valid zip file")
+
+    sboms, dpfs = [], []
+    with zf:
+        # Skip folders and macOS metadata (__MACOSX/, ._ files)
+        members = [
+            info for info in zf.infolist()
+            if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+            and not os.path.basename(info.filename).startswith('.')
+        ]
+        if sum(info.file_size for info in members) > max_bytes:
+            raise BatchError("Archive is too large once extracted")
+
+        for number, info in enumerate(members):
+            name = os.path.basename(info.filename)
+            extension = os.path.splitext(name)[1].lower()
+            if extension in SBOM_EXTENSIONS:
+                target = sboms
+            elif extension in DPF_EXTENSIONS:
+                target = dpfs
+            else:
+                continue
+            # Members are flattened into the directory; the prefix keeps same-named files apart
+            path = os.path.join(directory, f"{number}_{name}")
+            with zf.open(info) as source, open(path, 'wb') as destination:
+                while True:
+                    chunk = source.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    destination.write(chunk)
+            target.append((info.filename, path))
+    return sboms, dpfs
+
+
+def report_sources(reports):
+    """(sboms, dpfs) of stored reports; files shared by several reports are listed once."""
+    sboms, dpfs = {}, {}
+    for report in reports:
+        if report.sbom:
+            sboms.setdefault(report.sbom.name, (f"report {report.id}: {os.path.basename(report.sbom.name)}",
+                                                report.sbom.path))
+        if report.dpf:
+            dpfs.setdefault(report.dpf.name, (f"report {report.id}: {os.path.basename(report.dpf.name)}",
+                                              report.dpf.path))
+    return list(sboms.values()), list(dpfs.values())
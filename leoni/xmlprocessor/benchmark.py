@@ -0,0 +1,224 @@
+import gc
+import hashlib
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+
+from django.conf import settings
+
+from .utils import SBOMValidator
+
+STAGES = (
+    '_parse_xml',
+    '_parse_excel',
+    'validate',
+    'validate_with_nlp',
+    'generate_report',
+    'generate_nlp_report',
+)
+
+
+def unique_files(directory, extensions):
+    """Files in directory with one of the extensions, keeping one path per distinct content."""
+    seen = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if not name.lower().endswith(extensions) or not os.path.isfile(path):
+            continue
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        seen.setdefault(digest, path)
+    return list(seen.values())
+
+
+def measure(func, repeat=3):
+    """
+    Run func `repeat` times for wall/CPU time (median) and once more under tracemalloc for
+    peak memory, so tracing overhead doesn't distort the timings. Returns (metrics, last result).
+    """
+    walls, cpus = [], []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        result = func()
+        walls.append(time.perf_counter() - wall_start)
+        cpus.append(time.process_time() - cpu_start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'wall_s': statistics.median(walls),
+        'cpu_s': statistics.median(cpus),
+        'peak_mb': peak / (1024 * 1024),
+    }, result
+
+
+class ValidatorBenchmark:
+    """Times every SBOMValidator stage over a set of SBOM XML files and DPF workbooks."""
+
+    def __init__(self, xml_paths, excel_paths, repeat=3, stages=STAGES, projected_excel=True,
+                 projected_xml=True, xml_engine=None, log=None):
+        self.xml_paths = xml_paths
+        self.excel_paths = excel_paths
+        self.repeat = repeat
+        self.stages = stages
+        self.projected_excel = projected_excel
+        self.projected_xml = projected_xml
+        self.xml_engine = xml_engine
+        self.log = log or (lambda message: None)
+        self.results = []
+
+    def _record(self, stage, name, metrics=None, skipped=None):
+        entry = {'stage': stage, 'file': name}
+        if skipped:
+            entry['skipped'] = skipped
+        else:
+            entry.update({key: round(value, 6) for key, value in metrics.items()})
+            self.log(f"{stage:<22} {name:<70} {metrics['wall_s'] * 1000:9.1f} ms "
+                     f"{metrics['cpu_s'] * 1000:9.1f} ms cpu {metrics['peak_mb']:8.2f} MB")
+        self.results.append(entry)
+
+    def _excel_options(self):
+        if not self.projected_excel:
+            return {}
+        return {
+            'excel_sheets': SBOMValidator.VALIDATION_SHEETS,
+            'excel_columns': SBOMValidator.VALIDATION_COLUMNS,
+        }
+
+    def _xml_options(self):
+        options = {'xml_engine': self.xml_engine}
+        if self.projected_xml:
+            options['xml_attributes'] = SBOMValidator.VALIDATION_ATTRIBUTES
+        return options
+
+    def _loaded_validator(self, xml_path, excel_path):
+        validator = SBOMValidator(xml_file_path=xml_path, excel_file_path=excel_path,
+                                  **self._excel_options(), **self._xml_options())
+        attributes = validator.get_sbom_attributes()[0]
+        validator.wcpr = attributes.get('workcenterplantreference')
+        validator.wcpar = attributes.get('workcenterproductionareareference')
+        validator.wcusfa = attributes.get('workcenter_usesinglefinalassembly')
+        return validator
+
+    def run(self):
+        if '_parse_xml' in self.stages:
+            for xml_path in self.xml_paths:
+                metrics, _ = measure(lambda: SBOMValidator(**self._xml_options())._parse_xml(xml_path), self.repeat)
+                self._record('_parse_xml', os.path.basename(xml_path), metrics)
+
+        if '_parse_excel' in self.stages:
+            for excel_path in self.excel_paths:
+                def parse_excel():
+                    SBOMValidator(excel_file_path=excel_path, **self._excel_options()).close()
+                metrics, _ = measure(parse_excel, self.repeat)
+                self._record('_parse_excel', os.path.basename(excel_path), metrics)
+
+        nlp_error = None
+        for xml_path in self.xml_paths:
+            for excel_path in self.excel_paths:
+                name = f"{os.path.basename(xml_path)}|{os.path.basename(excel_path)}"
+                validator = self._loaded_validator(xml_path, excel_path)
+
+                if 'validate' in self.stages or 'generate_report' in self.stages:
+                    metrics, results = measure(validator.validate, self.repeat)
+                    if 'validate' in self.stages:
+                        self._record('validate', name, metrics)
+                    if 'generate_report' in self.stages:
+                        metrics, _ = measure(lambda: validator.generate_report(results), self.repeat)
+                        self._record('generate_report', name, metrics)
+
+                if 'validate_with_nlp' in self.stages or 'generate_nlp_report' in self.stages:
+                    if nlp_error is None:
+                        try:
+                            validator.nlp
+                        except (OSError, ImportError) as e:
+                            nlp_error = f"spaCy model unavailable: {e}"
+                    if nlp_error:
+                        for stage in ('validate_with_nlp', 'generate_nlp_report'):
+                            if stage in self.stages:
+                                self._record(stage, name, skipped=nlp_error)
+                    else:
+                        metrics, nlp_results = measure(validator.validate_with_nlp, self.repeat)
+                        if 'validate_with_nlp' in self.stages:
+                            self._record('validate_with_nlp', name, metrics)
+                        if 'generate_nlp_report' in self.stages:
+                            metrics, _ = measure(lambda: validator.generate_nlp_report(nlp_results), self.repeat)
+                            self._record('generate_nlp_report', name, metrics)
+                validator.close()
+
+        return self.report()
+
+    def report(self):
+        summary = {}
+        for stage in self.stages:
+            walls = [r['wall_s'] for r in self.results if r['stage'] == stage and 'skipped' not in r]
+            if walls:
+                summary[stage] = {
+                    'files': len(walls),
+                    'wall_s_total': round(sum(walls), 6),
+                    'wall_s_median': round(statistics.median(walls), 6),
+                    'peak_mb_max': round(max(r['peak_mb'] for r in self.results
+                                             if r['stage'] == stage and 'skipped' not in r), 6),
+                }
+        return {
+            'meta': {
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'repeat': self.repeat,
+                'projected_excel': self.projected_excel,
+                'projected_xml': self.projected_xml,
+                'xml_engine': self.xml_engine or getattr(settings, 'SBOM_XML_ENGINE', 'stdlib'),
+            },
+            'results': self.results,
+            'summary': summary,
+        }
+
+
+def compare(current, baseline, threshold=0.2, min_delta_s=0.005):
+    """
+    List the (stage, file) measurements that got slower or bigger than the baseline by
+    more than `threshold` (a fraction). Timing deltas under min_delta_s are ignored as noise.
+    """
+    previous = {(r['stage'], r['file']): r for r in baseline['results'] if 'skipped' not in r}
+    regressions = []
+    for entry in current['results']:
+        old = previous.get((entry['stage'], entry['file']))
+        if old is None or 'skipped' in entry:
+            continue
+        for metric in ('wall_s', 'cpu_s', 'peak_mb'):
+            before, after = old[metric], entry[metric]
+            if metric != 'peak_mb' and after - before < min_delta_s:
+                continue
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append({
+                    'stage': entry['stage'],
+                    'file': entry['file'],
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'change': round(after / before - 1, 4),
+                })
+    return regressions
+
+
+def write_json(data, path):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,66 @@
+def normalise_value(value):
+    """Index key of an attribute value: trimmed string, None when missing or blank."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+class BomElementIndex:
+    """
+    Hash indexes over BOM elements (attribute dicts). An attribute's index ({value: [elements]},
+    values trimmed) is built on the first query that uses it, so only the attributes actually
+    queried cost a pass over the elements; every later lookup is a dict hit.
+    """
+
+    def __init__(self, elements, attributes=('partnumber',)):
+        self.elements = elements
+        # Attributes indexed together on the first query of any of them
+        self.attributes = tuple(attributes)
+        self._indexes = {}
+
+    def __len__(self):
+        return len(self.elements)
+
+    def index(self, attribute):
+        """{value: [elements]} for one attribute."""
+        index = self._indexes.get(attribute)
+        if index is None:
+            wanted = [attribute]
+            if attribute in self.attributes:
+                wanted += [name for name in self.attributes if name not in self._indexes and name != attribute]
+            built = {name: {} for name in wanted}
+            for element in self.elements:
+                for name, values in built.items():
+                    key = normalise_value(element.get(name))
+                    if key is not None:
+                        values.setdefault(key, []).append(element)
+            self._indexes.update(built)
+            index = built[attribute]
+        return index
+
+    def keys(self, attribute):
+        """Distinct (trimmed) values of an attribute; a live view, don't modify."""
+        return self.index(attribute).keys()
+
+    def find(self, **criteria):
+        """Elements matching every attribute=value criterion, in document order."""
+        if not criteria:
+            return list(self.elements)
+        candidates = None
+        for attribute, value in criteria.items():
+            matches = self.index(attribute).get(normalise_value(value), [])
+            if candidates is None or len(matches) < len(candidates):
+                candidates = matches
+            if not candidates:
+                return []
+        return [
+            element for element in candidates
+            if all(normalise_value(element.get(attribute)) == normalise_value(value)
+                   for attribute, value in criteria.items())
+        ]
+
+    def lookup_many(self, values, attribute='partnumber'):
+        """{value: [elements]} for a batch of values; values with no element map to []."""
+        index = self.index(attribute)
+        return {value: index.get(normalise_value(value), []) for value in values}
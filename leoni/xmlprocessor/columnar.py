@@ -0,0 +1,168 @@
+import math
+from array import array
+from collections.abc import Mapping
+
+# Code 0 of every string column means "attribute not set on this element"
+_MISSING = 0
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class AttributeTable:
+    """
+    Column store for the attributes of a run of XML elements (e.g. the sbomsubassembly
+    elements of one sbom). Every attribute becomes a dictionary-encoded column: each distinct
+    string is kept once and rows hold an int code into it, so values repeated thousands of
+    times (part numbers, units, parent ids) cost 4 bytes per row. Columns listed in
+    numeric_columns are also kept as float arrays (NaN when missing or not a number).
+
+    Rows are read through Row views or iter_columns(), neither of which copies the row.
+    """
+
+    def __init__(self, numeric_columns=(), aliases=None):
+        self._length = 0
+        self._codes = {}
+        self._values = {}
+        self._lookup = {}
+        self._numeric = {name: array('d') for name in numeric_columns}
+        # Extra keys exposed by aliased rows, e.g. {'parent_id': 'parentsubid'}
+        self.aliases = aliases or {}
+
+    def _add_column(self, name):
+        self._codes[name] = array('I', [_MISSING]) * self._length
+        self._values[name] = [None]
+        self._lookup[name] = {}
+
+    def append(self, attributes):
+        # In attribute order, so columns (and Row keys) come out in document order
+        for name in attributes:
+            if name not in self._codes:
+                self._add_column(name)
+
+        for name, codes in self._codes.items():
+            value = attributes.get(name)
+            if value is None:
+                codes.append(_MISSING)
+                continue
+            lookup = self._lookup[name]
+            code = lookup.get(value)
+            if code is None:
+                values = self._values[name]
+                code = lookup[value] = len(values)
+                values.append(value)
+            codes.append(code)
+
+        for name, numbers in self._numeric.items():
+            numbers.append(_to_float(attributes.get(name)))
+        self._length += 1
+
+    def __getstate__(self):
+        # The value -> code lookups are only needed while appending; rebuilt on unpickling
+        state = self.__dict__.copy()
+        del state['_lookup']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lookup = {
+            name: {value: code for code, value in enumerate(values) if code != _MISSING}
+            for name, values in self._values.items()
+        }
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Row(self, i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+        return Row(self, index)
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield Row(self, index)
+
+    def iter_rows(self, aliases=False):
+        """Row views, optionally exposing the alias keys as well."""
+        alias_map = self.aliases if aliases else None
+        for index in range(self._length):
+            yield Row(self, index, alias_map)
+
+    @property
+    def columns(self):
+        return list(self._codes)
+
+    def value(self, index, name):
+        codes = self._codes.get(name)
+        if codes is None:
+            return None
+        return self._values[name][codes[index]]
+
+    def iter_column(self, name):
+        """Decoded values of one column, None where the attribute is missing."""
+        codes = self._codes.get(name)
+        if codes is None:
+            return iter([None] * self._length)
+        return map(self._values[name].__getitem__, codes)
+
+    def iter_columns(self, *names):
+        """Tuples of the given columns for every row, without building per-row objects."""
+        return zip(*(self.iter_column(name) for name in names))
+
+    def codes(self, name):
+        """The (shared, not copied) code array and value dictionary of a string column."""
+        return self._codes[name], self._values[name]
+
+    def numeric(self, name):
+        """The (shared, not copied) float array of a numeric column."""
+        return self._numeric[name]
+
+
+class Row(Mapping):
+    """Read-only mapping view of one table row; only the attributes the element had are keys."""
+
+    __slots__ = ('_table', '_index', '_aliases')
+
+    def __init__(self, table, index, aliases=None):
+        self._table = table
+        self._index = index
+        self._aliases = aliases
+
+    def __getitem__(self, key):
+        if self._aliases and key in self._aliases:
+            return self._table.value(self._index, self._aliases[key])
+        codes = self._table._codes.get(key)
+        if codes is None or codes[self._index] == _MISSING:
+            raise KeyError(key)
+        return self._table._values[key][codes[self._index]]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __iter__(self):
+        index = self._index
+        for name, codes in self._table._codes.items():
+            if codes[index] != _MISSING:
+                yield name
+        if self._aliases:
+            yield from self._aliases
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self):
+        return dict(self)
+
+    def __repr__(self):
+        return repr(dict(self))
@@ -0,0 +1,73 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Parsed "Twist ..." cost result description, e.g.
+# "Twist  41(1) (WH/BU), 51(1) (BU/YE),  Untwist A: 50.0 Untwist B: 50.0 Twist length: 545.0 Pitch: 20.0 Direction: S(S)"
+TwistDescription = namedtuple('TwistDescription', ['pitch', 'untwist_a', 'untwist_b', 'twist_length', 'wires'])
+
+_FIELDS = {
+    'pitch': 'pitch',
+    'untwist a': 'untwist_a',
+    'untwist b': 'untwist_b',
+    'twist length': 'twist_length',
+}
+
+# One scanner for every field: measurements, the start of the "Twist ..." wire list, and the wire ids in it
+_SCANNER = re.compile(
+    r"(?P<key>Pitch|Untwist A|Untwist B|Twist length):\s*(?P<value>[\d.]+)"
+    r"|(?P<twist>Twist\s+)"
+    r"|(?P<wire>\d+\(\d+\))"
+)
+_SCANNER_IGNORECASE = re.compile(
+    r"(?P<key>pitch|untwist a|untwist b|twist length):\s*(?P<value>[\d.]+)",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=4096)
+def parse_description(description, ignore_case=False):
+    """
+    Extract pitch, untwist A/B, twist length and wire ids from a cost result description
+    in one pass. Each measurement takes its first occurrence; wires are the "N(M)" ids that
+    follow the first "Twist". With ignore_case only the measurements are extracted.
+    A malformed number ("1.2.3") raises ValueError, for the caller to report as an error; in a
+    description missing a measurement (which the twisted wire check skips) it reads as None.
+    Results are memoized since the same descriptions repeat across sboms.
+    """
+    values = {}
+    wires = []
+    in_wire_list = False
+    scanner = _SCANNER_IGNORECASE if ignore_case else _SCANNER
+
+    for match in scanner.finditer(description):
+        key = match.group('key')
+        if key is not None:
+            field = _FIELDS[key.lower()]
+            if field not in values:
+                values[field] = match.group('value')
+            if field == 'twist_length':
+                in_wire_list = True
+        elif match.group('twist') is not None:
+            in_wire_list = True
+        elif in_wire_list:
+            wires.append(match.group('wire'))
+
+    complete = len(values) == len(_FIELDS)
+    for field in _FIELDS.values():
+        if field not in values:
+            continue
+        try:
+            values[field] = float(values[field])
+        except ValueError:
+            if complete or ignore_case:
+                raise
+            values[field] = None
+
+    return TwistDescription(
+        pitch=values.get('pitch'),
+        untwist_a=values.get('untwist_a'),
+        untwist_b=values.get('untwist_b'),
+        twist_length=values.get('twist_length'),
+        wires=tuple(wires)
+    )
@@ -0,0 +1,110 @@
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_collector = ContextVar('sbom_stage_collector', default=None)
+
+
+class StageCollector:
+    """Timings (and optionally traced memory peaks) of the stages run while handling one request."""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = []
+        self._open = []
+        self._started_tracing = False
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._token = _collector.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _collector.reset(self._token)
+        if self._started_tracing:
+            tracemalloc.stop()
+        return False
+
+    def _begin(self, name):
+        frame = {'name': name, 'start': time.perf_counter(), 'peak': 0, 'base': 0}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._open:
+                # Keep the enclosing stage's peak before the nested stage resets it
+                self._open[-1]['peak'] = max(self._open[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['base'] = current
+        self._open.append(frame)
+
+    def _end(self):
+        frame = self._open.pop()
+        entry = {'name': frame['name'], 'duration': time.perf_counter() - frame['start']}
+        if self.trace_memory:
+            peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            entry['peak_bytes'] = max(0, peak - frame['base'])
+            if self._open:
+                self._open[-1]['peak'] = max(self._open[-1]['peak'], peak)
+        self.stages.append(entry)
+
+    def server_timing(self):
+        """Value for the Server-Timing response header, e.g. 'xml_parse;dur=12.3, rules;dur=4.0'."""
+        return ', '.join(f"{stage['name']};dur={stage['duration'] * 1000:.1f}" for stage in self.stages)
+
+
+@contextmanager
+def stage(name):
+    """Time a block as stage `name` of the current request; a no-op when nothing is collecting."""
+    collector = _collector.get()
+    if collector is None:
+        yield
+        return
+    collector._begin(name)
+    try:
+        yield
+    finally:
+        collector._end()
+
+
+class StageHistograms:
+    """Process-wide duration histograms per stage, rendered in the Prometheus text format."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, name, seconds):
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series['counts'][i] += 1
+            series['sum'] += seconds
+            series['count'] += 1
+
+    def render(self):
+        lines = [
+            "# HELP sbom_stage_duration_seconds Time spent in each stage of SBOM validation requests.",
+            "# TYPE sbom_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            for name in sorted(self._series):
+                series = self._series[name]
+                for bound, count in zip(self.buckets, series['counts']):
+                    lines.append(f'sbom_stage_duration_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+                lines.append(f'sbom_stage_duration_seconds_bucket{{stage="{name}",le="+Inf"}} {series["count"]}')
+                lines.append(f'sbom_stage_duration_seconds_sum{{stage="{name}"}} {series["sum"]:.6f}')
+                lines.append(f'sbom_stage_duration_seconds_count{{stage="{name}"}} {series["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+histograms = StageHistograms()
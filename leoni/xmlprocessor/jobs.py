@@ -0,0 +1,124 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils.timezone import now
+
+from .models import Report, ValidationJob, ValidationQueue
+from .pipeline import validate_files
+from .storage import blob_storage
+
+logger = logging.getLogger('xmlprocessor.jobs')
+
+
+class QueueFull(Exception):
+    pass
+
+
+def requeue_stale_jobs():
+    """
+    Recover jobs whose worker died mid-run: a job 'running' for longer than
+    SBOM_JOB_LEASE_SECONDS is queued again, or failed once it has used SBOM_JOB_MAX_ATTEMPTS.
+    """
+    lease = getattr(settings, 'SBOM_JOB_LEASE_SECONDS', 30 * 60)
+    max_attempts = getattr(settings, 'SBOM_JOB_MAX_ATTEMPTS', 3)
+    stale = ValidationJob.objects.filter(status='running', started_at__lt=now() - timedelta(seconds=lease))
+    for job in stale.filter(attempts__gte=max_attempts):
+        failed = ValidationJob.objects.filter(id=job.id, status='running').update(
+            status='failed', error="Worker stopped while running the job", finished_at=now()
+        )
+        if failed:
+            logger.warning("Validation job %s failed: worker stopped %s times", job.id, job.attempts)
+            release_files(job)
+    stale.filter(attempts__lt=max_attempts).update(status='queued', started_at=None)
+
+
+def enqueue(user, xml_file, excel_file, wcpr, wcpar, wcusfa):
+    """Store the uploads and queue a validation job, or raise QueueFull when the backlog is at its limit."""
+    requeue_stale_jobs()
+    with transaction.atomic():
+        # Concurrent submits wait here, so none of them counts the queue before another's job is in
+        ValidationQueue.objects.select_for_update().get_or_create(id=1)
+        pending = ValidationJob.objects.filter(status__in=['queued', 'running']).count()
+        if pending >= getattr(settings, 'SBOM_JOB_QUEUE_MAX', 50):
+            raise QueueFull(f"Validation queue is full ({pending} pending jobs)")
+
+        return ValidationJob.objects.create(
+            user=user,
+            sbom=xml_file,
+            dpf=excel_file,
+            workcenter_plantreference=wcpr,
+            workcenter_productionareareference=wcpar,
+            workcenter_usesinglefileassembly=wcusfa,
+        )
+
+
+def claim_next_job():
+    """Atomically move the oldest queued job to running; None when the queue is empty."""
+    requeue_stale_jobs()
+    for job in ValidationJob.objects.filter(status='queued').order_by('id')[:10]:
+        claimed = ValidationJob.objects.filter(id=job.id, status='queued').update(
+            status='running', started_at=now(), attempts=F('attempts') + 1
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def release_files(job):
+    """Drop the job's references to its stored SBOM/DPF; the blobs go once nothing else uses them."""
+    fields = [field for field in ('sbom', 'dpf') if getattr(job, field).name]
+    for field in fields:
+        blob_storage.delete(getattr(job, field).name)
+        setattr(job, field, '')
+    if fields:
+        job.save(update_fields=fields)
+
+
+def run_job(job):
+    try:
+        with job.sbom.open('rb') as xml_file, job.dpf.open('rb') as excel_file:
+            pdf_content, report_name = validate_files(
+                xml_file,
+                excel_file,
+                job.workcenter_plantreference,
+                job.workcenter_productionareareference,
+                job.workcenter_usesinglefileassembly,
+                # The job workers already take a core each (SBOM_JOB_CONCURRENCY)
+                use_pools=False,
+            )
+
+        # The report shares the job's stored blobs instead of copying them
+        report = Report.objects.create(user=job.user, sbom=job.sbom.name, dpf=job.dpf.name)
+        blob_storage.retain(job.sbom.name)
+        blob_storage.retain(job.dpf.name)
+        report.content.save(report_name, ContentFile(pdf_content))
+
+        job.report = report
+        job.status = 'done'
+    except Exception as e:
+        logger.exception("Validation job %s failed", job.id)
+        job.status = 'failed'
+        job.error = str(e)
+    job.finished_at = now()
+    job.save(update_fields=['report', 'status', 'error', 'finished_at'])
+    # A successful job's report has retained the files by now
+    release_files(job)
+
+
+def worker_loop(poll_interval=None, stop_event=None):
+    """Run queued jobs until stop_event is set, sleeping poll_interval seconds when idle."""
+    if poll_interval is None:
+        poll_interval = getattr(settings, 'SBOM_JOB_POLL_INTERVAL', 1.0)
+    while stop_event is None or not stop_event.is_set():
+        close_old_connections()
+        job = claim_next_job()
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
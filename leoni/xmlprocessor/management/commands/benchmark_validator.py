@@ -0,0 +1,76 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from xmlprocessor.benchmark import STAGES, ValidatorBenchmark, compare, read_json, unique_files, write_json
+from xmlprocessor.xml_engines import ENGINES
+
+
+class Command(BaseCommand):
+    help = ("Benchmark every SBOMValidator stage over the SBOM/DPF files in media/ "
+            "and optionally compare the results against a stored baseline.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--xml-dir', default=os.path.join(settings.MEDIA_ROOT, 'xml_files'))
+        parser.add_argument('--excel-dir', default=os.path.join(settings.MEDIA_ROOT, 'excel_files'))
+        parser.add_argument('--limit', type=int, default=None,
+                            help="Only use the first N distinct XML files and N distinct workbooks.")
+        parser.add_argument('--repeat', type=int, default=3, help="Timed runs per stage and file (median is kept).")
+        parser.add_argument('--stage', action='append', choices=STAGES, dest='stages',
+                            help="Stage to run; repeat the flag for several (default: all).")
+        parser.add_argument('--full-excel', action='store_true',
+                            help="Read every sheet and column instead of the projection the view uses.")
+        parser.add_argument('--full-xml', action='store_true',
+                            help="Keep every SBOM XML attribute instead of the projection the view uses.")
+        parser.add_argument('--xml-engine', choices=ENGINES,
+                            help="SBOM XML parser to benchmark (default: SBOM_XML_ENGINE).")
+        parser.add_argument('--output', help="Write the JSON results to this file.")
+        parser.add_argument('--baseline', help="JSON results of an earlier run to compare against.")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Relative slowdown/growth that counts as a regression (default 0.2 = 20%%).")
+
+    def handle(self, *args, **options):
+        for directory in (options['xml_dir'], options['excel_dir']):
+            if not os.path.isdir(directory):
+                raise CommandError(f"Directory not found: {directory}")
+        xml_paths = unique_files(options['xml_dir'], ('.xml',))
+        excel_paths = unique_files(options['excel_dir'], ('.xlsx', '.xlsm'))
+        if options['limit']:
+            xml_paths = xml_paths[:options['limit']]
+            excel_paths = excel_paths[:options['limit']]
+        if not xml_paths or not excel_paths:
+            raise CommandError("No SBOM XML files or DPF workbooks found")
+
+        self.stdout.write(f"Benchmarking {len(xml_paths)} SBOM(s) x {len(excel_paths)} DPF(s), "
+                          f"{options['repeat']} run(s) per stage")
+        benchmark = ValidatorBenchmark(
+            xml_paths,
+            excel_paths,
+            repeat=options['repeat'],
+            stages=tuple(options['stages'] or STAGES),
+            projected_excel=not options['full_excel'],
+            projected_xml=not options['full_xml'],
+            xml_engine=options['xml_engine'],
+            log=self.stdout.write,
+        )
+        results = benchmark.run()
+
+        for stage, summary in results['summary'].items():
+            self.stdout.write(f"{stage:<22} {summary['files']:4d} runs  total {summary['wall_s_total']:.3f} s  "
+                              f"median {summary['wall_s_median'] * 1000:.1f} ms  peak {summary['peak_mb_max']:.2f} MB")
+
+        if options['output']:
+            write_json(results, options['output'])
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options['baseline']:
+            regressions = compare(results, read_json(options['baseline']), threshold=options['threshold'])
+            for r in regressions:
+                self.stdout.write(self.style.ERROR(
+                    f"REGRESSION {r['stage']} {r['file']} {r['metric']}: "
+                    f"{r['baseline']} -> {r['current']} (+{r['change'] * 100:.0f}%)"
+                ))
+            if regressions:
+                raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}")
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
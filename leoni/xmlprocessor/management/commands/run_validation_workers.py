@@ -0,0 +1,62 @@
+import multiprocessing
+import signal
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _worker_main(stop_event, poll_interval):
+    # Workers stop through stop_event; let the parent handle Ctrl+C
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Spawned, so Django is set up again from DJANGO_SETTINGS_MODULE (inherited from the parent)
+    django.setup()
+    from xmlprocessor.jobs import worker_loop
+    worker_loop(poll_interval=poll_interval, stop_event=stop_event)
+
+
+class Command(BaseCommand):
+    help = "Run a local pool of worker processes that execute queued SBOM validation jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int,
+            default=getattr(settings, 'SBOM_JOB_CONCURRENCY', 2),
+            help="Number of worker processes (default: SBOM_JOB_CONCURRENCY)."
+        )
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=getattr(settings, 'SBOM_JOB_POLL_INTERVAL', 1.0),
+            help="Seconds an idle worker waits before checking the queue again."
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        # spawn on every platform, as for the validation pools (see parallel.py)
+        context = multiprocessing.get_context('spawn')
+        stop_event = context.Event()
+
+        # Children must open their own database connections
+        connections.close_all()
+        # Not daemonic, so a worker may start processes of its own; they are always joined below
+        workers = [
+            context.Process(target=_worker_main, args=(stop_event, options['poll_interval']))
+            for _ in range(concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {concurrency} validation worker(s)")
+
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+        try:
+            while not stopping and any(worker.is_alive() for worker in workers):
+                time.sleep(1.0)
+        except KeyboardInterrupt:
+            pass
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+        self.stdout.write("Validation workers stopped")
@@ -0,0 +1,99 @@
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from xmlprocessor.artifact_cache import get_artifact_cache
+from xmlprocessor.batch import BatchError, extract_archive, report_sources, run_batch
+from xmlprocessor.models import Report
+
+
+class Command(BaseCommand):
+    help = ("Validate many SBOMs against one or more DPFs (every SBOM x every DPF) and write "
+            "one JSON line per pair, followed by a summary line.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zip', help="Zip archive holding the SBOM .xml and DPF .xlsx files.")
+        parser.add_argument('--reports', nargs='+', type=int, default=[],
+                            help="Ids of stored reports whose SBOM/DPF files to validate.")
+        parser.add_argument('--sbom', nargs='+', default=[], help="SBOM XML files.")
+        parser.add_argument('--dpf', nargs='+', default=[],
+                            help="DPF workbooks; replace the DPFs of --zip/--reports when given.")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Worker processes (default SBOM_BATCH_WORKERS; 0 = one per core, 1 = none).")
+        parser.add_argument('--plant', help="Workcenter plant reference.")
+        parser.add_argument('--area', help="Workcenter production area reference.")
+        parser.add_argument('--single-final-assembly', help="Workcenter uses single final assembly.")
+        parser.add_argument('--output', help="Write the JSON lines to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory(prefix='sbom-batch-') as workdir:
+            sboms, dpfs = self._sources(options, workdir)
+            workcenter = {
+                'wcpr': options['plant'],
+                'wcpar': options['area'],
+                'wcusfa': options['single_final_assembly'],
+            }
+            workers = options['workers']
+            if workers is None:
+                workers = getattr(settings, 'SBOM_BATCH_WORKERS', 1)
+            if workers <= 0:
+                workers = os.cpu_count() or 1
+
+            executor = None
+            if workers > 1:
+                executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            output = open(options['output'], 'w', encoding='utf-8') if options['output'] else sys.stdout
+            try:
+                try:
+                    entries = run_batch(sboms, dpfs, workcenter, executor=executor,
+                                        artifact_cache=get_artifact_cache())
+                except BatchError as e:
+                    raise CommandError(str(e))
+
+                self.stderr.write(f"Validating {len(sboms)} SBOM(s) x {len(dpfs)} DPF(s) "
+                                  f"with {workers} worker(s)")
+                for entry in entries:
+                    output.write(json.dumps(entry, default=str) + "\n")
+                    output.flush()
+            finally:
+                if output is not sys.stdout:
+                    output.close()
+                if executor is not None:
+                    executor.shutdown(cancel_futures=True)
+
+        if entry['type'] == 'summary':
+            self.stderr.write(f"{entry['items']} validation(s) in {entry['seconds']:.1f} s: "
+                              + ", ".join(f"{count} {name}" for name, count in entry['statuses'].items()))
+
+    def _sources(self, options, workdir):
+        sboms, dpfs = [], []
+        if options['zip']:
+            if not os.path.isfile(options['zip']):
+                raise CommandError(f"File not found: {options['zip']}")
+            try:
+                with open(options['zip'], 'rb') as archive:
+                    sboms, dpfs = extract_archive(archive, workdir)
+            except BatchError as e:
+                raise CommandError(str(e))
+        if options['reports']:
+            reports = list(Report.objects.filter(id__in=options['reports']))
+            missing = sorted(set(options['reports']) - {report.id for report in reports})
+            if missing:
+                raise CommandError(f"Reports not found: {missing}")
+            report_sboms, report_dpfs = report_sources(reports)
+            sboms += report_sboms
+            dpfs += report_dpfs
+
+        for path in options['sbom'] + options['dpf']:
+            if not os.path.isfile(path):
+                raise CommandError(f"File not found: {path}")
+        sboms += [(path, path) for path in options['sbom']]
+        if options['dpf']:
+            dpfs = [(path, path) for path in options['dpf']]
+        return sboms, dpfs
@@ -0,0 +1,54 @@
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instrumentation import StageCollector, histograms
+
+logger = logging.getLogger('xmlprocessor.timing')
+
+
+def _log_entry(entry):
+    logged = {'name': entry['name'], 'duration_ms': round(entry['duration'] * 1000, 1)}
+    if 'peak_bytes' in entry:
+        logged['peak_bytes'] = entry['peak_bytes']
+    return logged
+
+
+class StageTimingMiddleware:
+    """
+    Collects the stage timings recorded with instrumentation.stage() while a request is handled,
+    then reports them as a Server-Timing header, one structured log line and histogram samples.
+    Removed from the stack entirely unless SBOM_INSTRUMENTATION_ENABLED is set.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SBOM_INSTRUMENTATION_ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.trace_memory = getattr(settings, 'SBOM_INSTRUMENTATION_TRACE_MEMORY', False)
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with StageCollector(trace_memory=self.trace_memory) as collector:
+            response = self.get_response(request)
+        if not collector.stages:
+            return response
+
+        total = time.perf_counter() - started
+        for entry in collector.stages:
+            histograms.observe(entry['name'], entry['duration'])
+        histograms.observe('total', total)
+
+        response['Server-Timing'] = f"{collector.server_timing()}, total;dur={total * 1000:.1f}"
+        logger.info(json.dumps({
+            'event': 'stage_timings',
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+            'stages': [_log_entry(entry) for entry in collector.stages],
+        }))
+        return response
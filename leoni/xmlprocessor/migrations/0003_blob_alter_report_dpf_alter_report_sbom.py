@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:51
+
+import xmlprocessor.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('xmlprocessor', '0002_user_confirmation_token'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(max_length=64)),
+                ('size', models.BigIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='report',
+            name='dpf',
+            field=models.FileField(storage=xmlprocessor.storage.get_blob_storage, upload_to='excel_files/'),
+        ),
+        migrations.AlterField(
+            model_name='report',
+            name='sbom',
+            field=models.FileField(storage=xmlprocessor.storage.get_blob_storage, upload_to='xml_files/'),
+        ),
+    ]
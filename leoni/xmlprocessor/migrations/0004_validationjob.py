@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:52
+
+import django.db.models.deletion
+import xmlprocessor.storage
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('xmlprocessor', '0003_blob_alter_report_dpf_alter_report_sbom'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ValidationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='queued', max_length=10)),
+                ('sbom', models.FileField(storage=xmlprocessor.storage.get_blob_storage, upload_to='xml_files/')),
+                ('dpf', models.FileField(storage=xmlprocessor.storage.get_blob_storage, upload_to='excel_files/')),
+                ('workcenter_plantreference', models.CharField(blank=True, max_length=255, null=True)),
+                ('workcenter_productionareareference', models.CharField(blank=True, max_length=255, null=True)),
+                ('workcenter_usesinglefileassembly', models.CharField(blank=True, max_length=255, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('report', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='xmlprocessor.report')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='validation_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
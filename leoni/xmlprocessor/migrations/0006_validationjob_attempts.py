@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('xmlprocessor', '0005_report_report_user_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='validationjob',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
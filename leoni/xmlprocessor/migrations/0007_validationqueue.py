@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:14
+
+from django.db import migrations, models
+
+
+def create_queue_row(apps, schema_editor):
+    apps.get_model('xmlprocessor', 'ValidationQueue').objects.get_or_create(id=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('xmlprocessor', '0006_validationjob_attempts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ValidationQueue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+        migrations.RunPython(create_queue_row, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from .storage import get_blob_storage
 
 class User(AbstractUser):
     ROLE_CHOICES = [
@@ -20,9 +21,61 @@ class User(AbstractUser):
 class Report(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reports')
     content = models.FileField(upload_to='reports/')
-    sbom = models.FileField(upload_to='xml_files/')
-    dpf = models.FileField(upload_to='excel_files/')
+    sbom = models.FileField(upload_to='xml_files/', storage=get_blob_storage)
+    dpf = models.FileField(upload_to='excel_files/', storage=get_blob_storage)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='report_user_created_idx'),
+            models.Index(fields=['created_at'], name='report_created_idx'),
+        ]
+
     def __str__(self):
         return f"Report by {self.user.username} on {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+
+class Blob(models.Model):
+    """A deduplicated SBOM/DPF file and the number of reports pointing at it."""
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64)
+    size = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+class ValidationJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='validation_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued', db_index=True)
+    sbom = models.FileField(upload_to='xml_files/', storage=get_blob_storage)
+    dpf = models.FileField(upload_to='excel_files/', storage=get_blob_storage)
+    workcenter_plantreference = models.CharField(max_length=255, null=True, blank=True)
+    workcenter_productionareareference = models.CharField(max_length=255, null=True, blank=True)
+    workcenter_usesinglefileassembly = models.CharField(max_length=255, null=True, blank=True)
+    report = models.ForeignKey(Report, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Validation job {self.id} ({self.status})"
+
+
+class ValidationQueue(models.Model):
+    """Single row locked while a job is enqueued, so the queue limit check and the insert are atomic."""
+
+    def __str__(self):
+        return "Validation queue lock"
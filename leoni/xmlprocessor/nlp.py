@@ -0,0 +1,44 @@
+import threading
+
+from django.conf import settings
+
+from .instrumentation import stage
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+_pipelines = {}
+_lock = threading.Lock()
+
+
+def configured_model():
+    """The pipeline named by SBOM_NLP_MODEL (DEFAULT_MODEL when unset)."""
+    return getattr(settings, 'SBOM_NLP_MODEL', DEFAULT_MODEL)
+
+
+def get_nlp(model_name=None):
+    """Return the process-wide spaCy pipeline for model_name (None: SBOM_NLP_MODEL), loading it on first use."""
+    if model_name is None:
+        model_name = configured_model()
+    nlp = _pipelines.get(model_name)
+    if nlp is not None:
+        return nlp
+
+    with _lock:
+        # Another thread may have finished loading while we waited for the lock
+        nlp = _pipelines.get(model_name)
+        if nlp is None:
+            import spacy
+            with stage('spacy_load'):
+                nlp = spacy.load(model_name)
+            _pipelines[model_name] = nlp
+    return nlp
+
+
+def warm_up(model_names=None):
+    """Load the given pipelines (None: SBOM_NLP_MODEL) ahead of the first request (called at worker boot)."""
+    for model_name in model_names or [configured_model()]:
+        get_nlp(model_name)
+
+
+def is_loaded(model_name=None):
+    return (model_name or configured_model()) in _pipelines
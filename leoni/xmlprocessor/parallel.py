@@ -0,0 +1,121 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+
+_executors = {}
+_lock = threading.Lock()
+
+
+def worker_count(setting='SBOM_VALIDATION_WORKERS'):
+    """Pool size from `setting`: 0 means one per core, 1 (the default) means no pool."""
+    workers = getattr(settings, setting, 1)
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def _pool(key, create):
+    """The process-wide pool under key, created with create() on first use."""
+    executor = _executors.get(key)
+    if executor is None:
+        with _lock:
+            executor = _executors.get(key)
+            if executor is None:
+                executor = _executors[key] = create()
+    return executor
+
+
+def discard(executor):
+    """
+    Forget a pool that raised BrokenExecutor (a worker process died abruptly, say), so the
+    next get_executor()/get_parse_executor() call starts a new one.
+    """
+    with _lock:
+        for key, cached in list(_executors.items()):
+            if cached is executor:
+                del _executors[key]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _process_pool(workers):
+    # spawn, not fork: the web server process has threads (and open DB connections)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def get_executor(setting='SBOM_VALIDATION_WORKERS'):
+    """The process-wide pool sized by `setting`, or None when that work runs in-process."""
+    workers = worker_count(setting)
+    if workers <= 1:
+        return None
+    return _pool(setting, lambda: _process_pool(workers))
+
+
+def get_parse_executor():
+    """
+    Pool SBOMValidator reads the DPF workbook on while it parses the XML, per
+    SBOM_PARSE_CONCURRENCY: 'process', 'thread', or 'none' (None: parse one after the other).
+    """
+    mode = getattr(settings, 'SBOM_PARSE_CONCURRENCY', 'none')
+    if mode not in ('process', 'thread'):
+        return None
+    workers = getattr(settings, 'SBOM_PARSE_WORKERS', 2)
+    if mode == 'thread':
+        create = lambda: ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sbom-parse')
+    else:
+        create = lambda: _process_pool(workers)
+    return _pool(f'SBOM_PARSE_CONCURRENCY:{mode}', create)
+
+
+class Partitions(list):
+    """Futures of submit_partitions(), with the pool and calls behind them."""
+
+    def __init__(self, futures, executor, func, partitions):
+        super().__init__(futures)
+        self.executor = executor
+        self.func = func
+        self.partitions = partitions
+
+
+def submit_partitions(executor, func, partitions):
+    """
+    Run func(*args) for every args tuple in partitions, on the pool when there is one, and
+    return the futures in partition order. Without a pool the calls run right away, errors
+    included, so both paths report failures at gather() time. A broken pool is discarded
+    and the calls run in-process instead.
+    """
+    partitions = list(partitions)
+    if executor is not None:
+        try:
+            return Partitions([executor.submit(func, *args) for args in partitions], executor, func, partitions)
+        except BrokenExecutor:
+            discard(executor)
+
+    futures = []
+    for args in partitions:
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        futures.append(future)
+    return Partitions(futures, None, func, partitions)
+
+
+def gather(futures):
+    """
+    Concatenate the partition results in submission order (raises the first failure). When
+    the pool breaks under them, it is discarded and the partitions are run again in-process.
+    """
+    merged = []
+    try:
+        for future in futures:
+            merged.extend(future.result())
+    except BrokenExecutor:
+        if getattr(futures, 'executor', None) is None:
+            raise
+        discard(futures.executor)
+        return gather(submit_partitions(None, futures.func, futures.partitions))
+    return merged
@@ -0,0 +1,48 @@
+from . import result_cache
+from .artifact_cache import get_artifact_cache
+from .instrumentation import stage
+from .parallel import get_executor, get_parse_executor
+from .utils import SBOMValidator
+
+
+def validate_files(xml_file, excel_file, wcpr, wcpar, wcusfa, use_pools=True):
+    """
+    Validate an SBOM against a DPF workbook and render the PDF report.
+    Returns (pdf_content, report_name). Identical inputs take their validation results from
+    the result cache; the report is always rendered for this call, so it is dated now.
+    use_pools=False parses and validates in this process, ignoring the parse and validation pools.
+    """
+    with stage('cache_lookup'):
+        cache_key = result_cache.make_key(
+            result_cache.file_sha256(xml_file),
+            result_cache.file_sha256(excel_file),
+            wcpr, wcpar, wcusfa
+        )
+        results = result_cache.get_result(cache_key)
+
+    if results is not None:
+        # Nothing to parse: the report only needs the workcenter inputs
+        validator = SBOMValidator()
+    else:
+        validator = SBOMValidator(
+            xml_file_path=xml_file,
+            excel_file_path=excel_file,
+            excel_sheets=SBOMValidator.VALIDATION_SHEETS,
+            excel_columns=SBOMValidator.VALIDATION_COLUMNS,
+            xml_attributes=SBOMValidator.VALIDATION_ATTRIBUTES,
+            artifact_cache=get_artifact_cache(),
+            parse_executor=get_parse_executor() if use_pools else None
+        )
+    validator.wcpr = wcpr
+    validator.wcpar = wcpar
+    validator.wcusfa = wcusfa
+
+    if results is None:
+        with stage('rules'):
+            results = validator.validate(executor=get_executor() if use_pools else None)
+        validator.close()
+        result_cache.store_result(cache_key, results)
+
+    with stage('pdf_render'):
+        gen_results = validator.generate_report(results)
+    return gen_results['content'], gen_results['report_name']
@@ -0,0 +1,69 @@
+import hashlib
+import pickle
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import (
+    bom_index, columnar, descriptions, hierarchy, parallel, rules, twisted_wires, utils, wire_lengths, xml_engines,
+)
+
+CACHE_ALIAS = 'validation_results'
+
+
+def _source_version(modules):
+    digest = hashlib.sha256()
+    for module in modules:
+        with open(module.__file__, 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:16]
+
+
+# Any edit to the validator code changes this, which orphans every older entry
+VALIDATOR_VERSION = _source_version([utils, descriptions, columnar, parallel, rules, twisted_wires, wire_lengths,
+                                     bom_index, hierarchy, xml_engines])
+
+
+def file_sha256(uploaded_file):
+    """
+    SHA-256 of an uploaded file: the one HashingFileUploadHandler computed during the upload,
+    otherwise read in chunks and rewound for the next reader.
+    """
+    if getattr(uploaded_file, 'sha256', None):
+        return uploaded_file.sha256
+    digest = hashlib.sha256()
+    uploaded_file.seek(0)
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+def make_key(xml_hash, excel_hash, wcpr, wcpar, wcusfa, mode='regex'):
+    parts = [VALIDATOR_VERSION, mode, xml_hash, excel_hash, str(wcpr), str(wcpar), str(wcusfa)]
+    return 'sbom-validation:' + hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def is_enabled():
+    return getattr(settings, 'SBOM_RESULT_CACHE_ENABLED', False)
+
+
+def get_result(key):
+    """The validation results of a previous identical validation, or None."""
+    if not is_enabled():
+        return None
+    entry = caches[CACHE_ALIAS].get(key)
+    return entry['results'] if entry else None
+
+
+def store_result(key, results):
+    """
+    Keep the validation results (not the PDF: a report is rendered per request, with its own
+    date and name).
+    """
+    if not is_enabled():
+        return
+    # Entries are bounded in count and age by the cache backend; oversized results are not kept at all
+    if len(pickle.dumps(results)) > getattr(settings, 'SBOM_RESULT_CACHE_MAX_ENTRY_BYTES', 5 * 1024 * 1024):
+        return
+    caches[CACHE_ALIAS].set(key, {'results': results})
@@ -0,0 +1,292 @@
+import re
+
+# Where a rule's SBOM side comes from, and how it is named in messages
+SOURCES = {
+    'sbom_attributes': "SBOM attributes",
+    'subassemblies': "SBOM subassemblies",
+    'cost_results': "SBOM cost results",
+    'bom_elements': "SBOM BOM elements",
+}
+
+# Element of the SBOM XML each source is read from, for projecting the parser
+SOURCE_TAGS = {
+    'sbom_attributes': 'sbom',
+    'subassemblies': 'sbomsubassembly',
+    'cost_results': 'costresult',
+    'bom_elements': 'bomelement',
+}
+
+
+# How a missing sheet or missing columns are reported; SheetColumns can override either
+MESSAGES = {
+    'sheet_missing': "'{sheet}' sheet not found in Excel",
+    'columns_missing': "Required columns not found in Excel '{sheet}' sheet: {columns}",
+}
+
+
+def _normalise_key(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    key = str(value).strip()
+    return key or None
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SheetColumns:
+    """
+    A DPF sheet and the columns a check reads from it. messages overrides MESSAGES; they are
+    formatted with {sheet} and {columns}.
+    """
+
+    def __init__(self, sheet, columns, messages=None):
+        self.sheet = sheet
+        self.columns = list(columns)
+        self.messages = {**MESSAGES, **(messages or {})}
+
+    def locate(self, sheet_data):
+        """SheetIndex with the positions of the columns in sheet_data, without indexing rows."""
+        return SheetIndex(self.sheet, None, None, self.columns).locate(sheet_data)
+
+    def problem(self, index):
+        """Message for the sheet or some of the columns missing from index, None when all are there."""
+        if not index.found:
+            return self.messages['sheet_missing'].format(sheet=self.sheet)
+        missing = [column for column in self.columns if column in index.missing_columns]
+        if missing:
+            return self.messages['columns_missing'].format(sheet=self.sheet, columns=', '.join(missing))
+        return None
+
+
+class Rule:
+    """
+    One declarative SBOM-vs-DPF check: rows of an SBOM `source` are joined with rows of a DPF
+    `sheet` on xml_key (an attribute name) = key_column.
+
+    - compare: (xml attribute, sheet column) pairs checked on every joined row, numerically
+      within `tolerance` when both sides are numbers, as trimmed strings otherwise.
+    - unmatched: 'excel' reports sheet keys no SBOM row has, 'xml' reports SBOM keys missing
+      from the sheet, None reports neither.
+    - key_pattern: sheet keys not matching it (sub-headers, "Welded", "-") are ignored.
+    - optional: skip the rule quietly when the sheet or its columns are absent.
+    """
+
+    def __init__(self, name, source, sheet, key_column, xml_key, compare=(), tolerance=0.0,
+                 unmatched='excel', key_pattern=None, optional=False, label=None):
+        if source not in SOURCES:
+            raise ValueError(f"Unknown rule source: {source}")
+        self.name = name
+        self.source = source
+        self.sheet = sheet
+        self.key_column = key_column
+        self.xml_key = xml_key
+        self.compare = tuple(compare)
+        self.tolerance = tolerance
+        self.unmatched = unmatched
+        self.key_pattern = re.compile(key_pattern) if key_pattern else None
+        self.optional = optional
+        self.label = label or name
+        self.required = SheetColumns(sheet, self.columns)
+
+    @property
+    def columns(self):
+        return [self.key_column] + [column for _, column in self.compare]
+
+    def index_key(self):
+        """Rules with the same index key share one index of the sheet."""
+        return (self.sheet, self.key_column, self.key_pattern.pattern if self.key_pattern else None)
+
+    def sheet_problem(self, index):
+        """Message for this rule's sheet or columns missing from index, None when all are there."""
+        return self.required.problem(index)
+
+
+class SheetIndex:
+    """Sheet rows keyed by one column, with the columns every rule on it needs resolved once."""
+
+    def __init__(self, sheet, key_column, key_pattern, columns):
+        self.sheet = sheet
+        self.key_column = key_column
+        self.key_pattern = re.compile(key_pattern) if isinstance(key_pattern, str) else key_pattern
+        self.columns = columns
+        self.rows = {}
+        self.positions = {}
+        self.missing_columns = []
+        self.found = False
+
+    def locate(self, sheet_data):
+        """Find the columns in the sheet's headers; an empty sheet is found, with every column missing."""
+        if sheet_data is None:
+            return self
+        headers = sheet_data['headers']
+        self.missing_columns = [column for column in self.columns if column not in headers]
+        self.found = True
+        self.positions = {column: headers.index(column) for column in self.columns if column in headers}
+        return self
+
+    def build(self, sheet_data):
+        if not sheet_data or sheet_data['empty']:
+            return self
+        self.locate(sheet_data)
+        if self.key_column not in self.positions:
+            return self
+
+        key_idx = self.positions[self.key_column]
+        for row in sheet_data['data']:
+            key = _normalise_key(row[key_idx] if key_idx < len(row) else None)
+            if key is None or (self.key_pattern and not self.key_pattern.match(key)):
+                continue
+            self.rows[key] = {
+                column: row[idx] if idx < len(row) else None for column, idx in self.positions.items()
+            }
+        return self
+
+
+class RulePlan:
+    """
+    Compiled rule set. Rules are grouped by source so each source is scanned once for all of
+    its rules, and by sheet/key column so each sheet index is built once. Presence-only rules
+    share the set of distinct key values collected during the scan.
+    """
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        self._index_columns = {}
+        for rule in self.rules:
+            columns = self._index_columns.setdefault(rule.index_key(), [])
+            columns.extend(column for column in rule.columns if column not in columns)
+        self._by_source = {}
+        for rule in self.rules:
+            self._by_source.setdefault(rule.source, []).append(rule)
+
+    def sheet_columns(self):
+        """{sheet: [columns]} the plan reads, for projecting the workbook at load time."""
+        columns = {}
+        for (sheet, _, _), index_columns in self._index_columns.items():
+            sheet_columns = columns.setdefault(sheet, [])
+            sheet_columns.extend(column for column in index_columns if column not in sheet_columns)
+        return columns
+
+    def element_attributes(self):
+        """{element tag: [attributes]} the plan reads, for projecting the XML at parse time."""
+        attributes = {}
+        for rule in self.rules:
+            element_attributes = attributes.setdefault(SOURCE_TAGS[rule.source], [])
+            for attribute in [rule.xml_key] + [attribute for attribute, _ in rule.compare]:
+                if attribute not in element_attributes:
+                    element_attributes.append(attribute)
+        return attributes
+
+    def _source_rows(self, validator, source):
+        if source == 'sbom_attributes':
+            return validator.get_sbom_attributes()
+        if source == 'subassemblies':
+            return validator.iter_subassemblies()
+        if source == 'cost_results':
+            return validator.get_cost_results()
+        return validator.get_bom_elements()
+
+    def run(self, validator):
+        """Evaluate every rule against the validator's data; returns {rule name: [messages]}."""
+        indexes = {
+            key: SheetIndex(key[0], key[1], key[2], columns).build(validator.get_sheet_by_name(key[0]))
+            for key, columns in self._index_columns.items()
+        }
+        messages = {rule.name: [] for rule in self.rules}
+
+        runnable = []
+        for rule in self.rules:
+            problem = rule.sheet_problem(indexes[rule.index_key()])
+            if problem is not None:
+                if not rule.optional:
+                    messages[rule.name].append(problem)
+                continue
+            runnable.append(rule)
+
+        for source, source_rules in self._by_source.items():
+            source_rules = [rule for rule in source_rules if rule in runnable]
+            if not source_rules:
+                continue
+            compare_rules = [rule for rule in source_rules if rule.compare or rule.unmatched == 'xml']
+            key_attributes = {rule.xml_key for rule in source_rules}
+
+            if source == 'bom_elements' and not compare_rules:
+                # Presence checks only: the validator's BOM element index already has the keys
+                bom_index = validator.bom_element_index()
+                seen = {attribute: bom_index.keys(attribute) for attribute in key_attributes}
+            else:
+                seen = {attribute: set() for attribute in key_attributes}
+                # The single scan of this source shared by all of its rules
+                for row in self._source_rows(validator, source):
+                    for attribute, values in seen.items():
+                        key = _normalise_key(row.get(attribute))
+                        if key is not None:
+                            values.add(key)
+                    for rule in compare_rules:
+                        self._check_row(rule, indexes[rule.index_key()], row, messages[rule.name])
+
+            for rule in source_rules:
+                if rule.unmatched == 'excel':
+                    present = seen[rule.xml_key]
+                    for key in indexes[rule.index_key()].rows:
+                        if key not in present:
+                            messages[rule.name].append(
+                                f"{rule.label} {key} from '{rule.sheet}' sheet not found in {SOURCES[rule.source]}"
+                            )
+        return messages
+
+    def _check_row(self, rule, index, row, messages):
+        key = _normalise_key(row.get(rule.xml_key))
+        if key is None:
+            return
+        excel_row = index.rows.get(key)
+        if excel_row is None:
+            if rule.unmatched == 'xml':
+                messages.append(f"{rule.label} {key} not found in Excel '{rule.sheet}' sheet")
+            return
+        for attribute, column in rule.compare:
+            xml_value, excel_value = row.get(attribute), excel_row[column]
+            xml_number, excel_number = _to_float(xml_value), _to_float(excel_value)
+            if xml_number is not None and excel_number is not None:
+                equal = abs(xml_number - excel_number) <= rule.tolerance
+            else:
+                equal = _normalise_key(xml_value) == _normalise_key(excel_value)
+            if not equal:
+                messages.append(
+                    f"{rule.label} {column} mismatch for {key}: SBOM={xml_value}, Excel={excel_value}"
+                )
+
+
+# Part numbers the DPF lists per component type must show up among the SBOM's BOM elements
+_PART_NUMBER = r"^P\d+$"
+
+DPF_COMPONENT_RULES = (
+    Rule("tape", 'bom_elements', "Tape", "Leoni part number", 'partnumber',
+         key_pattern=_PART_NUMBER, optional=True, label="Tape"),
+    Rule("splices", 'bom_elements', "Splices", "Splice", 'partnumber',
+         key_pattern=_PART_NUMBER, optional=True, label="Splice part"),
+    Rule("terminals_on_wpa", 'bom_elements', "Terminals_on_WPA", "Terminal Leoni part number", 'partnumber',
+         key_pattern=_PART_NUMBER, optional=True, label="Terminal"),
+    Rule("sheathed_multicore", 'bom_elements', "Sheathed multicore", "PN  Multicore", 'partnumber',
+         key_pattern=_PART_NUMBER, optional=True, label="Multicore"),
+)
+
+DPF_COMPONENT_PLAN = RulePlan(DPF_COMPONENT_RULES)
+
+# Sheets the twisted wire and wire length checks read. Those checks join the rows themselves
+# (twisted_wires, wire_lengths); these only find the sheet and its columns.
+_CHECK_MESSAGES = {'columns_missing': "Required columns not found in Excel: {columns}"}
+
+TWISTED_WIRES_SHEET = SheetColumns(
+    "Twisted Wires", ["Wires Nr", "Pitch", "Open end Length 1", "Open end Length 2", "Length of twist"],
+    messages={**_CHECK_MESSAGES, 'sheet_missing': "'{sheet}' sheet not found in Excel."},
+)
+
+WIRE_LENGTHS_SHEET = SheetColumns("Wires Lengths", ["Wire Nr", "Length"], messages=_CHECK_MESSAGES)
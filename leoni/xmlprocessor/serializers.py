@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from rest_framework.pagination import CursorPagination
 from .models import Report
 
 class DatasetGeneration(serializers.Serializer):
@@ -32,20 +33,28 @@ class ReportSerializer(serializers.ModelSerializer):
         model = Report
         fields = ['id', 'username', 'sbom_url', 'dpf_url', 'content_url', 'created_at']
 
+    def _absolute_url(self, field_file):
+        if not field_file:
+            return None
+        # Resolve scheme and host once per response rather than once per URL
+        origin = self.context.get('origin')
+        if origin is None:
+            origin = self.context['request'].build_absolute_uri('/').rstrip('/')
+            self.context['origin'] = origin
+        return origin + field_file.url
+
     def get_sbom_url(self, obj):
-        request = self.context.get('request')
-        if obj.sbom and hasattr(obj.sbom, 'url'):
-            return request.build_absolute_uri(obj.sbom.url)
-        return None
+        return self._absolute_url(obj.sbom)
 
     def get_dpf_url(self, obj):
-        request = self.context.get('request')
-        if obj.dpf and hasattr(obj.dpf, 'url'):
-            return request.build_absolute_uri(obj.dpf.url)
-        return None
+        return self._absolute_url(obj.dpf)
 
     def get_content_url(self, obj):
-        request = self.context.get('request')
-        if obj.content and hasattr(obj.content, 'url'):
-            return request.build_absolute_uri(obj.content.url)
-        return None
\ No newline at end of file
+        return self._absolute_url(obj.content)
+
+
+class ReportCursorPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-created_at', '-id')
@@ -0,0 +1,77 @@
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores every upload once under the SHA-256 of its bytes, e.g.
+    ``xml_files/ef/ef20ff...d337.xml``. Each save of an existing blob only bumps
+    its reference count, and delete() only removes the file when the last
+    reference goes away.
+    """
+
+    def _content_name(self, name, content):
+        digest = getattr(content, 'sha256', None)
+        if digest is None:
+            hasher = hashlib.sha256()
+            if hasattr(content, 'seek'):
+                content.seek(0)
+            for chunk in content.chunks():
+                hasher.update(chunk)
+            digest = hasher.hexdigest()
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        return os.path.join(directory, digest[:2], f"{digest}{extension}").replace('\\', '/'), digest
+
+    def _save(self, name, content):
+        # Only the directory and extension of the upload_to name are kept
+        from .models import Blob
+
+        name, digest = self._content_name(name, content)
+        with transaction.atomic():
+            blob, _ = Blob.objects.select_for_update().get_or_create(
+                name=name,
+                defaults={'sha256': digest, 'size': content.size}
+            )
+            if not self.exists(name):
+                saved_name = super()._save(name, content)
+                if saved_name != name:
+                    # Another process wrote the same blob between exists() and _save()
+                    super().delete(saved_name)
+            Blob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+        return name
+
+    def retain(self, name):
+        """Add a reference to an already stored blob (e.g. when a new Report reuses it)."""
+        from .models import Blob
+
+        Blob.objects.filter(name=name).update(ref_count=F('ref_count') + 1)
+
+    def delete(self, name):
+        from .models import Blob
+
+        if not name:
+            raise ValueError("The name must be given to delete().")
+        with transaction.atomic():
+            blob = Blob.objects.select_for_update().filter(name=name).first()
+            if blob is None:
+                # File stored before deduplication, nothing else points at it
+                super().delete(name)
+                return
+            blob.ref_count -= 1
+            if blob.ref_count > 0:
+                blob.save(update_fields=['ref_count'])
+                return
+            blob.delete()
+            super().delete(name)
+
+
+blob_storage = ContentAddressedStorage()
+
+
+def get_blob_storage():
+    return blob_storage
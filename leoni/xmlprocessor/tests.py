@@ -1,3 +1,1493 @@
-from django.test import TestCase
+import glob
+import hashlib
+import html
+import math
+import json
+import os
+import pickle
+import random
+import re
+import shutil
+import tempfile
+import zipfile
+from importlib.util import find_spec
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from unittest import mock, skipIf
+from xml.etree import ElementTree
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.core.files.uploadedfile import InMemoryUploadedFile, SimpleUploadedFile, TemporaryUploadedFile
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+from fpdf import FPDF
+from rest_framework.test import APIClient
+
+from . import artifact_cache, jobs, nlp, parallel, pipeline, result_cache, xml_engines
+from .artifact_cache import ArtifactCache, content_sha256
+from .batch import BatchError, extract_archive, run_batch
+from .bom_index import BomElementIndex
+from .columnar import AttributeTable
+from .descriptions import parse_description
+from .hierarchy import NO_PARENT, SubassemblyHierarchy
+from .instrumentation import histograms, stage
+from .middleware import StageTimingMiddleware
+from .models import Blob, Report, User, ValidationJob, ValidationQueue
+from .rules import DPF_COMPONENT_PLAN, TWISTED_WIRES_SHEET, WIRE_LENGTHS_SHEET, Rule, RulePlan, SheetColumns
+from .storage import ContentAddressedStorage
+from .upload_handlers import HashingFileUploadHandler
+from .twisted_wires import join_cost_results, mismatch_message, normalise_sheet
+from .utils import SBOMValidator, portable_source
+from .wire_lengths import cut_wire_id, first_token_wire_id, wire_length_messages
+
+MEDIA_FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'media')
+FIXTURE_SBOM = os.path.join(MEDIA_FIXTURES, 'xml_files', 'bomToXML909_04bTcQ1.xml')
+FIXTURE_DPF = os.path.join(MEDIA_FIXTURES, 'excel_files', 'Drawing_1540909_data_preparation_WTNSO.xlsx')
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location, ignore_errors=True)
+        self.storage = ContentAddressedStorage(location=self.location)
+
+    def save(self, data, name='xml_files/upload.xml'):
+        return self.storage.save(name, ContentFile(data))
+
+    def test_name_is_content_hash(self):
+        digest = hashlib.sha256(b'<sboms/>').hexdigest()
+        name = self.save(b'<sboms/>')
+        self.assertEqual(name, f"xml_files/{digest[:2]}/{digest}.xml")
+        blob = Blob.objects.get(name=name)
+        self.assertEqual((blob.sha256, blob.size, blob.ref_count), (digest, 8, 1))
+
+    def test_same_content_is_stored_once(self):
+        first = self.save(b'<sboms/>', 'xml_files/a.xml')
+        second = self.save(b'<sboms/>', 'xml_files/b.XML')
+        self.assertEqual(first, second)
+        self.assertEqual(Blob.objects.get(name=first).ref_count, 2)
+        self.assertEqual(len(os.listdir(os.path.dirname(self.storage.path(first)))), 1)
+
+    def test_precomputed_digest_is_used(self):
+        content = ContentFile(b'<sboms/>')
+        content.sha256 = 'ab' * 32
+        name = self.storage.save('xml_files/upload.xml', content)
+        self.assertEqual(name, f"xml_files/ab/{'ab' * 32}.xml")
+
+    def test_retain_adds_a_reference(self):
+        name = self.save(b'<sboms/>')
+        self.storage.retain(name)
+        self.assertEqual(Blob.objects.get(name=name).ref_count, 2)
+
+    def test_file_is_deleted_with_the_last_reference(self):
+        name = self.save(b'<sboms/>')
+        self.storage.retain(name)
+
+        self.storage.delete(name)
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(Blob.objects.get(name=name).ref_count, 1)
+
+        self.storage.delete(name)
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(Blob.objects.filter(name=name).exists())
+
+    def test_file_stored_before_deduplication_is_deleted(self):
+        # Saved by the plain storage, so there is no Blob row for it
+        name = 'xml_files/legacy.xml'
+        os.makedirs(os.path.join(self.location, 'xml_files'))
+        with open(os.path.join(self.location, name), 'wb') as f:
+            f.write(b'<sboms/>')
+
+        self.storage.delete(name)
+        self.assertFalse(self.storage.exists(name))
+
+    def test_delete_requires_a_name(self):
+        with self.assertRaises(ValueError):
+            self.storage.delete('')
+
+
+@override_settings(SBOM_JOB_LEASE_SECONDS=60, SBOM_JOB_MAX_ATTEMPTS=2, SBOM_JOB_QUEUE_MAX=1)
+class StaleJobTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='validator', email='validator@example.com')
+
+    def job(self, status, started_seconds_ago=None, attempts=0):
+        started_at = now() - timedelta(seconds=started_seconds_ago) if started_seconds_ago is not None else None
+        return ValidationJob.objects.create(
+            user=self.user, sbom='xml_files/a.xml', dpf='excel_files/a.xlsx',
+            status=status, started_at=started_at, attempts=attempts
+        )
+
+    def test_running_job_within_its_lease_is_left_alone(self):
+        job = self.job('running', started_seconds_ago=10, attempts=1)
+        self.assertIsNone(jobs.claim_next_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'running')
+
+    def test_stale_job_is_claimed_again(self):
+        job = self.job('running', started_seconds_ago=120, attempts=1)
+        claimed = jobs.claim_next_job()
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual((claimed.status, claimed.attempts), ('running', 2))
+
+    def test_stale_job_fails_after_max_attempts(self):
+        job = self.job('running', started_seconds_ago=120, attempts=2)
+        with self.assertLogs('xmlprocessor.jobs', 'WARNING') as logs:
+            self.assertIsNone(jobs.claim_next_job())
+        self.assertEqual(logs.output, [f"WARNING:xmlprocessor.jobs:Validation job {job.id} failed: worker stopped 2 times"])
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIsNotNone(job.finished_at)
+
+    def test_stale_job_that_failed_does_not_fill_the_queue(self):
+        self.job('running', started_seconds_ago=120, attempts=2)
+        with self.assertLogs('xmlprocessor.jobs', 'WARNING'):
+            job = jobs.enqueue(self.user, 'xml_files/b.xml', 'excel_files/b.xlsx', '01', '001', 'Yes')
+        self.assertEqual(job.status, 'queued')
+
+    def test_queue_limit_counts_live_jobs(self):
+        self.job('running', started_seconds_ago=10, attempts=1)
+        with self.assertRaises(jobs.QueueFull):
+            jobs.enqueue(self.user, 'xml_files/b.xml', 'excel_files/b.xlsx', '01', '001', 'Yes')
+
+    def test_enqueue_counts_the_queue_under_the_lock(self):
+        locked = []
+        select_for_update = ValidationQueue.objects.select_for_update
+
+        def lock():
+            locked.append(len(transaction.get_connection().savepoint_ids))
+            return select_for_update()
+
+        outer = len(transaction.get_connection().savepoint_ids)
+
+        with mock.patch.object(ValidationQueue.objects, 'select_for_update', side_effect=lock):
+            job = jobs.enqueue(self.user, 'xml_files/b.xml', 'excel_files/b.xlsx', '01', '001', 'Yes')
+        # Taken inside enqueue's own transaction
+        self.assertEqual(locked, [outer + 1])
+        self.assertEqual(job.status, 'queued')
+        self.assertEqual(ValidationQueue.objects.count(), 1)
+
+
+class JobFileReferenceTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create(username='validator', email='validator@example.com')
+        self.job = jobs.enqueue(self.user, ContentFile(b'<sboms/>', name='a.xml'),
+                                ContentFile(b'workbook', name='a.xlsx'), '01', '001', 'Yes')
+        self.names = [self.job.sbom.name, self.job.dpf.name]
+
+    def ref_counts(self):
+        return [Blob.objects.get(name=name).ref_count if Blob.objects.filter(name=name).exists() else 0
+                for name in self.names]
+
+    def test_finished_job_leaves_the_files_to_its_report(self):
+        with mock.patch.object(jobs, 'validate_files', return_value=(b'%PDF-', 'report.pdf')):
+            jobs.run_job(jobs.claim_next_job())
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, 'done')
+        self.assertEqual(self.ref_counts(), [1, 1])
+
+        Report.objects.get(id=self.job.report_id).sbom.delete(save=False)
+        self.assertEqual(self.ref_counts(), [0, 1])
+
+    def test_failed_job_releases_the_files(self):
+        with mock.patch.object(jobs, 'validate_files', side_effect=ValueError("bad SBOM")), \
+                self.assertLogs('xmlprocessor.jobs', 'ERROR') as logs:
+            jobs.run_job(jobs.claim_next_job())
+        self.assertIn(f"Validation job {self.job.id} failed", logs.output[0])
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.status, self.job.error), ('failed', "bad SBOM"))
+        self.assertEqual(self.ref_counts(), [0, 0])
+
+    def test_job_validates_without_pools(self):
+        with mock.patch.object(jobs, 'validate_files', return_value=(b'%PDF-', 'report.pdf')) as validate:
+            jobs.run_job(jobs.claim_next_job())
+        self.assertFalse(validate.call_args.kwargs['use_pools'])
+
+
+def _old_wire_length_messages(rows, excel_wire_lengths):
+    """The per-row loop validate() used before the NumPy version."""
+    messages = []
+    for name, quantity, unit in rows:
+        name = (name or '').strip()
+        unit = (unit or '').lower()
+        if quantity is None or unit not in ['per length', 'length']:
+            continue
+        wire_id = str(name.split()[0]).strip() if name else None
+        if not wire_id:
+            continue
+        try:
+            xml_length = float(quantity)
+        except (ValueError, TypeError):
+            messages.append(f"Invalid quantity value for wire {wire_id} in XML")
+            continue
+        if wire_id in excel_wire_lengths:
+            excel_length = excel_wire_lengths[wire_id]
+            if excel_length is None:
+                messages.append(f"Missing length value for wire {wire_id} in Excel")
+            elif not abs(xml_length - excel_length) <= 0.01:
+                messages.append(f"Wire length mismatch for {wire_id}: XML={xml_length}, Excel={excel_length}")
+        else:
+            messages.append(f"Wire {wire_id} not found in Excel Wires Lengths sheet")
+    return messages
+
+
+def _old_nlp_wire_length_messages(rows, excel_wire_lengths):
+    """The per-row loop validate_with_nlp() used before the NumPy version."""
+    messages = []
+    for name, quantity, unit in rows:
+        name = name or ''
+        unit = unit or ''
+        wire_match = re.search(r"(\d+\(\d+\))\s+CUT\b", name, re.IGNORECASE)
+        if wire_match and quantity and unit.lower() in ['per length', 'length']:
+            wire_id = wire_match.group(1)
+            try:
+                xml_length = float(quantity)
+            except (ValueError, TypeError):
+                messages.append(f"Invalid quantity value for wire {wire_id} in XML")
+                continue
+            if wire_id in excel_wire_lengths:
+                if not abs(xml_length - excel_wire_lengths[wire_id]) <= 0.01:
+                    messages.append(
+                        f"Wire length mismatch for {wire_id}: XML={xml_length}, Excel={excel_wire_lengths[wire_id]}"
+                    )
+            else:
+                messages.append(f"Wire {wire_id} not found in Excel Wires Length sheet")
+    return messages
+
+
+class WireLengthTests(TestCase):
+    NAMES = ["113 CUT", " 7 ", "45(2) CUT", "45(2) cut extra", "12(1)CUT", "8 (3) CUT", "", None, "abc", "113"]
+    QUANTITIES = ["1.5", "1.505", "1.52", "", None, "abc", "2", "0.004", "nan"]
+    UNITS = ["Per Length", "length", "Each", None, "LENGTH"]
+    WIRES = ["113", "7", "45(2)", "12(1)", "abc", "8"]
+
+    def random_tables(self, rng):
+        tables = []
+        for _ in range(rng.randint(1, 3)):
+            table = AttributeTable(numeric_columns=('quantity',))
+            for _ in range(rng.randint(0, 40)):
+                row = {'name': rng.choice(self.NAMES), 'quantity': rng.choice(self.QUANTITIES),
+                       'unitofmeasure': rng.choice(self.UNITS)}
+                table.append({key: value for key, value in row.items() if value is not None})
+            tables.append(table)
+        return tables
+
+    def rows(self, tables):
+        return [row for table in tables for row in table.iter_columns('name', 'quantity', 'unitofmeasure')]
+
+    def test_matches_the_old_loop(self):
+        rng = random.Random(14)
+        for _ in range(300):
+            tables = self.random_tables(rng)
+            lengths = {wire: rng.choice([1.5, 2.0, 0.0, None]) for wire in rng.sample(self.WIRES, 4)}
+            self.assertEqual(
+                wire_length_messages(tables, lengths, first_token_wire_id, "Wires Lengths"),
+                _old_wire_length_messages(self.rows(tables), lengths)
+            )
+
+    def test_nlp_variant_matches_the_old_loop(self):
+        rng = random.Random(15)
+        for _ in range(300):
+            tables = self.random_tables(rng)
+            # validate_with_nlp() never puts None lengths in its map
+            lengths = {wire: rng.choice([1.5, 2.0, 0.0]) for wire in rng.sample(self.WIRES, 4)}
+            self.assertEqual(
+                wire_length_messages(tables, lengths, cut_wire_id, "Wires Length", skip_empty_quantity=True),
+                _old_nlp_wire_length_messages(self.rows(tables), lengths)
+            )
+
+    def test_missing_excel_length(self):
+        table = AttributeTable()
+        table.append({'name': '45(2) CUT', 'quantity': '1.5', 'unitofmeasure': 'Per Length'})
+        self.assertEqual(
+            wire_length_messages([table], {'45(2)': None}, cut_wire_id, "Wires Length", skip_empty_quantity=True),
+            ["Missing length value for wire 45(2) in Excel"]
+        )
+
+
+class SheetColumnsTests(TestCase):
+    def validator(self, *sheets):
+        validator = SBOMValidator.__new__(SBOMValidator)
+        validator.excel_data = {'sheets': [
+            {'name': name, 'headers': headers, 'data': rows, 'empty': not headers, 'loaded': True}
+            for name, headers, rows in sheets
+        ]}
+        return validator
+
+    def test_missing_sheet(self):
+        validator = self.validator()
+        self.assertEqual(validator._locate_sheet(TWISTED_WIRES_SHEET)[2], "'Twisted Wires' sheet not found in Excel.")
+        self.assertEqual(validator._locate_sheet(WIRE_LENGTHS_SHEET)[2], "'Wires Lengths' sheet not found in Excel")
+
+    def test_missing_columns(self):
+        validator = self.validator(("Twisted Wires", ["Pitch", "Wires Nr"], []), ("Wires Lengths", [], []))
+        self.assertEqual(
+            validator._locate_sheet(TWISTED_WIRES_SHEET)[2],
+            "Required columns not found in Excel: Open end Length 1, Open end Length 2, Length of twist"
+        )
+        self.assertEqual(
+            validator._locate_sheet(WIRE_LENGTHS_SHEET)[2], "Required columns not found in Excel: Wire Nr, Length"
+        )
+
+    def test_column_indexes_follow_the_columns(self):
+        rows = [("1.5", "7")]
+        validator = self.validator(("Wires Lengths", ["Length", "Note", "Wire Nr"], rows))
+        self.assertEqual(validator._locate_sheet(WIRE_LENGTHS_SHEET), (rows, [2, 0], None))
+
+    def test_default_messages(self):
+        required = SheetColumns("Tape", ["Leoni part number"])
+        self.assertEqual(required.problem(required.locate(None)), "'Tape' sheet not found in Excel")
+        self.assertEqual(
+            required.problem(required.locate({'headers': ["Other"], 'data': []})),
+            "Required columns not found in Excel 'Tape' sheet: Leoni part number"
+        )
+
+
+def _add(a, b):
+    return [a + b]
+
+
+@override_settings(SBOM_VALIDATION_WORKERS=2)
+class BrokenPoolTests(TestCase):
+    def setUp(self):
+        self.addCleanup(parallel._executors.clear)
+
+    def broken_future(self):
+        future = Future()
+        future.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+        return future
+
+    def test_pool_broken_on_submit_is_discarded(self):
+        pool = parallel._executors['SBOM_VALIDATION_WORKERS'] = mock.Mock()
+        pool.submit.side_effect = BrokenProcessPool("pool is broken")
+        futures = parallel.submit_partitions(pool, _add, [(1, 2), (3, 4)])
+        self.assertEqual(parallel.gather(futures), [3, 7])
+        self.assertNotIn('SBOM_VALIDATION_WORKERS', parallel._executors)
+        pool.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+    def test_pool_broken_under_the_partitions_is_discarded(self):
+        pool = parallel._executors['SBOM_VALIDATION_WORKERS'] = mock.Mock()
+        pool.submit.side_effect = lambda *args: self.broken_future()
+        futures = parallel.submit_partitions(pool, _add, [(1, 2), (3, 4)])
+        self.assertEqual(parallel.gather(futures), [3, 7])
+        self.assertNotIn('SBOM_VALIDATION_WORKERS', parallel._executors)
+
+    def test_partition_errors_are_raised(self):
+        futures = parallel.submit_partitions(None, _add, [(1, None)])
+        with self.assertRaises(TypeError):
+            parallel.gather(futures)
+
+    def test_next_request_gets_a_new_pool(self):
+        executor = parallel.get_executor()
+        self.addCleanup(executor.shutdown)
+        self.assertIs(parallel.get_executor(), executor)
+        with self.assertRaises(BrokenProcessPool):
+            executor.submit(os._exit, 1).result()
+        self.assertEqual(parallel.gather(parallel.submit_partitions(executor, _add, [(1, 2)])), [3])
+
+        replacement = parallel.get_executor()
+        self.addCleanup(replacement.shutdown)
+        self.assertIsNot(replacement, executor)
+        # Builtins only: spawned workers can't import this module without Django set up
+        self.assertEqual(replacement.submit(sum, [2, 3]).result(), 5)
+
+
+class PortableSourceTests(TestCase):
+    def setUp(self):
+        self.executor = ProcessPoolExecutor(max_workers=1)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_in_memory_upload_keeps_its_digest(self):
+        upload = SimpleUploadedFile('a.xlsx', b'workbook')
+        upload.sha256 = 'ab' * 32
+        source = pickle.loads(pickle.dumps(portable_source(self.executor, upload)))
+        self.assertEqual((source.read(), content_sha256(source)), (b'workbook', 'ab' * 32))
+
+    def test_temporary_upload_keeps_its_digest(self):
+        upload = TemporaryUploadedFile('a.xlsx', 'application/octet-stream', 8, None)
+        self.addCleanup(upload.close)
+        upload.write(b'workbook')
+        upload.flush()
+        upload.sha256 = 'ab' * 32
+        source = pickle.loads(pickle.dumps(portable_source(self.executor, upload)))
+        self.assertEqual(source, upload.temporary_file_path())
+        self.assertEqual(content_sha256(source), 'ab' * 32)
+
+    def test_upload_without_digest_is_hashed(self):
+        upload = SimpleUploadedFile('a.xlsx', b'workbook')
+        source = portable_source(self.executor, upload)
+        self.assertEqual(content_sha256(source), hashlib.sha256(b'workbook').hexdigest())
+
+
+class NLPReportTests(TestCase):
+    def rendered_text(self, validation_results):
+        text = []
+        cell, multi_cell = FPDF.cell, FPDF.multi_cell
+
+        def record_cell(pdf, w=None, h=None, txt="", *args, **kwargs):
+            text.append(str(txt))
+            return cell(pdf, w, h, txt, *args, **kwargs)
+
+        def record_multi_cell(pdf, w, h=None, txt="", *args, **kwargs):
+            text.append(str(txt))
+            return multi_cell(pdf, w, h, txt, *args, **kwargs)
+
+        with mock.patch.object(FPDF, 'cell', record_cell), mock.patch.object(FPDF, 'multi_cell', record_multi_cell):
+            report = SBOMValidator().generate_nlp_report(validation_results)
+        self.assertTrue(report['content'].startswith(b'%PDF-'))
+        return text
+
+    def test_component_issues_are_reported(self):
+        text = self.rendered_text({
+            "status": "fail", "message": "Validation completed with mismatches", "mismatches": [],
+            "workcenter_validation": [], "wire_length_validation": [], "nlp_processing_notes": [],
+            "component_validation": ["Tape P100 from 'Tape' sheet not found in SBOM BOM elements"],
+        })
+        self.assertIn("Component Validation Results", text)
+        self.assertIn("* Tape P100 from 'Tape' sheet not found in SBOM BOM elements", text)
+        overall = text.index("OVERALL NLP VALIDATION STATUS")
+        self.assertEqual(text[overall + 1:overall + 3], ["1", "FAIL"])
+
+
+class PlanValidator:
+    """The parts of SBOMValidator a RulePlan reads, counting the scans of each source."""
+
+    def __init__(self, sheets, bom_elements=(), subassemblies=()):
+        self.sheets = {name: {'headers': headers, 'data': rows, 'empty': False} for name, headers, rows in sheets}
+        self.bom_elements = list(bom_elements)
+        self.subassemblies = list(subassemblies)
+        self.scans = {}
+
+    def count(self, source):
+        self.scans[source] = self.scans.get(source, 0) + 1
+
+    def get_sheet_by_name(self, name):
+        return self.sheets.get(name)
+
+    def bom_element_index(self):
+        self.count('bom_element_index')
+        return BomElementIndex(self.bom_elements, SBOMValidator.BOM_ELEMENT_INDEX_ATTRIBUTES)
+
+    def get_bom_elements(self):
+        self.count('bom_elements')
+        return self.bom_elements
+
+    def iter_subassemblies(self):
+        self.count('subassemblies')
+        return iter(self.subassemblies)
+
+
+class RulePlanTests(TestCase):
+    COMPONENT_SHEETS = [
+        ("Tape", ["Leoni part number"], [("P100",), ("Welded",), ("-",), ("P101",), (None,)]),
+        ("Splices", ["Splice"], [("P200",), ("Splice part numbers",)]),
+        ("Terminals_on_WPA", ["Terminal Leoni part number"], [(300.0,), ("P300",)]),
+        ("Sheathed multicore", ["PN  Multicore"], [(" P400 ",)]),
+    ]
+
+    def test_component_plan_reads_its_columns_and_attributes(self):
+        self.assertEqual(DPF_COMPONENT_PLAN.sheet_columns(), {
+            "Tape": ["Leoni part number"],
+            "Splices": ["Splice"],
+            "Terminals_on_WPA": ["Terminal Leoni part number"],
+            "Sheathed multicore": ["PN  Multicore"],
+        })
+        self.assertEqual(DPF_COMPONENT_PLAN.element_attributes(), {'bomelement': ['partnumber']})
+
+    def test_component_rules_share_one_bom_element_scan(self):
+        validator = PlanValidator(self.COMPONENT_SHEETS, bom_elements=[
+            {'partnumber': 'P100'}, {'partnumber': ' P300'}, {'partnumber': 'P400'},
+        ])
+        messages = DPF_COMPONENT_PLAN.run(validator)
+        self.assertEqual(validator.scans, {'bom_element_index': 1})
+        self.assertEqual(messages, {
+            "tape": ["Tape P101 from 'Tape' sheet not found in SBOM BOM elements"],
+            "splices": ["Splice part P200 from 'Splices' sheet not found in SBOM BOM elements"],
+            "terminals_on_wpa": [],
+            "sheathed_multicore": [],
+        })
+
+    def test_optional_rules_skip_missing_sheets_and_columns(self):
+        validator = PlanValidator([("Tape", ["Other"], [("P100",)])])
+        self.assertEqual(DPF_COMPONENT_PLAN.run(validator), {
+            "tape": [], "splices": [], "terminals_on_wpa": [], "sheathed_multicore": [],
+        })
+
+    def test_required_rules_report_missing_sheets_and_columns(self):
+        plan = RulePlan([
+            Rule("tape", 'bom_elements', "Tape", "Leoni part number", 'partnumber'),
+            Rule("splices", 'bom_elements', "Splices", "Splice", 'partnumber'),
+        ])
+        validator = PlanValidator([("Splices", ["Other"], [])], bom_elements=[{'partnumber': 'P1'}])
+        self.assertEqual(plan.run(validator), {
+            "tape": ["'Tape' sheet not found in Excel"],
+            "splices": ["Required columns not found in Excel 'Splices' sheet: Splice"],
+        })
+        self.assertEqual(validator.scans, {})
+
+    def test_compare_rules_share_one_scan_of_their_source(self):
+        plan = RulePlan([
+            Rule("lengths", 'subassemblies', "Wires", "Wire", 'name', compare=[('quantity', "Length")],
+                 tolerance=0.01, unmatched='xml', label="Wire"),
+            Rule("colours", 'subassemblies', "Wires", "Wire", 'name', compare=[('colour', "Colour")],
+                 unmatched=None, label="Wire"),
+        ])
+        self.assertEqual(plan.sheet_columns(), {"Wires": ["Wire", "Length", "Colour"]})
+        validator = PlanValidator(
+            [("Wires", ["Wire", "Length", "Colour"], [(1, 2.0, "RD"), (2, "3.5", "BK"), (3, 1.0, "GN")])],
+            subassemblies=[
+                {'name': '1', 'quantity': '2.005', 'colour': 'RD'},
+                {'name': '2', 'quantity': '3.6', 'colour': ' BK '},
+                {'name': '4', 'quantity': '1', 'colour': 'WH'},
+            ],
+        )
+        self.assertEqual(plan.run(validator), {
+            "lengths": [
+                "Wire Length mismatch for 2: SBOM=3.6, Excel=3.5",
+                "Wire 4 not found in Excel 'Wires' sheet",
+            ],
+            "colours": [],
+        })
+        self.assertEqual(validator.scans, {'subassemblies': 1})
+
+
+class StageTimingTests(TestCase):
+    def view(self, request):
+        with stage('xml_parse'):
+            pass
+        with stage('rules'):
+            pass
+        return HttpResponse("ok")
+
+    @override_settings(SBOM_INSTRUMENTATION_ENABLED=True)
+    def test_stages_are_reported(self):
+        middleware = StageTimingMiddleware(self.view)
+        with mock.patch.object(histograms, 'observe') as observe, self.assertLogs('xmlprocessor.timing') as logs:
+            response = middleware(RequestFactory().post('/api/validate/'))
+
+        self.assertRegex(
+            response['Server-Timing'], r"^xml_parse;dur=\d+\.\d, rules;dur=\d+\.\d, total;dur=\d+\.\d$"
+        )
+        logged = json.loads(logs.records[0].getMessage())
+        self.assertEqual((logged['event'], logged['method'], logged['path'], logged['status']),
+                         ('stage_timings', 'POST', '/api/validate/', 200))
+        self.assertEqual([entry['name'] for entry in logged['stages']], ['xml_parse', 'rules'])
+        self.assertEqual([call.args[0] for call in observe.call_args_list], ['xml_parse', 'rules', 'total'])
+
+    @override_settings(SBOM_INSTRUMENTATION_ENABLED=True)
+    def test_request_without_stages_is_left_alone(self):
+        response = StageTimingMiddleware(lambda request: HttpResponse("ok"))(RequestFactory().get('/'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    @override_settings(SBOM_INSTRUMENTATION_ENABLED=False)
+    def test_disabled_instrumentation_has_no_effect(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            StageTimingMiddleware(self.view)
+        with mock.patch.object(histograms, 'observe') as observe:
+            response = self.client.get(reverse('metrics'))
+            self.assertEqual(self.view(None).content, b"ok")
+        self.assertEqual(response.status_code, 404)
+        observe.assert_not_called()
+
+
+@override_settings(SBOM_INSTRUMENTATION_ENABLED=True, SBOM_METRICS_TOKEN='s3cret')
+class MetricsTests(TestCase):
+    def test_requires_the_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        # Behind a reverse proxy every request comes from the loopback address
+        self.assertEqual(self.client.get(reverse('metrics'), REMOTE_ADDR='127.0.0.1').status_code, 403)
+
+    def test_serves_the_histograms(self):
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"# TYPE sbom_stage_duration_seconds histogram", response.content)
+
+    @override_settings(SBOM_METRICS_TOKEN='')
+    def test_not_served_without_a_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+
+
+def _reference_hierarchy(rows):
+    """Parents, depths and subtree totals of (id, parentsubid, quantity) rows, one row at a time."""
+    first_row = {}
+    for row, (subassembly_id, _, _) in enumerate(rows):
+        if subassembly_id is not None:
+            first_row.setdefault(subassembly_id, row)
+    parents = [first_row.get(parent_id, NO_PARENT) if parent_id is not None else NO_PARENT
+               for _, parent_id, _ in rows]
+
+    depths = []
+    for row in range(len(rows)):
+        depth, seen = 0, {row}
+        while parents[row] != NO_PARENT:
+            row = parents[row]
+            if row in seen:
+                depth = -1
+                break
+            seen.add(row)
+            depth += 1
+        depths.append(depth)
+
+    totals = []
+    for row in range(len(rows)):
+        own = rows[row][2] if rows[row][2] is not None else 0.0
+        if depths[row] < 0:
+            totals.append(own)
+            continue
+        total = 0.0
+        for other in range(len(rows)):
+            node = other
+            while depths[other] >= 0 and node != NO_PARENT:
+                if node == row:
+                    total += rows[other][2] if rows[other][2] is not None else 0.0
+                    break
+                node = parents[node]
+        totals.append(total)
+    return parents, depths, totals
+
+
+class SubassemblyHierarchyTests(TestCase):
+    def table(self, rows):
+        table = AttributeTable(numeric_columns=('quantity',))
+        for subassembly_id, parent_id, quantity in rows:
+            attributes = {'id': subassembly_id, 'parentsubid': parent_id,
+                          'quantity': str(quantity) if quantity is not None else None}
+            table.append({name: value for name, value in attributes.items() if value is not None})
+        return table
+
+    def assert_matches_reference(self, rows):
+        hierarchy = SubassemblyHierarchy(self.table(rows))
+        parents, depths, totals = _reference_hierarchy(rows)
+        self.assertEqual(hierarchy.parents.tolist(), parents)
+        self.assertEqual(hierarchy.depths.tolist(), depths)
+        self.assertEqual(hierarchy.rollup('quantity')['quantity'].tolist(), totals)
+        position = {row: i for i, row in enumerate(hierarchy.order.tolist())}
+        self.assertEqual(sorted(position), [row for row, depth in enumerate(depths) if depth >= 0])
+        for row, parent in enumerate(parents):
+            if row in position and parent != NO_PARENT:
+                self.assertLess(position[parent], position[row])
+
+    def test_duplicate_ids_resolve_to_the_first_row(self):
+        rows = [
+            ("A", None, 1), ("B", "A", 2), ("A", None, 4), ("C", "A", 8), ("B", "C", 16),
+        ]
+        hierarchy = SubassemblyHierarchy(self.table(rows))
+        self.assertEqual(hierarchy.row("A"), 0)
+        self.assertEqual(hierarchy.row("B"), 1)
+        self.assertEqual(hierarchy.parents.tolist(), [NO_PARENT, 0, NO_PARENT, 0, 3])
+        self.assertEqual(sorted(hierarchy.children(0).tolist()), [1, 3])
+        self.assertEqual(hierarchy.rollup('quantity')['quantity'].tolist(), [27.0, 2.0, 4.0, 24.0, 16.0])
+        self.assert_matches_reference(rows)
+
+    def test_cycles_and_unknown_parents(self):
+        rows = [("A", "B", 1), ("B", "A", 2), ("C", "Z", 4), ("D", "C", None), (None, "C", 8)]
+        hierarchy = SubassemblyHierarchy(self.table(rows))
+        self.assertEqual(hierarchy.cyclic.tolist(), [0, 1])
+        self.assertEqual(hierarchy.roots.tolist(), [2])
+        self.assertEqual(hierarchy.rollup('quantity')['quantity'].tolist(), [1.0, 2.0, 12.0, 0.0, 8.0])
+        self.assert_matches_reference(rows)
+
+    def test_matches_the_reference_on_random_trees(self):
+        rng = random.Random(20)
+        for _ in range(200):
+            ids = [f"S{i}" for i in range(rng.randint(1, 12))]
+            rows = [
+                (rng.choice(ids + [None]), rng.choice(ids + ["X", None]), rng.choice([None, 0.5, 1, 2, 3]))
+                for _ in range(rng.randint(0, 25))
+            ]
+            self.assert_matches_reference(rows)
+
+
+RESULT_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'validation_results': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'result-cache-tests'},
+}
+
+
+@override_settings(CACHES=RESULT_CACHES, SBOM_RESULT_CACHE_ENABLED=True)
+class ResultCacheTests(TestCase):
+    def setUp(self):
+        caches['validation_results'].clear()
+        patcher = mock.patch.object(pipeline, 'SBOMValidator')
+        self.validator_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.validator = self.validator_class.return_value
+        self.validator.validate.return_value = {'status': 'pass'}
+        self.validator.generate_report.side_effect = lambda results: {
+            'content': b'%PDF-' + str(self.validator.generate_report.call_count).encode(),
+            'report_name': f"report_{self.validator.generate_report.call_count}.pdf",
+        }
+
+    def validate(self, wcpr='P1', wcpar='A1', wcusfa='true'):
+        return pipeline.validate_files(
+            SimpleUploadedFile('sbom.xml', b'<sbom/>'), SimpleUploadedFile('dpf.xlsx', b'workbook'),
+            wcpr, wcpar, wcusfa, use_pools=False
+        )
+
+    def test_hit_renders_a_new_report_from_the_cached_results(self):
+        self.assertEqual(self.validate(), (b'%PDF-1', 'report_1.pdf'))
+        self.assertEqual(self.validate(), (b'%PDF-2', 'report_2.pdf'))
+        self.assertEqual(self.validator.validate.call_count, 1)
+        # The hit builds a validator without files, only to render the cached results
+        self.assertEqual(self.validator_class.call_args_list[1], mock.call())
+        self.assertEqual(self.validator.generate_report.call_args_list[1], mock.call({'status': 'pass'}))
+        self.assertEqual((self.validator.wcpr, self.validator.wcpar, self.validator.wcusfa), ('P1', 'A1', 'true'))
+
+    def test_new_validator_version_misses(self):
+        self.validate()
+        with mock.patch.object(result_cache, 'VALIDATOR_VERSION', 'changed'):
+            self.validate()
+        self.assertEqual(self.validator.validate.call_count, 2)
+
+    def test_workcenter_inputs_miss(self):
+        self.validate()
+        self.validate(wcpr='P2')
+        self.validate(wcpar='A2')
+        self.validate(wcusfa='false')
+        self.assertEqual(self.validator.validate.call_count, 4)
+
+    def test_key_covers_every_input(self):
+        base = ('x' * 64, 'e' * 64, 'P1', 'A1', 'true', 'regex')
+        keys = {result_cache.make_key(*base)}
+        for position, other in enumerate(('y' * 64, 'f' * 64, 'P2', 'A2', 'false', 'nlp')):
+            keys.add(result_cache.make_key(*base[:position], other, *base[position + 1:]))
+        self.assertEqual(len(keys), 7)
+        self.assertNotEqual(result_cache.make_key(*base[:2], None, *base[3:]), result_cache.make_key(*base[:2], '', *base[3:]))
+
+    def test_oversized_results_are_not_kept(self):
+        with self.settings(SBOM_RESULT_CACHE_MAX_ENTRY_BYTES=10):
+            self.validate()
+            self.validate()
+        self.assertEqual(self.validator.validate.call_count, 2)
+
+
+class BatchTests(TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir)
+
+    def archive(self, members):
+        path = os.path.join(self.workdir, 'batch.zip')
+        with zipfile.ZipFile(path, 'w') as zf:
+            for name, source in members.items():
+                if isinstance(source, bytes):
+                    zf.writestr(name, source)
+                else:
+                    zf.write(source, name)
+        return path
+
+    def test_extract_archive_flattens_the_sboms_and_dpfs(self):
+        archive = self.archive({
+            'a/sbom.xml': b'<sbom/>', 'b/sbom.xml': b'<other/>', 'dpf.XLSX': b'workbook',
+            'notes.txt': b'ignored', '__MACOSX/a/._sbom.xml': b'', 'a/.hidden.xml': b'',
+        })
+        extract_to = os.path.join(self.workdir, 'out')
+        os.mkdir(extract_to)
+        sboms, dpfs = extract_archive(archive, extract_to)
+        self.assertEqual([label for label, _ in sboms], ['a/sbom.xml', 'b/sbom.xml'])
+        self.assertEqual([label for label, _ in dpfs], ['dpf.XLSX'])
+        with open(sboms[1][1], 'rb') as f:
+            self.assertEqual(f.read(), b'<other/>')
+        self.assertEqual(sorted(os.listdir(extract_to)), ['0_sbom.xml', '1_sbom.xml', '2_dpf.XLSX'])
+
+    def test_extract_archive_rejects_bad_archives(self):
+        not_a_zip = os.path.join(self.workdir, 'batch.zip')
+        with open(not_a_zip, 'wb') as f:
+            f.write(b'not a zip')
+        with self.assertRaisesMessage(BatchError, "not a valid zip"):
+            extract_archive(not_a_zip, self.workdir)
+        archive = self.archive({'sbom.xml': b'x' * 100})
+        with self.settings(SBOM_BATCH_MAX_ARCHIVE_BYTES=99), self.assertRaisesMessage(BatchError, "too large"):
+            extract_archive(archive, self.workdir)
+
+    def test_run_batch_checks_the_batch_up_front(self):
+        with self.assertRaisesMessage(BatchError, "No SBOM"):
+            run_batch([], [('dpf', FIXTURE_DPF)], {})
+        with self.assertRaisesMessage(BatchError, "No DPF"):
+            run_batch([('sbom', FIXTURE_SBOM)], [], {})
+        with self.settings(SBOM_BATCH_MAX_ITEMS=1), self.assertRaisesMessage(BatchError, "exceeds the limit of 1"):
+            run_batch([('a', FIXTURE_SBOM), ('b', FIXTURE_SBOM)], [('dpf', FIXTURE_DPF)], {})
+
+    def test_run_batch_yields_items_then_a_summary(self):
+        broken = os.path.join(self.workdir, 'broken.xml')
+        with open(broken, 'w') as f:
+            f.write('<sbom')
+        entries = list(run_batch([('good', FIXTURE_SBOM), ('broken', broken)], [('dpf', FIXTURE_DPF)], {}))
+        self.assertEqual([entry['type'] for entry in entries], ['item', 'item', 'summary'])
+        good, bad, summary = entries
+        self.assertEqual((good['sbom'], good['dpf']), ('good', 'dpf'))
+        self.assertIn(good['status'], ('pass', 'fail'))
+        self.assertEqual(bad['status'], 'error')
+        self.assertEqual(summary['items'], 2)
+        self.assertEqual(summary['statuses'], {good['status']: 1, 'error': 1})
+        self.assertEqual(summary['issues'], {key: len(messages) for key, messages in good['issues'].items()})
+
+    def test_view_streams_ndjson_in_process(self):
+        archive = self.archive({'sboms/909.xml': FIXTURE_SBOM, 'dpf.xlsx': FIXTURE_DPF})
+        with open(archive, 'rb') as f:
+            response = self.client.post(reverse('validate-batch'), {
+                'archive': f, 'workcenter_plantreference': 'P1',
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        item, summary = [json.loads(line) for line in lines]
+        self.assertEqual((item['type'], item['sbom'], item['dpf']), ('item', 'sboms/909.xml', 'dpf.xlsx'))
+        self.assertEqual((summary['type'], summary['items']), ('summary', 1))
+        # The default SBOM_BATCH_WORKERS validates in the request process, without a pool
+        self.assertNotIn('SBOM_BATCH_WORKERS', parallel._executors)
+
+    def test_view_rejects_requests_without_files(self):
+        response = self.client.post(reverse('validate-batch'), {})
+        self.assertEqual(response.status_code, 400)
+        archive = SimpleUploadedFile('batch.zip', b'not a zip')
+        response = self.client.post(reverse('validate-batch'), {'archive': archive})
+        self.assertEqual(response.json(), {"error": "Archive is not a valid zip file"})
+
+
+def _old_twist_values(description):
+    """The per-field regexes validate() read a twisted wire cost result with before parse_description."""
+    pitch_match = re.search(r"Pitch:\s*([\d.]+)", description)
+    untwist_a_match = re.search(r"Untwist A:\s*([\d.]+)", description)
+    untwist_b_match = re.search(r"Untwist B:\s*([\d.]+)", description)
+    twist_len_match = re.search(r"Twist length:\s*([\d.]+)", description)
+    if not all([pitch_match, untwist_a_match, untwist_b_match, twist_len_match]):
+        return None
+    values = (float(pitch_match.group(1)), float(untwist_a_match.group(1)),
+              float(untwist_b_match.group(1)), float(twist_len_match.group(1)))
+    wires = []
+    for group in re.findall(r"Twist\s+([^,]+(?:,[^,]+)*)", description):
+        wires.extend(re.findall(r"(\d+\(\d+\))", group))
+    return values, wires
+
+
+def _old_fallback_values(description):
+    """The case-insensitive fallback of _extract_wire_info_nlp before parse_description."""
+    result = {}
+    for field, pattern in (('pitch', r'pitch:\s*([\d.]+)'), ('untwist_a', r'untwist a:\s*([\d.]+)'),
+                           ('untwist_b', r'untwist b:\s*([\d.]+)'), ('twist_length', r'twist length:\s*([\d.]+)')):
+        match = re.search(pattern, description.lower())
+        if match:
+            result[field] = float(match.group(1))
+    return result
+
+
+def _outcome(function, *args):
+    try:
+        return function(*args)
+    except ValueError as e:
+        return ('ValueError', str(e))
+
+
+class DescriptionTests(TestCase):
+    EDGE_CASES = [
+        "",
+        "Twist 1(1), 2(1) Untwist A: 10 Untwist B: 20 Twist length: 300 Pitch: 15",
+        "Twist 1(1), 2(1) Untwist A: 1.2.3 Untwist B: 20 Twist length: 300 Pitch: 15",
+        "Twist 1(1), 2(1) Untwist A: 10 Untwist B: 20 Twist length: 300 Pitch: .",
+        "Twist 1(1), 2(1) Untwist A: 1.2.3 Untwist B: 20 Twist length: 300",
+        "Pitch: 5 Pitch: 7 Untwist A: 1 Untwist B: 2 Twist length: 3 Twist 4(1), 5(2)",
+        "Untwist A: 1 Untwist B: 2 Twist length: 3 Pitch: 4 9(9)",
+        "Twist  41(1) (WH/BU), 51(1) (BU/YE) Twist 61(1) Untwist A: 1 Untwist B: 2 Twist length: 3 Pitch: 4",
+        "twist 1(1) untwist a: 10 UNTWIST B: 20 twist length: 300 pitch: 2..5",
+        "twist 1(1) untwist a: 10 untwist b: 20 twist length: 300 pitch: 15",
+    ]
+
+    @classmethod
+    def fixture_descriptions(cls):
+        descriptions = set()
+        for path in glob.glob(os.path.join(MEDIA_FIXTURES, 'xml_files', '*.xml')):
+            with open(path, encoding='utf-8', errors='replace') as f:
+                descriptions.update(html.unescape(d) for d in re.findall(r' description="([^"]*)"', f.read()))
+        return sorted(descriptions)
+
+    def test_matches_the_old_regexes(self):
+        descriptions = self.fixture_descriptions()
+        self.assertTrue(any('Pitch' in description for description in descriptions))
+        for description in descriptions + self.EDGE_CASES:
+            with self.subTest(description=description):
+                parsed = _outcome(parse_description, description)
+                if hasattr(parsed, 'wires'):
+                    values = (parsed.pitch, parsed.untwist_a, parsed.untwist_b, parsed.twist_length)
+                    parsed = None if None in values else (values, list(parsed.wires))
+                self.assertEqual(parsed, _outcome(_old_twist_values, description))
+
+                fallback = _outcome(parse_description, description, True)
+                if hasattr(fallback, 'wires'):
+                    fallback = {field: value for field, value in fallback._asdict().items()
+                                if field != 'wires' and value is not None}
+                self.assertEqual(fallback, _outcome(_old_fallback_values, description))
+
+    def test_malformed_number_is_a_validation_error(self):
+        with self.assertRaisesMessage(ValueError, "could not convert string to float: '1.2.3'"):
+            parse_description("Twist 1(1) Untwist A: 1.2.3 Untwist B: 2 Twist length: 3 Pitch: 4")
+        # Incomplete descriptions are skipped by the twisted wire check, malformed numbers and all
+        self.assertIsNone(parse_description("Twist 1(1) Untwist A: 1.2.3 Untwist B: 2").untwist_a)
+
+
+SMALL_SBOM = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sbomexport version="1">
+  <header id="h1"><costresult id="outside"/></header>
+  <sbom id="S1" name="first">
+    <sbomsubassembly id="A" parentsubid="" quantity="1">
+      <sbomsubassembly id="A.1" parentsubid="A"/>
+      <costresultset><costresult id="c1" description="Twist 1(1) Pitch: 5" resultvalue="0.5"/></costresultset>
+    </sbomsubassembly>
+    <sbomsubassembly id="B" parentsubid="A" quantity="2"><bomelement id="b0" partnumber="P0"/></sbomsubassembly>
+    <costresultset><costresult id="c2" description="d &amp; e"/><costresult id="c3"/></costresultset>
+    <bomelementset><bomelement id="b1" partnumber="P1" quantity="3"/><bomelement id="b2"/></bomelementset>
+  </sbom>
+  <sbom id="S2"><bomelement id="b3" partnumber="P3"/></sbom>
+</sbomexport>
+"""
+
+
+def _old_dom_records(source, wanted):
+    """The SBOM records _parse_xml read with ElementTree.parse and findall before the streaming engines."""
+    records = []
+    for sbom in ElementTree.parse(source).getroot().findall('sbom'):
+        elements = {'sbomsubassembly': sbom.findall('sbomsubassembly'),
+                    'costresult': sbom.findall('.//costresult'), 'bomelement': sbom.findall('.//bomelement')}
+        records.append((dict(sbom.attrib), {
+            tag: [xml_engines._project(elem.attrib, wanted[tag]) for elem in elements[tag]] for tag in wanted
+        }))
+    return records
+
+
+def _engine_records(engine, source, wanted):
+    """Engine events grouped per sbom and tag (lxml groups tags, iterparse interleaves them)."""
+    records = []
+    for tag, attributes in engine(source, wanted):
+        if tag == 'sbom':
+            records.append((attributes, {tag: [] for tag in wanted}))
+        else:
+            records[-1][1][tag].append(attributes)
+    return records
+
+
+class XMLEngineTests(TestCase):
+    PROJECTIONS = [
+        {tag: None for tag in xml_engines.ELEMENT_TAGS},
+        {'sbomsubassembly': ('id', 'parentsubid', 'missing'), 'costresult': ('description',),
+         'bomelement': ('partnumber',)},
+        {'bomelement': ('partnumber', 'quantity')},
+        {},
+    ]
+
+    def engines(self):
+        engines = [xml_engines.iter_stdlib]
+        if xml_engines.etree is not None:
+            engines.append(xml_engines.iter_lxml)
+        return engines
+
+    def assert_engines_match_the_dom_parse(self, path):
+        for wanted in self.PROJECTIONS:
+            expected = _old_dom_records(path, wanted)
+            self.assertTrue(expected)
+            for engine in self.engines():
+                with self.subTest(engine=engine.__name__, wanted=wanted):
+                    self.assertEqual(_engine_records(engine, path, wanted), expected)
+
+    def test_small_sbom(self):
+        path = os.path.join(tempfile.mkdtemp(), 'sbom.xml')
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        with open(path, 'wb') as f:
+            f.write(SMALL_SBOM)
+        self.assert_engines_match_the_dom_parse(path)
+        records = _engine_records(xml_engines.iter_stdlib, path, self.PROJECTIONS[1])
+        self.assertEqual([sub['id'] for sub in records[0][1]['sbomsubassembly']], ['A', 'B'])
+        self.assertEqual(records[0][1]['costresult'][1], {'description': 'd & e'})
+        self.assertEqual(records[1][1]['bomelement'], [{'partnumber': 'P3'}])
+
+    def test_fixture_sbom(self):
+        self.assert_engines_match_the_dom_parse(FIXTURE_SBOM)
+
+    @skipIf(xml_engines.etree is None, "lxml is not installed")
+    def test_get_engine(self):
+        self.assertIs(xml_engines.get_engine('lxml'), xml_engines.iter_lxml)
+        with self.settings(SBOM_XML_ENGINE='stdlib'):
+            self.assertIs(xml_engines.get_engine(), xml_engines.iter_stdlib)
+        with self.assertRaisesMessage(ValueError, "Unknown XML engine: dom"):
+            xml_engines.get_engine('dom')
+
+
+class WorkbookProjectionTests(TestCase):
+    def workbook(self, **kwargs):
+        validator = SBOMValidator(excel_file_path=FIXTURE_DPF, excel_sheets=["Wires Lengths", "Tape"],
+                                  excel_columns={"Tape": ["Leoni part number", "Remarks", "Not a column"]}, **kwargs)
+        self.addCleanup(validator.close)
+        return validator
+
+    def loaded(self, validator):
+        return [sheet['name'] for sheet in validator.excel_data['sheets'] if sheet['loaded']]
+
+    def test_only_the_projected_sheets_and_columns_are_read(self):
+        validator = self.workbook()
+        self.assertEqual(self.loaded(validator), ["Tape", "Wires Lengths"])
+        tape = validator.get_sheet_by_name("Tape")
+        self.assertEqual(tape['headers'], ["Leoni part number", "Remarks"])
+        self.assertTrue(all(len(row) == 2 for row in tape['data']))
+        self.assertEqual(validator.get_sheet_by_name("Wires Lengths")['headers'], ["Wire Nr", "Length"])
+
+    def test_other_sheets_are_read_on_first_access(self):
+        validator = self.workbook()
+        twisted = validator.get_sheet_by_name("Twisted Wires")
+        self.assertEqual(twisted['headers'][:2], ["Wires Nr", "Customer Number"])
+        self.assertIn("Twisted Wires", self.loaded(validator))
+        self.assertEqual(validator.filter_sheets(name="Splices")['name'], "Splices")
+        self.assertIsNone(validator.get_sheet_by_name("No such sheet"))
+
+    def test_unread_sheets_raise_after_close(self):
+        validator = self.workbook()
+        validator.close()
+        self.assertEqual(validator.get_sheet_by_name("Tape")['headers'], ["Leoni part number", "Remarks"])
+        with self.assertRaisesMessage(ValueError, "Sheet 'Twisted Wires' was not loaded before the workbook was closed"):
+            validator.get_sheet_by_name("Twisted Wires")
+        with self.assertRaisesMessage(ValueError, "Sheet 'Splices' was not loaded"):
+            validator.filter_sheets(name="Splices")
+
+    def test_unread_sheets_are_read_from_the_source_after_a_snapshot_load(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        cache = ArtifactCache(directory, 64 * 1024 * 1024)
+        first = self.workbook(artifact_cache=cache)
+        with mock.patch.object(SBOMValidator, '_parse_excel') as parse_excel:
+            restored = self.workbook(artifact_cache=cache)
+        parse_excel.assert_not_called()
+        self.assertEqual(restored.excel_data['sheets'][3], first.excel_data['sheets'][3])
+        self.assertEqual(restored.get_sheet_by_name("Twisted Wires")['headers'][0], "Wires Nr")
+
+
+class ArtifactCacheTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache = ArtifactCache(self.directory, 64 * 1024 * 1024)
+
+    def snapshots(self):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith('.snap'))
+
+    def test_round_trip(self):
+        key = self.cache.key('xml', FIXTURE_SBOM, variant=('projection',))
+        self.assertIsNone(self.cache.load(key))
+        data = {'sboms': [{'attributes': {'id': 'S1'}, 'cost_results': [{'description': 'Twist'}]}]}
+        self.cache.store(key, data)
+        self.assertEqual(self.cache.load(key), data)
+        self.assertEqual(self.snapshots(), [key + '.snap'])
+        # Same content elsewhere shares the snapshot; another kind or variant doesn't
+        with open(FIXTURE_SBOM, 'rb') as f:
+            self.assertEqual(self.cache.key('xml', ContentFile(f.read()), variant=('projection',)), key)
+        self.assertNotEqual(self.cache.key('excel', FIXTURE_SBOM, variant=('projection',)), key)
+        self.assertNotEqual(self.cache.key('xml', FIXTURE_SBOM), key)
+
+    def test_least_recently_used_snapshots_are_evicted(self):
+        for number in range(3):
+            self.cache.store(f"k{number}", b'x' * 1000)
+            os.utime(os.path.join(self.directory, f"k{number}.snap"), (1000 + number, 1000 + number))
+        self.assertEqual(self.cache.load('k0'), b'x' * 1000)  # now the most recently used
+        self.cache.max_bytes = 2500
+        self.cache.evict()
+        self.assertEqual(self.snapshots(), ['k0.snap', 'k2.snap'])
+        self.cache.max_bytes = 0
+        self.cache.store('k3', b'y')
+        self.assertEqual(self.snapshots(), [])
+
+    def test_other_parser_versions_are_not_read(self):
+        key = self.cache.key('xml', FIXTURE_SBOM)
+        self.cache.store(key, {'sboms': []})
+        with mock.patch.object(artifact_cache, 'PARSER_VERSION', 'other'):
+            other_key = self.cache.key('xml', FIXTURE_SBOM)
+        self.assertNotEqual(other_key, key)
+        self.assertIsNone(self.cache.load(other_key))
+
+    def test_bad_snapshots_are_not_read(self):
+        with open(os.path.join(self.directory, 'foreign.snap'), 'wb') as f:
+            f.write(b'NOTASNAP' + pickle.dumps({'sboms': []}))
+        self.assertIsNone(self.cache.load('foreign'))
+        self.cache.store('truncated', {'sboms': list(range(1000))})
+        path = os.path.join(self.directory, 'truncated.snap')
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) // 2)
+        self.assertIsNone(self.cache.load('truncated'))
+        self.assertFalse(os.path.exists(path))
+
+
+@override_settings(SBOM_RESULT_CACHE_ENABLED=False)
+class PDFReportTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create(username='validator', email='validator@example.com')
+
+    def assert_pdf(self, content):
+        self.assertIs(type(content), bytes)
+        self.assertTrue(content.startswith(b'%PDF-'))
+        self.assertTrue(content.rstrip().endswith(b'%%EOF'))
+
+    def test_reports_are_rendered_in_memory(self):
+        validator = SBOMValidator(xml_file_path=FIXTURE_SBOM, excel_file_path=FIXTURE_DPF)
+        validator.wcpr, validator.wcpar, validator.wcusfa = 'P1', 'A1', 'true'
+        with mock.patch('builtins.open', side_effect=AssertionError("reports are not written to disk")):
+            report = validator.generate_report(validator.validate())
+            nlp_report = validator.generate_nlp_report({
+                "status": "pass", "message": "ok", "mismatches": [], "workcenter_validation": [],
+                "wire_length_validation": [], "nlp_processing_notes": [], "component_validation": [],
+            })
+        validator.close()
+        self.assert_pdf(report['content'])
+        self.assertRegex(report['report_name'], r"^sbom_validation_report_\d{8}_\d{6}\.pdf$")
+        self.assert_pdf(nlp_report['content'])
+
+    def test_validate_returns_the_stored_report(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with open(FIXTURE_SBOM, 'rb') as sbom, open(FIXTURE_DPF, 'rb') as dpf:
+            response = client.post(reverse('validate'), {
+                'sbom': sbom, 'excel_file': dpf, 'workcenter_plantreference': 'P1',
+            }, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        content = b''.join(response.streaming_content)
+        self.assert_pdf(content)
+        report = Report.objects.get(user=self.user)
+        with report.content.open('rb') as stored:
+            self.assertEqual(stored.read(), content)
+        self.assertEqual(response['Content-Disposition'],
+                         f'attachment; filename="{os.path.basename(report.content.name)}"')
+
+
+class ReportListingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='validator', email='validator@example.com')
+        other = User.objects.create(username='other', email='other@example.com')
+        base = now()
+        # Several reports share a timestamp, so the id has to break the tie
+        for user, minutes in [(self.user, 0), (self.user, 5), (other, 5), (self.user, 5), (self.user, 10),
+                              (other, 0), (self.user, 10), (self.user, 0), (self.user, 5)]:
+            report = Report.objects.create(user=user, content='reports/report.pdf', sbom='xml_files/a.xml')
+            Report.objects.filter(id=report.id).update(created_at=base + timedelta(minutes=minutes))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url, page_size):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url, {'page_size': page_size} if not pages else None)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(row['id'] for row in response.json()['results'])
+            url = response.json()['next']
+            pages += 1
+        return ids, pages
+
+    def expected(self, reports):
+        return [report.id for report in sorted(reports, key=lambda r: (r.created_at, r.id), reverse=True)]
+
+    def test_pages_follow_created_at_then_id(self):
+        ids, pages = self.walk(reverse('get-self-reports'), 3)
+        self.assertEqual(ids, self.expected(Report.objects.filter(user=self.user)))
+        self.assertEqual(pages, 3)
+        ids, _ = self.walk(reverse('view-all-reports'), 4)
+        self.assertEqual(ids, self.expected(Report.objects.all()))
+
+    def test_page_size_is_capped(self):
+        with mock.patch('xmlprocessor.serializers.ReportCursorPagination.max_page_size', 2):
+            response = self.client.get(reverse('view-all-reports'), {'page_size': 100})
+        self.assertEqual(len(response.json()['results']), 2)
+
+    def test_a_page_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('view-all-reports'), {'page_size': 50})
+        rows = response.json()['results']
+        self.assertEqual(len(rows), 9)
+        self.assertEqual({row['username'] for row in rows}, {'validator', 'other'})
+        self.assertEqual(rows[0]['content_url'], 'http://testserver/media/reports/report.pdf')
+        self.assertIsNone(rows[0]['dpf_url'])
+
+
+@skipIf(find_spec('spacy') is None, "spaCy is not installed")
+class NLPBatchTests(TestCase):
+    def setUp(self):
+        import spacy
+        # A blank English pipeline stands in for the model; the sentencizer is one of the
+        # components batch extraction disables
+        pipeline = spacy.blank('en')
+        pipeline.add_pipe('sentencizer')
+        patcher = mock.patch.dict(nlp._pipelines, {'test-blank': pipeline})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.validator = SBOMValidator(nlp_model='test-blank')
+
+    def test_batch_matches_one_description_at_a_time(self):
+        descriptions = DescriptionTests.fixture_descriptions() + [
+            desc for desc in DescriptionTests.EDGE_CASES if '1.2.3' not in desc and '..' not in desc
+        ]
+        batch = self.validator._extract_wire_info_batch(descriptions + descriptions[:5] + [None], batch_size=7)
+        self.assertEqual(list(batch), list(dict.fromkeys(d for d in descriptions if d)))
+        for description, wire_info in batch.items():
+            with self.subTest(description=description):
+                self.assertEqual(wire_info, self.validator._extract_wire_info_nlp(description))
+
+    def test_nothing_to_extract(self):
+        self.assertEqual(self.validator._extract_wire_info_batch(['', None]), {})
+
+
+class AttributeTableTests(TestCase):
+    ROWS = [
+        {'id': 'A', 'parentsubid': '', 'quantity': '2'},
+        {'id': 'B', 'parentsubid': 'A', 'quantity': 'n/a'},
+        {'id': 'C', 'parentsubid': 'A', 'unitofmeasure': 'per length'},
+        {'id': 'D', 'parentsubid': None, 'quantity': '0.5'},
+    ]
+
+    def table(self):
+        table = AttributeTable(numeric_columns=('quantity',), aliases={'parent_id': 'parentsubid'})
+        for attributes in self.ROWS:
+            table.append(attributes)
+        return table
+
+    def test_rows_read_back_as_the_attributes_they_had(self):
+        table = self.table()
+        expected = [{name: value for name, value in row.items() if value is not None} for row in self.ROWS]
+        self.assertEqual(len(table), 4)
+        self.assertEqual([dict(row) for row in table], expected)
+        self.assertEqual(table[-1], expected[3])
+        self.assertEqual(table[1:3], expected[1:3])
+        with self.assertRaises(IndexError):
+            table[4]
+        # A column first seen on a later row is missing, not None, on the earlier ones
+        self.assertNotIn('unitofmeasure', table[0])
+        self.assertEqual(table[0].get('unitofmeasure', 'unset'), 'unset')
+        self.assertEqual(table[0]['parentsubid'], '')
+        self.assertEqual(len(table[2]), 3)
+        self.assertEqual(table.columns, ['id', 'parentsubid', 'quantity', 'unitofmeasure'])
+
+    def test_rows_are_read_only_views(self):
+        table = self.table()
+        row = table[1]
+        with self.assertRaises(TypeError):
+            row['id'] = 'X'
+        copy = row.copy()
+        copy['id'] = 'X'
+        self.assertEqual(row['id'], 'B')
+        self.assertEqual(repr(row), repr(dict(row)))
+
+    def test_aliases(self):
+        rows = list(self.table().iter_rows(aliases=True))
+        self.assertEqual([row['parent_id'] for row in rows], ['', 'A', 'A', None])
+        self.assertEqual(list(rows[1]), ['id', 'parentsubid', 'quantity', 'parent_id'])
+        self.assertNotIn('parent_id', self.table()[1])
+
+    def test_columns_and_numbers(self):
+        table = self.table()
+        self.assertEqual(list(table.iter_columns('id', 'parentsubid', 'missing')),
+                         [('A', '', None), ('B', 'A', None), ('C', 'A', None), ('D', None, None)])
+        self.assertIsNone(table.value(0, 'missing'))
+        quantities = table.numeric('quantity')
+        self.assertEqual(quantities[0], 2.0)
+        self.assertTrue(math.isnan(quantities[1]) and math.isnan(quantities[2]))
+        self.assertEqual(quantities[3], 0.5)
+        codes, values = table.codes('parentsubid')
+        self.assertEqual([values[code] for code in codes], ['', 'A', 'A', None])
+        self.assertEqual(len(values), 3)  # each distinct value once, plus the missing slot
+
+    def test_pickled_table_keeps_deduplicating(self):
+        table = pickle.loads(pickle.dumps(self.table()))
+        table.append({'id': 'E', 'parentsubid': 'A', 'quantity': '1'})
+        codes, values = table.codes('parentsubid')
+        self.assertEqual(codes[4], codes[1])
+        self.assertEqual(len(values), 3)
+        self.assertEqual(table[4], {'id': 'E', 'parentsubid': 'A', 'quantity': '1'})
+
+
+def _old_twisted_wire_messages(rows, descriptions):
+    """The nested loops validate() checked twisted wires with before the hash join (columns in FIELDS order)."""
+    messages = []
+    excel_wire_data = {}
+    for row in rows:
+        wire_nr = row[0]
+        if wire_nr:
+            excel_wire_data[wire_nr.strip()] = {
+                "pitch": row[1], "open_end1": row[2], "open_end2": row[3], "twist_len": row[4]
+            }
+    for description in descriptions:
+        if not description:
+            continue
+        parsed = parse_description(description)
+        if None in (parsed.pitch, parsed.untwist_a, parsed.untwist_b, parsed.twist_length):
+            continue
+        xml_values = {"pitch": parsed.pitch, "open_end1": parsed.untwist_a,
+                      "open_end2": parsed.untwist_b, "twist_len": parsed.twist_length}
+        for wire in parsed.wires:
+            wire_id = wire.strip()
+            if wire_id not in excel_wire_data:
+                messages.append(f"{wire_id} missing in Excel")
+                continue
+            excel_data = excel_wire_data[wire_id]
+            try:
+                for field, label in (("pitch", "Pitch"), ("open_end1", "Open end Length 1 (Untwist A)"),
+                                     ("open_end2", "Open end Length 2 (Untwist B)"), ("twist_len", "Length of twist")):
+                    excel_value = float(excel_data[field])
+                    if excel_value != xml_values[field]:
+                        messages.append(f"{label} mismatch for {wire_id}: SBOM={xml_values[field]}, Excel={excel_value}")
+            except (ValueError, TypeError) as e:
+                messages.append(f"Invalid numeric format in Excel for {wire_id}: {str(e)}")
+    return messages
+
+
+class TwistedWireTests(TestCase):
+    def messages(self, rows, descriptions):
+        sheet = normalise_sheet(rows, 0, [1, 2, 3, 4])
+        return [mismatch_message(mismatch) for mismatch in join_cost_results(sheet, descriptions)]
+
+    def test_matches_the_old_loops_on_random_sheets(self):
+        rng = random.Random(15)
+        wires = ["41(1)", "51(1)", "7(2)", "8(2)", "99(9)"]
+        numbers = ["20.0", "20", "50", "1.5", "545.0"]
+        for _ in range(300):
+            rows = [
+                [rng.choice(wires[:4] + [None, "", " 7(2) "])]
+                + [rng.choice([20.0, 20, "20", 50.0, 1.5, 545, "abc", None, ""]) for _ in range(4)]
+                for _ in range(rng.randint(0, 6))
+            ]
+            descriptions = []
+            for _ in range(rng.randint(0, 6)):
+                fields = [f"{name}: {rng.choice(numbers)}" for name in ("Untwist A", "Untwist B", "Twist length", "Pitch")
+                          if rng.random() > 0.1]
+                descriptions.append(f"Twist  {', '.join(rng.sample(wires, rng.randint(0, 3)))},  {' '.join(fields)}")
+            descriptions += rng.sample(descriptions, min(2, len(descriptions))) + [""]
+            self.assertEqual(self.messages(rows, descriptions), _old_twisted_wire_messages(rows, descriptions))
+
+    def test_matches_the_old_loops_on_the_fixtures(self):
+        validator = SBOMValidator(xml_file_path=FIXTURE_SBOM, excel_file_path=FIXTURE_DPF)
+        validator.close()
+        sheet = validator.get_sheet_by_name(TWISTED_WIRES_SHEET.sheet)
+        positions = [sheet['headers'].index(column) for column in TWISTED_WIRES_SHEET.columns]
+        rows = [[row[i] for i in positions] for row in sheet['data']]
+        descriptions = [result.get('description', '') for result in validator.get_cost_results()]
+        self.assertTrue(any('Twist' in description for description in descriptions))
+        self.assertEqual(self.messages(rows, descriptions), _old_twisted_wire_messages(rows, descriptions))
+
+    def test_messages(self):
+        rows = [["1(1)", 20, 50, "x", 545], ["2(1)", 20, 50, 50, 545]]
+        self.assertEqual(self.messages(rows, ["Twist 1(1), 2(1), 3(1) Untwist A: 55 Untwist B: 50 Twist length: 545 Pitch: 20"]), [
+            "Open end Length 1 (Untwist A) mismatch for 1(1): SBOM=55.0, Excel=50.0",
+            "Invalid numeric format in Excel for 1(1): could not convert string to float: 'x'",
+            "Open end Length 1 (Untwist A) mismatch for 2(1): SBOM=55.0, Excel=50.0",
+            "3(1) missing in Excel",
+        ])
+
+
+class BomElementIndexTests(TestCase):
+    ELEMENTS = [
+        {'id': 'b1', 'partnumber': 'P1', 'harnessobject_id': 'H1'},
+        {'id': 'b2', 'partnumber': ' P1 ', 'harnessobject_id': 'H2'},
+        {'id': 'b3', 'partnumber': 'P2'},
+        {'id': 'b4', 'partnumber': '  ', 'harnessobject_id': 'H1'},
+        {'id': 'b5', 'harnessobject_id': 'H1'},
+    ]
+
+    def scan(self, elements, **criteria):
+        return [element for element in elements
+                if all((element.get(name) or '').strip() == str(value).strip() for name, value in criteria.items())]
+
+    def test_lookups(self):
+        index = BomElementIndex(self.ELEMENTS)
+        self.assertEqual(len(index), 5)
+        self.assertEqual([e['id'] for e in index.find(partnumber='P1')], ['b1', 'b2'])
+        self.assertEqual([e['id'] for e in index.find(partnumber=' P1', harnessobject_id='H2')], ['b2'])
+        self.assertEqual(index.find(partnumber='P3'), [])
+        self.assertEqual(index.find(), self.ELEMENTS)
+        self.assertEqual(set(index.keys('partnumber')), {'P1', 'P2'})
+        self.assertEqual({value: [e['id'] for e in found] for value, found in
+                          index.lookup_many(['P1', 'P2 ', 'P9', None]).items()},
+                         {'P1': ['b1', 'b2'], 'P2 ': ['b3'], 'P9': [], None: []})
+
+    def test_indexes_are_built_on_first_use(self):
+        index = BomElementIndex(self.ELEMENTS, attributes=('partnumber', 'harnessobject_id'))
+        self.assertEqual(index._indexes, {})
+        index.find(partnumber='P2')
+        # Attributes listed together are indexed in the same pass; others wait for their own query
+        self.assertEqual(set(index._indexes), {'partnumber', 'harnessobject_id'})
+        index.find(id='b5')
+        self.assertEqual(set(index._indexes), {'partnumber', 'harnessobject_id', 'id'})
+
+    def test_matches_a_scan_of_random_elements(self):
+        rng = random.Random(21)
+        elements = [
+            {name: rng.choice(['P1', 'P2', ' P1', 'P3 ', '']) for name in ('partnumber', 'harnessobject_id')
+             if rng.random() > 0.2}
+            for _ in range(200)
+        ]
+        index = BomElementIndex(elements)
+        for _ in range(100):
+            criteria = {name: rng.choice(['P1', 'P2', 'P3', 'P4'])
+                        for name in rng.sample(['partnumber', 'harnessobject_id'], rng.randint(1, 2))}
+            self.assertEqual(index.find(**criteria), self.scan(elements, **criteria))
+
+    def test_validator_index_follows_its_xml_data(self):
+        validator = SBOMValidator(xml_file_path=FIXTURE_SBOM)
+        elements = validator.get_bom_elements()
+        part_number = next(e['partnumber'] for e in elements if e.get('partnumber'))
+        self.assertEqual(validator.find_bom_elements(partnumber=part_number),
+                         self.scan(elements, partnumber=part_number))
+        self.assertIs(validator.bom_element_index(), validator.bom_element_index())
+        validator.xml_data = {'sboms': [{'bom_elements': [{'partnumber': part_number}]}]}
+        self.assertEqual(validator.lookup_bom_elements([part_number]), {part_number: [{'partnumber': part_number}]})
+
+
+@override_settings(FILE_UPLOAD_HANDLERS=['xmlprocessor.upload_handlers.HashingFileUploadHandler'],
+                   SBOM_UPLOAD_SPILL_BYTES=100 * 1024)
+class HashingUploadTests(TestCase):
+    def upload(self, **files):
+        request = RequestFactory().post('/upload/', {
+            name: SimpleUploadedFile(f"{name}.bin", data) for name, data in files.items()
+        })
+        return request.FILES
+
+    def assert_upload(self, upload, data, cls):
+        self.assertIsInstance(upload, cls)
+        self.assertEqual(upload.sha256, hashlib.sha256(data).hexdigest())
+        self.assertEqual(upload.size, len(data))
+        self.assertEqual(upload.read(), data)
+        upload.seek(0)
+        self.assertEqual(result_cache.file_sha256(upload), upload.sha256)
+
+    def test_small_uploads_stay_in_memory(self):
+        data = random.Random(25).randbytes(100 * 1024)  # not over the spill threshold
+        self.assert_upload(self.upload(sbom=data)['sbom'], data, InMemoryUploadedFile)
+
+    def test_large_uploads_spill_to_a_temporary_file(self):
+        # The first 64 KB chunk is buffered, the second crosses the threshold
+        data = random.Random(25).randbytes(300 * 1024 + 7)
+        upload = self.upload(sbom=data)['sbom']
+        self.assert_upload(upload, data, TemporaryUploadedFile)
+        self.assertTrue(os.path.exists(upload.temporary_file_path()))
+
+    def test_each_file_has_its_own_digest(self):
+        small, large = b'<sbom/>', random.Random(25).randbytes(200 * 1024)
+        files = self.upload(sbom=small, excel_file=large)
+        self.assert_upload(files['sbom'], small, InMemoryUploadedFile)
+        self.assert_upload(files['excel_file'], large, TemporaryUploadedFile)
+
+    def test_interrupted_upload_closes_the_temporary_file(self):
+        handler = HashingFileUploadHandler()
+        handler.new_file('sbom', 'sbom.xml', 'text/xml', 0)
+        handler.receive_data_chunk(b'x' * (handler.spill_bytes + 1), 0)
+        temporary_path = handler.temporary_file.temporary_file_path()
+        handler.upload_interrupted()
+        self.assertFalse(os.path.exists(temporary_path))
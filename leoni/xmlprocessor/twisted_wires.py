@@ -0,0 +1,90 @@
+from collections import namedtuple
+
+from .descriptions import parse_description
+
+# (field, label used in the mismatch message), in the order the fields are checked
+FIELDS = (
+    ('pitch', "Pitch"),
+    ('open_end1', "Open end Length 1 (Untwist A)"),
+    ('open_end2', "Open end Length 2 (Untwist B)"),
+    ('twist_len', "Length of twist"),
+)
+_LABELS = dict(FIELDS)
+
+# One row of the mismatch table. field is one of FIELDS, or 'missing' (wire not in the sheet)
+# or 'invalid' (the sheet row has a non-numeric value; error holds the conversion error).
+TwistedWireMismatch = namedtuple('TwistedWireMismatch', ['wire_id', 'field', 'sbom', 'excel', 'error'])
+
+# A normalised sheet row: the field values converted up to the first one that isn't a number,
+# and that conversion error (None when all four converted).
+SheetRow = namedtuple('SheetRow', ['values', 'error'])
+
+
+def normalise_sheet(rows, wire_nr_idx, value_indexes):
+    """
+    Build {wire id: SheetRow} from the "Twisted Wires" rows, converting each value to float
+    once. value_indexes are the column indexes of the FIELDS, in order. Later rows win.
+    """
+    sheet = {}
+    for row in rows:
+        wire_nr = row[wire_nr_idx]
+        if not wire_nr:
+            continue
+        values = []
+        error = None
+        for idx in value_indexes:
+            try:
+                values.append(float(row[idx]))
+            except (ValueError, TypeError) as e:
+                error = str(e)
+                break
+        sheet[wire_nr.strip()] = SheetRow(tuple(values), error)
+    return sheet
+
+
+def _description_mismatches(sheet, description):
+    parsed = parse_description(description)
+    sbom_values = (parsed.pitch, parsed.untwist_a, parsed.untwist_b, parsed.twist_length)
+    if None in sbom_values:
+        return ()
+
+    mismatches = []
+    for wire in parsed.wires:
+        wire_id = wire.strip()
+        sheet_row = sheet.get(wire_id)
+        if sheet_row is None:
+            mismatches.append(TwistedWireMismatch(wire_id, 'missing', None, None, None))
+            continue
+        for (field, _), sbom_value, excel_value in zip(FIELDS, sbom_values, sheet_row.values):
+            if excel_value != sbom_value:
+                mismatches.append(TwistedWireMismatch(wire_id, field, sbom_value, excel_value, None))
+        if sheet_row.error is not None:
+            mismatches.append(TwistedWireMismatch(wire_id, 'invalid', None, None, sheet_row.error))
+    return tuple(mismatches)
+
+
+def join_cost_results(sheet, descriptions):
+    """
+    Hash-join the wires of each cost result description against the normalised sheet and
+    return the mismatch table, in cost result order. Descriptions repeat heavily across a
+    file, so each distinct one is joined once and its rows reused.
+    """
+    joined = {}
+    table = []
+    for description in descriptions:
+        if not description:
+            continue
+        rows = joined.get(description)
+        if rows is None:
+            rows = joined[description] = _description_mismatches(sheet, description)
+        table.extend(rows)
+    return table
+
+
+def mismatch_message(mismatch):
+    if mismatch.field == 'missing':
+        return f"{mismatch.wire_id} missing in Excel"
+    if mismatch.field == 'invalid':
+        return f"Invalid numeric format in Excel for {mismatch.wire_id}: {mismatch.error}"
+    return (f"{_LABELS[mismatch.field]} mismatch for {mismatch.wire_id}: "
+            f"SBOM={mismatch.sbom}, Excel={mismatch.excel}")
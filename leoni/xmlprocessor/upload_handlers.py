@@ -0,0 +1,63 @@
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import InMemoryUploadedFile, TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+class HashingFileUploadHandler(FileUploadHandler):
+    """
+    Replaces Django's memory and temporary-file handlers: each uploaded file is kept in memory
+    until it outgrows SBOM_UPLOAD_SPILL_BYTES (FILE_UPLOAD_MAX_MEMORY_SIZE by default), then
+    moved to a temporary file, and its SHA-256 is computed from the chunks as they arrive.
+    The resulting UploadedFile has `sha256` (hex digest) and `size` set, so the result cache,
+    artifact cache and blob storage never have to read it again just to hash it.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.spill_bytes = getattr(settings, 'SBOM_UPLOAD_SPILL_BYTES', settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+        self.received = 0
+        self.buffer = BytesIO()
+        self.temporary_file = None
+
+    def receive_data_chunk(self, raw_data, start):
+        self.digest.update(raw_data)
+        self.received += len(raw_data)
+        if self.temporary_file is None and self.received > self.spill_bytes:
+            self.temporary_file = TemporaryUploadedFile(
+                self.file_name, self.content_type, 0, self.charset, self.content_type_extra
+            )
+            self.temporary_file.write(self.buffer.getvalue())
+            self.buffer = None
+        (self.temporary_file or self.buffer).write(raw_data)
+        # Consumed: no later handler needs to see the data
+        return None
+
+    def file_complete(self, file_size):
+        if self.temporary_file is not None:
+            uploaded = self.temporary_file
+            uploaded.seek(0)
+            uploaded.size = file_size
+        else:
+            self.buffer.seek(0)
+            uploaded = InMemoryUploadedFile(
+                file=self.buffer,
+                field_name=self.field_name,
+                name=self.file_name,
+                content_type=self.content_type,
+                size=file_size,
+                charset=self.charset,
+                content_type_extra=self.content_type_extra,
+            )
+        uploaded.sha256 = self.digest.hexdigest()
+        return uploaded
+
+    def upload_interrupted(self):
+        if self.temporary_file is not None:
+            self.temporary_file.close()
@@ -1,5 +1,7 @@
 from django.urls import path
 from .views import request_reset_email, delete_validator_report, get_self_reports, confirm_user, add_user, delete_user, view_users, update_role, upload_report, view_all_reports, reset_cred, validate
+from .views import submit_validation_job, validation_job_status, download_validation_job, metrics
+from .views import validate_batch
 from rest_framework_simplejwt.views import (TokenObtainPairView, TokenRefreshView, TokenBlacklistView)
 from .views import CustomTokenObtainPairView
 from django.conf import settings
@@ -7,6 +9,11 @@ from django.conf.urls.static import static
 
 urlpatterns = [
     path('validate/', validate, name='validate'),
+    path('validate/batch/', validate_batch, name='validate-batch'),
+    path('validate/jobs/', submit_validation_job, name='validation-job-submit'),
+    path('validate/jobs/<int:pk>/', validation_job_status, name='validation-job-status'),
+    path('validate/jobs/<int:pk>/download/', download_validation_job, name='validation-job-download'),
+    path('metrics/', metrics, name='metrics'),
     #path('train-model/', train_model, name='train-model'),
 
     path('token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
@@ -1,87 +1,312 @@
-import xml.etree.ElementTree as ET
 import csv
-from io import StringIO
+from io import BytesIO, StringIO
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
 import openpyxl
 from openpyxl.utils import get_column_letter
 import re
 from fpdf import FPDF
 import os
 from datetime import datetime
-import spacy
+from .nlp import configured_model, get_nlp
+from .descriptions import parse_description
+from .columnar import AttributeTable
+from .hierarchy import SubassemblyHierarchy
+from .bom_index import BomElementIndex
+from .xml_engines import ELEMENT_TAGS, get_engine
+from .twisted_wires import normalise_sheet, join_cost_results, mismatch_message
+from .rules import DPF_COMPONENT_PLAN, TWISTED_WIRES_SHEET, WIRE_LENGTHS_SHEET
+from .wire_lengths import wire_length_messages, first_token_wire_id, cut_wire_id
+from .instrumentation import stage
+from .parallel import discard, submit_partitions, gather
+
+
+def _pdf_bytes(pdf):
+    """PDF document as bytes (fpdf2's output() returns a bytearray)."""
+    return bytes(pdf.output())
+
+
+class HashedPath(str):
+    """A file path carrying the SHA-256 of its content (kept when pickled), like an upload's."""
+
+    def __new__(cls, path, sha256=None):
+        path = super().__new__(cls, path)
+        path.sha256 = sha256
+        return path
+
+
+def portable_source(executor, source):
+    """
+    source in a form that can be handed to executor: process pools get a path, or the bytes
+    of an in-memory upload; thread pools share the object as is. An upload's sha256 goes
+    along, so the worker doesn't hash the file again.
+    """
+    if not isinstance(executor, ProcessPoolExecutor) or isinstance(source, (str, os.PathLike)):
+        return source
+    sha256 = getattr(source, 'sha256', None)
+    if hasattr(source, 'temporary_file_path'):
+        path = source.temporary_file_path()
+        return HashedPath(path, sha256) if sha256 else path
+    source.seek(0)
+    data = BytesIO(source.read())
+    source.seek(0)
+    if sha256:
+        data.sha256 = sha256
+    return data
+
+
+def parsed_excel(source, sheets, columns, artifact_cache):
+    """excel_data of a workbook read with the given projection (runs on a parse executor)."""
+    validator = SBOMValidator(excel_file_path=source, excel_sheets=sheets, excel_columns=columns,
+                              artifact_cache=artifact_cache)
+    validator._release_reader()
+    return validator.excel_data
+
+
+def _merge_attributes(*projections):
+    """Union of {element tag: [attributes]} projections, in first-seen order."""
+    merged = {}
+    for projection in projections:
+        for tag, attributes in projection.items():
+            kept = merged.setdefault(tag, [])
+            kept.extend(attribute for attribute in attributes if attribute not in kept)
+    return merged
 
 class SBOMValidator:
-    def __init__(self, xml_file_path=None, excel_file_path=None):
+    # Declarative DPF component checks (Tape, Splices, ...), compiled into one scan per source
+    COMPONENT_RULES = DPF_COMPONENT_PLAN
+
+    # DPF sheets and columns the validation checks actually read
+    VALIDATION_COLUMNS = {
+        TWISTED_WIRES_SHEET.sheet: TWISTED_WIRES_SHEET.columns,
+        WIRE_LENGTHS_SHEET.sheet: WIRE_LENGTHS_SHEET.columns,
+        **DPF_COMPONENT_PLAN.sheet_columns(),
+    }
+    VALIDATION_SHEETS = tuple(VALIDATION_COLUMNS)
+    # SBOM elements and attributes the validation checks actually read (sbom attributes are always kept)
+    VALIDATION_ATTRIBUTES = _merge_attributes({
+        "sbomsubassembly": ["id", "parentsubid", "name", "quantity", "unitofmeasure", "totalcalculatedweight"],
+        "costresult": ["description"],
+        "bomelement": ["partnumber", "harnessobject_id"],
+    }, DPF_COMPONENT_PLAN.element_attributes())
+    # Subassembly attributes also kept as float arrays in the columnar store
+    SUBASSEMBLY_NUMERIC_COLUMNS = ("quantity", "totalcalculatedweight")
+    # BOM element attributes indexed together on the first lookup (others are indexed on demand)
+    BOM_ELEMENT_INDEX_ATTRIBUTES = ("partnumber", "harnessobject_id")
+
+    def __init__(self, xml_file_path=None, excel_file_path=None, nlp_model=None,
+                 excel_sheets=None, excel_columns=None, artifact_cache=None, xml_attributes=None,
+                 xml_engine=None, parse_executor=None):
 
         self.xml_data = None
         self.excel_data = None
-        self.nlp = spacy.load("en_core_web_sm")
+        # spaCy pipeline for validate_with_nlp; None uses SBOM_NLP_MODEL
+        self.nlp_model = nlp_model or configured_model()
+        self._excel_reader = None
+        self._excel_source = None
+        self._excel_columns = excel_columns or {}
+        self._xml_attributes = xml_attributes
+        # 'lxml' or 'stdlib'; None uses SBOM_XML_ENGINE
+        self.xml_engine = xml_engine
+        self._bom_element_index = None
 
         wcpr = ""
         wcpar = ""
         wcusfa = ""
-        
-        if xml_file_path:
-            self._parse_xml(xml_file_path)
-            
-        if excel_file_path:
-            self._parse_excel(excel_file_path)
+
+        # With a parse_executor (see parallel.get_parse_executor) the workbook is read on it
+        # while the XML is parsed here, so construction takes max(xml, excel), not the sum.
+        # A pool that turns out to be broken is discarded and the workbook read here instead.
+        excel_future = None
+        if excel_file_path and xml_file_path and parse_executor is not None:
+            try:
+                excel_future = parse_executor.submit(
+                    parsed_excel, portable_source(parse_executor, excel_file_path),
+                    excel_sheets, excel_columns, artifact_cache
+                )
+            except BrokenExecutor:
+                discard(parse_executor)
+
+        try:
+            if xml_file_path:
+                with stage('xml_parse'):
+                    if artifact_cache is None:
+                        self._parse_xml(xml_file_path)
+                    else:
+                        self._load_xml_snapshot(xml_file_path, artifact_cache)
+        except BaseException:
+            if excel_future is not None and not excel_future.cancel():
+                # Don't leave the workbook being read after the caller has given up
+                excel_future.exception()
+            raise
+
+        if excel_future is not None:
+            # Time spent waiting for the workbook once the XML is done
+            with stage('excel_parse'):
+                try:
+                    self.excel_data = excel_future.result()
+                    # Sheets outside the projection are still read from the file on first access
+                    self._excel_source = excel_file_path
+                except BrokenExecutor:
+                    # The pool died under the read; read the workbook here instead
+                    discard(parse_executor)
+                    excel_future = None
+        if excel_future is None and excel_file_path:
+            with stage('excel_parse'):
+                if artifact_cache is None:
+                    self._parse_excel(excel_file_path, sheets=excel_sheets)
+                else:
+                    self._load_excel_snapshot(excel_file_path, excel_sheets, artifact_cache)
+
+    def _load_xml_snapshot(self, file_path, artifact_cache):
+        """Take the parsed XML from the artifact cache, parsing (and storing it) on a miss."""
+        key = artifact_cache.key('xml', file_path, variant=(
+            sorted((tag, sorted(attributes)) for tag, attributes in self._xml_attributes.items())
+            if self._xml_attributes is not None else None
+        ))
+        self.xml_data = artifact_cache.load(key)
+        if self.xml_data is None:
+            self._parse_xml(file_path)
+            artifact_cache.store(key, self.xml_data)
+
+    def _load_excel_snapshot(self, file_path, sheets, artifact_cache):
+        """
+        Same for the workbook; the key includes the sheet/column projection. Sheets the
+        snapshot didn't load are still read from file_path on first access.
+        """
+        key = artifact_cache.key('excel', file_path, variant=(
+            sorted(sheets) if sheets is not None else None,
+            sorted((name, sorted(columns)) for name, columns in self._excel_columns.items())
+        ))
+        self.excel_data = artifact_cache.load(key)
+        if self.excel_data is None:
+            self._parse_excel(file_path, sheets=sheets)
+            artifact_cache.store(key, self.excel_data)
+        else:
+            self._excel_source = file_path
+
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline, only loaded once NLP validation actually needs it."""
+        return get_nlp(self.nlp_model)
             
     def _parse_xml(self, file_path):
+        """
+        Parse the SBOM XML with the configured engine (see xml_engines). With xml_attributes
+        ({element tag: [attributes]}) only those subassembly/costresult/bomelement attributes
+        are kept, and element types it doesn't list are skipped entirely; without it every
+        attribute is kept.
+        """
         self.xml_data = {
             'sboms': [],
             'file_type': 'xml'
-        }        
-        tree = ET.parse(file_path)
-        root = tree.getroot()        
-        for sbom in root.findall('sbom'):
-            sbom_data = {
-                'attributes': sbom.attrib,
-                'subassemblies': [],
-                'cost_results': [],
-                'bom_elements': []
-                #'general_special_wire_pmd' : []
-            }            
-            for sub in sbom.findall('sbomsubassembly'):
-                sbom_data['subassemblies'].append({
-                    'attributes': sub.attrib,
-                    'parent_id': sub.attrib.get('parentsubid', None)
-                })            
-            for cost in sbom.findall('.//costresult'):
-                sbom_data['cost_results'].append(cost.attrib)            
-            for bom in sbom.findall('.//bomelement'):
-                sbom_data['bom_elements'].append(bom.attrib)
-            #for pmd in sbom.findall('.//GeneralSpecialWirePMD'):
-                #sbom_data['general_special_wire_pmd'].append(pmd.attrib)
-            
-            self.xml_data['sboms'].append(sbom_data)
+        }
+        projection = self._xml_attributes
+        if projection is None:
+            wanted = {tag: None for tag in ELEMENT_TAGS}
+        else:
+            wanted = {tag: tuple(projection[tag]) for tag in ELEMENT_TAGS if tag in projection}
+
+        sbom_data = None
+        for tag, attributes in get_engine(self.xml_engine)(file_path, wanted):
+            if tag == 'sbom':
+                self._finish_sbom(sbom_data)
+                sbom_data = {
+                    'attributes': attributes,
+                    'subassemblies': AttributeTable(
+                        numeric_columns=self.SUBASSEMBLY_NUMERIC_COLUMNS,
+                        aliases={'parent_id': 'parentsubid'}
+                    ),
+                    'cost_results': [],
+                    'bom_elements': []
+                }
+                self.xml_data['sboms'].append(sbom_data)
+            elif tag == 'sbomsubassembly':
+                sbom_data['subassemblies'].append(attributes)
+            elif tag == 'costresult':
+                sbom_data['cost_results'].append(attributes)
+            else:
+                sbom_data['bom_elements'].append(attributes)
+        self._finish_sbom(sbom_data)
+
+    def _finish_sbom(self, sbom_data):
+        if sbom_data is not None:
+            sbom_data['hierarchy'] = SubassemblyHierarchy(sbom_data['subassemblies'])
 
-    def _parse_excel(self, file_path):
+    def _parse_excel(self, file_path, sheets=None):
+        """
+        Stream the workbook in read-only mode. Only the sheets listed in `sheets`
+        (all of them when None) are read now; the others are read on first access
+        through get_sheet_by_name/filter_sheets.
+        """
         self.excel_data = {
             'sheets': [],
-            'workbook': None,
             'file_type': 'excel'
-        }        
-        workbook = openpyxl.load_workbook(file_path, data_only=True)
-        self.excel_data['workbook'] = workbook
-        
-        for sheet_name in workbook.sheetnames:
-            sheet = workbook[sheet_name]
-            sheet_data = {
+        }
+        self._excel_source = file_path
+        self._excel_reader = openpyxl.load_workbook(file_path, data_only=True, read_only=True)
+
+        for index, sheet_name in enumerate(self._excel_reader.sheetnames):
+            self.excel_data['sheets'].append({
                 'name': sheet_name,
-                'index': workbook.index(sheet),
+                'index': index,
                 'data': [],
                 'headers': [],
-                'empty': True
-            }            
-            rows = list(sheet.iter_rows(values_only=True))
-            if rows:
-                sheet_data['empty'] = False                
-                if rows[0]:
-                    sheet_data['headers'] = list(rows[0])                
-                for row in rows[1:]:
+                'empty': True,
+                'loaded': False
+            })
+
+        for sheet_data in self.excel_data['sheets']:
+            if sheets is None or sheet_data['name'] in sheets:
+                self._load_sheet(sheet_data)
+
+    def _load_sheet(self, sheet_data):
+        """Read one sheet's rows, keeping only the projected columns if any were requested."""
+        if sheet_data['loaded']:
+            return sheet_data
+
+        if self._excel_reader is None:
+            if self._excel_source is None:
+                raise ValueError(f"Sheet '{sheet_data['name']}' was not loaded before the workbook was closed")
+            # Restored from a snapshot: open the workbook only once a sheet it lacks is needed
+            self._excel_reader = openpyxl.load_workbook(self._excel_source, data_only=True, read_only=True)
+        sheet = self._excel_reader[sheet_data['name']]
+        rows = sheet.iter_rows(values_only=True)
+        header_row = next(rows, None)
+        if header_row is not None:
+            sheet_data['empty'] = False
+            headers = list(header_row)
+            wanted = self._excel_columns.get(sheet_data['name'])
+            if wanted is None:
+                sheet_data['headers'] = headers
+                for row in rows:
+                    if any(cell is not None for cell in row):
+                        sheet_data['data'].append(row)
+            else:
+                keep = [i for i, header in enumerate(headers) if header in wanted]
+                sheet_data['headers'] = [headers[i] for i in keep]
+                for row in rows:
+                    row = tuple(row[i] if i < len(row) else None for i in keep)
                     if any(cell is not None for cell in row):
-                        sheet_data['data'].append(row)            
-            self.excel_data['sheets'].append(sheet_data)
+                        sheet_data['data'].append(row)
+        sheet_data['loaded'] = True
+
+        if all(s['loaded'] for s in self.excel_data['sheets']):
+            self.close()
+        return sheet_data
+
+    def _release_reader(self):
+        """Close the workbook reader but leave unread sheets to be read again from the source."""
+        if self._excel_reader is not None:
+            self._excel_reader.close()
+            self._excel_reader = None
+
+    def close(self):
+        """
+        Release the workbook reader. Sheets that were never read can't be any more: reading
+        one raises ValueError rather than passing it off as empty.
+        """
+        self._release_reader()
+        self._excel_source = None
 
     # XML-specific methods
     def get_sbom_attributes(self):
@@ -90,19 +315,62 @@ class SBOMValidator:
         return [sbom['attributes'] for sbom in self.xml_data['sboms']]
 
     def get_subassemblies(self, flatten_attributes=False):
+        """
+        Subassemblies of every sbom. Flattened, each one is a read-only row view of the
+        columnar store (attributes plus 'parent_id'); otherwise an {'attributes', 'parent_id'} dict.
+        """
         if not self.xml_data:
             raise ValueError("No XML data loaded")
         subassemblies = []
         for sbom in self.xml_data['sboms']:
-            for sub in sbom['subassemblies']:
-                if flatten_attributes:
-                    sub_data = sub['attributes'].copy()
-                    sub_data['parent_id'] = sub['parent_id']
-                    subassemblies.append(sub_data)
-                else:
-                    subassemblies.append(sub)
+            table = sbom['subassemblies']
+            if flatten_attributes:
+                subassemblies.extend(table.iter_rows(aliases=True))
+            else:
+                for row in table:
+                    subassemblies.append({'attributes': row, 'parent_id': row.get('parentsubid')})
         return subassemblies
 
+    def _subassembly_tables(self):
+        if not self.xml_data:
+            raise ValueError("No XML data loaded")
+        return [sbom['subassemblies'] for sbom in self.xml_data['sboms']]
+
+    def iter_subassemblies(self, columns=None):
+        """
+        Iterate over the subassemblies of every sbom without materialising them: row views,
+        or with `columns` one tuple of those attribute values (None when missing) per row.
+        """
+        if not self.xml_data:
+            raise ValueError("No XML data loaded")
+        for sbom in self.xml_data['sboms']:
+            table = sbom['subassemblies']
+            if columns is None:
+                yield from table.iter_rows(aliases=True)
+            else:
+                yield from table.iter_columns(*columns)
+
+    def get_subassembly_hierarchies(self):
+        """The SubassemblyHierarchy of every sbom (rows index that sbom's subassembly table)."""
+        if not self.xml_data:
+            raise ValueError("No XML data loaded")
+        return [sbom['hierarchy'] for sbom in self.xml_data['sboms']]
+
+    def get_subassembly_rollups(self, columns=SUBASSEMBLY_NUMERIC_COLUMNS):
+        """
+        Per sbom, {subassembly id: {column: subtree total}} for the numeric columns
+        (quantity and weight of the subassembly plus everything below it).
+        """
+        rollups = []
+        for hierarchy in self.get_subassembly_hierarchies():
+            totals = hierarchy.rollup(*columns)
+            ids = hierarchy.table.iter_column('id')
+            rollups.append({
+                subassembly_id: {column: float(totals[column][row]) for column in columns}
+                for row, subassembly_id in enumerate(ids) if subassembly_id is not None
+            })
+        return rollups
+
     def get_cost_results(self, filter=None):
         if not self.xml_data:
             raise ValueError("No XML data loaded")
@@ -125,6 +393,22 @@ class SBOMValidator:
             bom_elements.extend(sbom['bom_elements'])
         return bom_elements
 
+    def bom_element_index(self):
+        """BomElementIndex over the BOM elements of every sbom, created on first use."""
+        # Kept with the xml_data it indexes, so replacing xml_data rebuilds it
+        if self._bom_element_index is None or self._bom_element_index[0] is not self.xml_data:
+            index = BomElementIndex(self.get_bom_elements(), self.BOM_ELEMENT_INDEX_ATTRIBUTES)
+            self._bom_element_index = (self.xml_data, index)
+        return self._bom_element_index[1]
+
+    def find_bom_elements(self, **criteria):
+        """BOM elements whose attributes equal all the criteria, e.g. find_bom_elements(partnumber='P0001')."""
+        return self.bom_element_index().find(**criteria)
+
+    def lookup_bom_elements(self, values, attribute='partnumber'):
+        """{value: [BOM elements]} for many values of one attribute at once."""
+        return self.bom_element_index().lookup_many(values, attribute)
+
     # Excel-specific methods
     def get_sheet_names(self):
         """Get list of all sheet names in the Excel file."""
@@ -132,6 +416,18 @@ class SBOMValidator:
             raise ValueError("No Excel data loaded")
         return [sheet['name'] for sheet in self.excel_data['sheets']]
 
+    def _locate_sheet(self, required):
+        """
+        (data rows, column indexes, None) of a rules.SheetColumns, indexes in required.columns
+        order, or (None, None, message) when the sheet or some of its columns are missing.
+        """
+        sheet_data = self.get_sheet_by_name(required.sheet)
+        index = required.locate(sheet_data)
+        problem = required.problem(index)
+        if problem is not None:
+            return None, None, problem
+        return sheet_data["data"], [index.positions[column] for column in required.columns], None
+
     def get_sheet_by_name(self, sheet_name):
         """Get data from a specific sheet by name."""
         if not self.excel_data:
@@ -139,7 +435,7 @@ class SBOMValidator:
         
         for sheet in self.excel_data['sheets']:
             if sheet['name'] == sheet_name:
-                return sheet
+                return self._load_sheet(sheet)
         return None
 
     def filter_sheets(self, index=None, name=None, filter_column=None, filter_value=None, return_column=None):
@@ -163,6 +459,7 @@ class SBOMValidator:
         
         if sheet is None:
             raise ValueError(f"Sheet not found (index={index}, name={name})")
+        self._load_sheet(sheet)
         
         if filter_column is None and return_column is None:
             return sheet
@@ -186,7 +483,13 @@ class SBOMValidator:
                     
         return results if len(results) > 1 else results[0] if results else None
 
-    def validate(self):
+    def validate(self, executor=None):
+        """
+        Run every check and return the validation results. With an executor (see
+        parallel.get_executor) the twisted wire and wire length checks are split per sbom and
+        run in the pool while the remaining sections run here; partition results are merged
+        in sbom order, so the outcome is the same as a sequential run.
+        """
         if not self.xml_data:
             raise ValueError("No XML data loaded for validation")
         if not self.excel_data:
@@ -197,8 +500,10 @@ class SBOMValidator:
             "status": "success",
             "message": "All values matched.",
             "mismatches": [],
+            "twisted_wire_mismatches": [],
             "workcenter_validation": [],
-            "wire_length_validation": []
+            "wire_length_validation": [],
+            "component_validation": []
         }
 
         # ====================================================================
@@ -283,120 +588,19 @@ class SBOMValidator:
                 return validation_results
 
             # Now validate against Excel sheet "Twisted Wires"
-            twisted_sheet = self.get_sheet_by_name("Twisted Wires")
-            if not twisted_sheet:
+            data_rows, column_indexes, problem = self._locate_sheet(TWISTED_WIRES_SHEET)
+            if problem is not None:
                 validation_results["status"] = "error"
-                validation_results["message"] = "'Twisted Wires' sheet not found in Excel."
+                validation_results["message"] = problem
                 return validation_results
 
-            headers = twisted_sheet["headers"]
-            data_rows = twisted_sheet["data"]
-
-            # Get column indices for all relevant fields
             try:
-                wire_nr_idx = headers.index("Wires Nr") if "Wires Nr" in headers else None
-                pitch_idx = headers.index("Pitch") if "Pitch" in headers else None
-                open_end1_idx = headers.index("Open end Length 1") if "Open end Length 1" in headers else None
-                open_end2_idx = headers.index("Open end Length 2") if "Open end Length 2" in headers else None
-                twist_len_idx = headers.index("Length of twist") if "Length of twist" in headers else None
-
-                if None in [wire_nr_idx, pitch_idx, open_end1_idx, open_end2_idx, twist_len_idx]:
-                    missing = [h for h, idx in zip(["Wires Nr", "Pitch", "Open end Length 1", 
-                                                "Open end Length 2", "Length of twist"], 
-                                                [wire_nr_idx, pitch_idx, open_end1_idx, 
-                                                open_end2_idx, twist_len_idx]) if idx is None]
-                    validation_results["status"] = "error"
-                    validation_results["message"] = f"Required columns not found in Excel: {', '.join(missing)}"
-                    return validation_results
-
-                # Create mapping of wire numbers to all relevant values from Excel
-                excel_wire_data = {}
-                for row in data_rows:
-                    wire_nr = row[wire_nr_idx]
-                    if wire_nr:
-                        excel_wire_data[wire_nr.strip()] = {
-                            "pitch": row[pitch_idx],
-                            "open_end1": row[open_end1_idx],
-                            "open_end2": row[open_end2_idx],
-                            "twist_len": row[twist_len_idx]
-                        }
-
-                for result in cost_results:
-                    description = result.get("description", "")
-                    if not description:
-                        continue
-                        
-                    # Extract all relevant values from XML description
-                    pitch_match = re.search(r"Pitch:\s*([\d.]+)", description)
-                    untwist_a_match = re.search(r"Untwist A:\s*([\d.]+)", description)
-                    untwist_b_match = re.search(r"Untwist B:\s*([\d.]+)", description)
-                    twist_len_match = re.search(r"Twist length:\s*([\d.]+)", description)
-
-                    if not all([pitch_match, untwist_a_match, untwist_b_match, twist_len_match]):
-                        continue
-                        
-                    xml_values = {
-                        "pitch": float(pitch_match.group(1)),
-                        "open_end1": float(untwist_a_match.group(1)),
-                        "open_end2": float(untwist_b_match.group(1)),
-                        "twist_len": float(twist_len_match.group(1))
-                    }
-                    
-                    # Extract wire pairs from the beginning of description
-                    wire_matches = re.findall(r"Twist\s+([^,]+(?:,[^,]+)*)", description)
-                    if not wire_matches:
-                        continue
-                        
-                    # Get all wire numbers mentioned in this specific cost result
-                    wires_in_result = []
-                    for group in wire_matches:
-                        wires_in_result.extend(re.findall(r"(\d+\(\d+\))", group))
-                        
-                    # Validate each wire in this cost result against Excel
-                    for wire in wires_in_result:
-                        wire_id = wire.strip()
-                        if wire_id not in excel_wire_data:
-                            validation_results["mismatches"].append(f"{wire_id} missing in Excel")
-                            continue
-                            
-                        excel_data = excel_wire_data[wire_id]
-                        
-                        # Check each value
-                        try:
-                            # Check pitch
-                            excel_pitch = float(excel_data["pitch"])
-                            if excel_pitch != xml_values["pitch"]:
-                                validation_results["mismatches"].append(
-                                    f"Pitch mismatch for {wire_id}: "
-                                    f"SBOM={xml_values['pitch']}, Excel={excel_pitch}"
-                                )
-                            
-                            # Check open end length 1 (Untwist A)
-                            excel_open_end1 = float(excel_data["open_end1"])
-                            if excel_open_end1 != xml_values["open_end1"]:
-                                validation_results["mismatches"].append(
-                                    f"Open end Length 1 (Untwist A) mismatch for {wire_id}: "
-                                    f"SBOM={xml_values['open_end1']}, Excel={excel_open_end1}"
-                                )
-                            
-                            # Check open end length 2 (Untwist B)
-                            excel_open_end2 = float(excel_data["open_end2"])
-                            if excel_open_end2 != xml_values["open_end2"]:
-                                validation_results["mismatches"].append(
-                                    f"Open end Length 2 (Untwist B) mismatch for {wire_id}: "
-                                    f"SBOM={xml_values['open_end2']}, Excel={excel_open_end2}"
-                                )
-                            
-                            # Check length of twist
-                            excel_twist_len = float(excel_data["twist_len"])
-                            if excel_twist_len != xml_values["twist_len"]:
-                                validation_results["mismatches"].append(
-                                    f"Length of twist mismatch for {wire_id}: "
-                                    f"SBOM={xml_values['twist_len']}, Excel={excel_twist_len}"
-                                )
-                                
-                        except (ValueError, TypeError) as e:
-                            validation_results["mismatches"].append(f"Invalid numeric format in Excel for {wire_id}: {str(e)}")
+                # Normalise the sheet once, then join every sbom's cost result wires against it
+                twisted_wires = normalise_sheet(data_rows, column_indexes[0], column_indexes[1:])
+                twisted_partitions = submit_partitions(executor, join_cost_results, [
+                    (twisted_wires, [result.get("description", "") for result in sbom['cost_results']])
+                    for sbom in self.xml_data['sboms']
+                ])
 
             except Exception as e:
                 validation_results["status"] = "error"
@@ -411,103 +615,75 @@ class SBOMValidator:
         # ====================================================================
         # 3. Validate wire lengths from XML subassemblies against Excel
         # ====================================================================
+        wire_length_partitions = None
         try:
-            # Get the "Wires Lengths" sheet from Excel
-            wire_length_sheet = self.get_sheet_by_name("Wires Lengths")
-            if not wire_length_sheet:
-                validation_results["wire_length_validation"].append(
-                    "'Wires Lengths' sheet not found in Excel"
-                )
+            data_rows, column_indexes, problem = self._locate_sheet(WIRE_LENGTHS_SHEET)
+            if problem is not None:
+                validation_results["wire_length_validation"].append(problem)
             else:
-                headers = wire_length_sheet["headers"]
-                data_rows = wire_length_sheet["data"]
-
-                # Get column indices
-                try:
-                    wire_nr_idx = headers.index("Wire Nr") if "Wire Nr" in headers else None
-                    length_idx = headers.index("Length") if "Length" in headers else None
-
-                    if None in [wire_nr_idx, length_idx]:
-                        missing = [h for h, idx in zip(["Wire Nr", "Length"], 
-                                                    [wire_nr_idx, length_idx]) if idx is None]
-                        validation_results["wire_length_validation"].append(
-                            f"Required columns not found in Excel: {', '.join(missing)}"
-                        )
-                    else:
-                        # Create mapping of wire numbers to lengths from Excel
-                        excel_wire_lengths = {}
-                        for row in data_rows:
-                            wire_nr = str(row[wire_nr_idx]).strip() if row[wire_nr_idx] is not None else None
-                            length = row[length_idx]
-                            if wire_nr:
-                                try:
-                                    excel_wire_lengths[wire_nr] = float(length) if length is not None else None
-                                except (ValueError, TypeError):
-                                    validation_results["wire_length_validation"].append(
-                                        f"Invalid length value for wire {wire_nr} in Excel"
-                                    )
-
-                        # Get all subassemblies from XML
-                        subassemblies = self.get_subassemblies(flatten_attributes=True)
-                        
-                        # Find wire subassemblies and validate lengths
-                        for sub in subassemblies:
-                            name = str(sub.get('name', '')).strip()
-                            quantity = sub.get('quantity')
-                            unit = str(sub.get('unitofmeasure', '')).lower()
-                            
-                            # Skip if not a wire (missing quantity or wrong unit)
-                            if quantity is None or unit not in ['per length', 'length']:
-                                continue
-                            
-                            # Extract the wire ID - take first token before space
-                            wire_id = None
-                            if name:
-                                # Handle both string and numeric wire numbers
-                                first_part = name.split()[0] if name else ''
-                                wire_id = str(first_part).strip()
-                            
-                            if not wire_id:
-                                continue
-                                
-                            try:
-                                xml_length = float(quantity)
-                            except (ValueError, TypeError):
-                                validation_results["wire_length_validation"].append(
-                                    f"Invalid quantity value for wire {wire_id} in XML"
-                                )
-                                continue
-                            
-                            if wire_id in excel_wire_lengths:
-                                excel_length = excel_wire_lengths[wire_id]
-                                if excel_length is None:
-                                    validation_results["wire_length_validation"].append(
-                                        f"Missing length value for wire {wire_id} in Excel"
-                                    )
-                                elif not self._approx_equal(xml_length, excel_length):
-                                    validation_results["wire_length_validation"].append(
-                                        f"Wire length mismatch for {wire_id}: "
-                                        f"XML={xml_length}, Excel={excel_length}"
-                                    )
-                            else:
-                                validation_results["wire_length_validation"].append(
-                                    f"Wire {wire_id} not found in Excel Wires Lengths sheet"
-                                )
-
-                except Exception as e:
-                    validation_results["wire_length_validation"].append(
-                        f"Error during wire length validation: {str(e)}"
-                    )
+                wire_nr_idx, length_idx = column_indexes
+                # Create mapping of wire numbers to lengths from Excel
+                excel_wire_lengths = {}
+                for row in data_rows:
+                    wire_nr = str(row[wire_nr_idx]).strip() if row[wire_nr_idx] is not None else None
+                    length = row[length_idx]
+                    if wire_nr:
+                        try:
+                            excel_wire_lengths[wire_nr] = float(length) if length is not None else None
+                        except (ValueError, TypeError):
+                            validation_results["wire_length_validation"].append(
+                                f"Invalid length value for wire {wire_nr} in Excel"
+                            )
+
+                # Find wire subassemblies in the XML (one partition per sbom) and validate lengths
+                wire_length_partitions = submit_partitions(executor, wire_length_messages, [
+                    ([table], excel_wire_lengths, first_token_wire_id, "Wires Lengths")
+                    for table in self._subassembly_tables()
+                ])
 
         except Exception as e:
             validation_results["wire_length_validation"].append(
                 f"Error during wire length validation: {str(e)}"
             )
 
+        # ====================================================================
+        # 4. Validate DPF component sheets (Tape, Splices, ...) against the BOM
+        # ====================================================================
+        component_validation = []
+        try:
+            for messages in self.COMPONENT_RULES.run(self).values():
+                component_validation.extend(messages)
+        except Exception as e:
+            component_validation.append(f"Error during component validation: {str(e)}")
+
+        # ====================================================================
+        # Collect the partitioned checks
+        # ====================================================================
+        try:
+            mismatch_table = gather(twisted_partitions)
+        except Exception as e:
+            # A failed twisted wire check ends the validation, as if sections 3 and 4 never ran
+            validation_results["wire_length_validation"] = []
+            validation_results["status"] = "error"
+            validation_results["message"] = f"Error during twisted wires validation: {str(e)}"
+            return validation_results
+        validation_results["twisted_wire_mismatches"] = mismatch_table
+        validation_results["mismatches"].extend(mismatch_message(m) for m in mismatch_table)
+
+        if wire_length_partitions is not None:
+            try:
+                validation_results["wire_length_validation"].extend(gather(wire_length_partitions))
+            except Exception as e:
+                validation_results["wire_length_validation"].append(
+                    f"Error during wire length validation: {str(e)}"
+                )
+        validation_results["component_validation"].extend(component_validation)
+
         # Update overall status if there are any validation issues
         if (validation_results["mismatches"] or 
             validation_results["workcenter_validation"] or 
-            validation_results["wire_length_validation"]):
+            validation_results["wire_length_validation"] or
+            validation_results["component_validation"]):
             validation_results["status"] = "fail"
             validation_results["message"] = "Validation completed with mismatches"
 
@@ -691,6 +867,27 @@ class SBOMValidator:
                 pdf.multi_cell(0, 5, f"* {mismatch}")
                 pdf.ln(1)
         
+        # =============================================
+        # Component Validation Results
+        # =============================================
+        if validation_results.get("component_validation"):
+            pdf.ln(10)
+            pdf.set_fill_color(31, 73, 125)  # Dark blue
+            pdf.set_text_color(255, 255, 255)  # White
+            pdf.set_font("Arial", 'B', 12)
+            pdf.cell(0, 8, "Component Validation Results", ln=1, fill=True)
+
+            pdf.set_text_color(255, 0, 0)  # Red
+            pdf.set_font("Arial", 'B', 10)
+            pdf.cell(0, 8, "FAILURE: DPF components missing from the SBOM", ln=1)
+
+            pdf.set_text_color(0, 0, 0)  # Black
+            pdf.set_font("Arial", '', 8)
+            for issue in validation_results["component_validation"]:
+                pdf.cell(10, 5, "")
+                pdf.multi_cell(0, 5, f"* {issue}")
+                pdf.ln(1)
+
         # =============================================
         # Summary Section
         # =============================================
@@ -706,7 +903,8 @@ class SBOMValidator:
         workcenter_issues = len(validation_results.get("workcenter_validation", []))
         wire_mismatches = len(validation_results.get("mismatches", []))
         wire_length_issues = len(validation_results.get("wire_length_validation", []))
-        total_issues = workcenter_issues + wire_mismatches + wire_length_issues
+        component_issues = len(validation_results.get("component_validation", []))
+        total_issues = workcenter_issues + wire_mismatches + wire_length_issues + component_issues
         
         # Create summary table
         pdf.set_font("Arial", 'B', 10)
@@ -742,6 +940,15 @@ class SBOMValidator:
         pdf.cell(40, 6, str(wire_length_issues), border=1)
         pdf.set_text_color(*status_color)
         pdf.cell(50, 6, status_text, border=1, ln=1)
+
+        # DPF Components row
+        status_color = (255, 0, 0) if component_issues > 0 else (0, 128, 0)
+        status_text = "FAIL" if component_issues > 0 else "PASS"
+        pdf.set_text_color(0, 0, 0)
+        pdf.cell(100, 6, "DPF Components (Tape, Splices, Terminals, Multicores)", border=1)
+        pdf.cell(40, 6, str(component_issues), border=1)
+        pdf.set_text_color(*status_color)
+        pdf.cell(50, 6, status_text, border=1, ln=1)
         
         # Overall Status row
         status_color = (255, 0, 0) if total_issues > 0 else (0, 128, 0)
@@ -764,18 +971,16 @@ class SBOMValidator:
         pdf.cell(0, 5, "This is an automatically generated validation report", ln=1, align='C')
         pdf.cell(0, 5, "For any discrepancies, please contact the validation team", ln=1, align='C')
         
-        # Save the PDF to a temporary file
-        report_dir = "temp_reports"
-        os.makedirs(report_dir, exist_ok=True)
+        # Render in memory; the caller decides where (and whether) to store it
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_path = os.path.join(report_dir, f"sbom_validation_report_{timestamp}.pdf")
-        pdf.output(report_path)
-        
-        return {'report_path': report_path}
+        return {
+            'report_name': f"sbom_validation_report_{timestamp}.pdf",
+            'content': _pdf_bytes(pdf)
+        }
 
 
 
-    def validate_with_nlp(self):
+    def validate_with_nlp(self, n_process=1, batch_size=256):
         if not self.xml_data:
             raise ValueError("No XML data loaded for validation")
         if not self.excel_data:
@@ -787,6 +992,7 @@ class SBOMValidator:
             "mismatches": [],
             "workcenter_validation": [],
             "wire_length_validation": [],
+            "component_validation": [],
             "nlp_processing_notes": []
         }
 
@@ -859,31 +1065,14 @@ class SBOMValidator:
                 return validation_results
 
             # Validate against Excel sheet "Twisted Wires"
-            twisted_sheet = self.get_sheet_by_name("Twisted Wires")
-            if not twisted_sheet:
+            data_rows, column_indexes, problem = self._locate_sheet(TWISTED_WIRES_SHEET)
+            if problem is not None:
                 validation_results["status"] = "error"
-                validation_results["message"] = "'Twisted Wires' sheet not found in Excel."
+                validation_results["message"] = problem
                 return validation_results
 
-            headers = twisted_sheet["headers"]
-            data_rows = twisted_sheet["data"]
-
-            # Get column indices for all relevant fields
             try:
-                wire_nr_idx = headers.index("Wires Nr") if "Wires Nr" in headers else None
-                pitch_idx = headers.index("Pitch") if "Pitch" in headers else None
-                open_end1_idx = headers.index("Open end Length 1") if "Open end Length 1" in headers else None
-                open_end2_idx = headers.index("Open end Length 2") if "Open end Length 2" in headers else None
-                twist_len_idx = headers.index("Length of twist") if "Length of twist" in headers else None
-
-                if None in [wire_nr_idx, pitch_idx, open_end1_idx, open_end2_idx, twist_len_idx]:
-                    missing = [h for h, idx in zip(["Wires Nr", "Pitch", "Open end Length 1", 
-                                                "Open end Length 2", "Length of twist"], 
-                                                [wire_nr_idx, pitch_idx, open_end1_idx, 
-                                                open_end2_idx, twist_len_idx]) if idx is None]
-                    validation_results["status"] = "error"
-                    validation_results["message"] = f"Required columns not found in Excel: {', '.join(missing)}"
-                    return validation_results
+                wire_nr_idx, pitch_idx, open_end1_idx, open_end2_idx, twist_len_idx = column_indexes
 
                 # Create mapping of wire numbers to all relevant values from Excel
                 excel_wire_data = {}
@@ -898,13 +1087,20 @@ class SBOMValidator:
                             "twist_len": row[twist_len_idx]
                         }
 
+                # Run every distinct description through the pipeline in one batch
+                wire_infos = self._extract_wire_info_batch(
+                    [result.get("description", "") for result in cost_results],
+                    n_process=n_process,
+                    batch_size=batch_size
+                )
+
                 # Process each cost result with NLP
                 for result in cost_results:
                     description = result.get("description", "")
                     if not description:
                         continue
                         
-                    wire_info = self._extract_wire_info_nlp(description)
+                    wire_info = wire_infos[description]
                     validation_results["nlp_processing_notes"].append(
                         f"Processed description: {description[:50]}... "
                         f"(Confidence: {wire_info['confidence']:.1f})"
@@ -968,96 +1164,84 @@ class SBOMValidator:
         # (Same implementation as standard validate() method)
         # ====================================================================
         try:
-            # Get the "Wires Length" sheet from Excel
-            wire_length_sheet = self.get_sheet_by_name("Wires Lengths")
-            if not wire_length_sheet:
-                validation_results["wire_length_validation"].append(
-                    "'Wires Lengths' sheet not found in Excel"
-                )
+            data_rows, column_indexes, problem = self._locate_sheet(WIRE_LENGTHS_SHEET)
+            if problem is not None:
+                validation_results["wire_length_validation"].append(problem)
             else:
-                headers = wire_length_sheet["headers"]
-                data_rows = wire_length_sheet["data"]
-
-                # Get column indices
-                try:
-                    wire_nr_idx = headers.index("Wire Nr") if "Wire Nr" in headers else None
-                    length_idx = headers.index("Length") if "Length" in headers else None
-
-                    if None in [wire_nr_idx, length_idx]:
-                        missing = [h for h, idx in zip(["Wire Nr", "Length"], 
-                                                    [wire_nr_idx, length_idx]) if idx is None]
-                        validation_results["wire_length_validation"].append(
-                            f"Required columns not found in Excel: {', '.join(missing)}"
-                        )
-                    else:
-                        # Create mapping of wire numbers to lengths from Excel
-                        excel_wire_lengths = {}
-                        for row in data_rows:
-                            wire_nr = row[wire_nr_idx]
-                            if wire_nr:
-                                try:
-                                    excel_wire_lengths[wire_nr.strip()] = float(row[length_idx])
-                                except (ValueError, TypeError):
-                                    validation_results["wire_length_validation"].append(
-                                        f"Invalid length value for wire {wire_nr} in Excel"
-                                    )
-
-                        # Get all subassemblies from XML
-                        subassemblies = self.get_subassemblies(flatten_attributes=True)
-                        
-                        # Find wire subassemblies and validate lengths
-                        for sub in subassemblies:
-                            name = sub.get('name', '')
-                            quantity = sub.get('quantity')
-                            unit = sub.get('unitofmeasure', '')
-                            
-                            # Check if this is a wire subassembly (name contains wire pattern like "45(2)")
-                            wire_match = re.search(r"(\d+\(\d+\))\s+CUT\b", name, re.IGNORECASE)
-                            if wire_match and quantity and unit.lower() in ['per length', 'length']:
-                                wire_id = wire_match.group(1)
-                                
-                                try:
-                                    xml_length = float(quantity)
-                                except (ValueError, TypeError):
-                                    validation_results["wire_length_validation"].append(
-                                        f"Invalid quantity value for wire {wire_id} in XML"
-                                    )
-                                    continue
-                                
-                                if wire_id in excel_wire_lengths:
-                                    excel_length = excel_wire_lengths[wire_id]
-                                    if not self._approx_equal(xml_length, excel_length):
-                                        validation_results["wire_length_validation"].append(
-                                            f"Wire length mismatch for {wire_id}: "
-                                            f"XML={xml_length}, Excel={excel_length}"
-                                        )
-                                else:
-                                    validation_results["wire_length_validation"].append(
-                                        f"Wire {wire_id} not found in Excel Wires Length sheet"
-                                    )
-
-                except Exception as e:
-                    validation_results["wire_length_validation"].append(
-                        f"Error during wire length validation: {str(e)}"
-                    )
+                wire_nr_idx, length_idx = column_indexes
+                # Create mapping of wire numbers to lengths from Excel
+                excel_wire_lengths = {}
+                for row in data_rows:
+                    wire_nr = row[wire_nr_idx]
+                    if wire_nr:
+                        try:
+                            excel_wire_lengths[wire_nr.strip()] = float(row[length_idx])
+                        except (ValueError, TypeError):
+                            validation_results["wire_length_validation"].append(
+                                f"Invalid length value for wire {wire_nr} in Excel"
+                            )
+
+                # Find wire subassemblies in the XML and validate lengths
+                validation_results["wire_length_validation"].extend(wire_length_messages(
+                    self._subassembly_tables(), excel_wire_lengths, cut_wire_id,
+                    "Wires Length", skip_empty_quantity=True
+                ))
 
         except Exception as e:
             validation_results["wire_length_validation"].append(
                 f"Error during wire length validation: {str(e)}"
             )
 
+        # ====================================================================
+        # 4. Validate DPF component sheets (Tape, Splices, ...) against the BOM
+        # ====================================================================
+        try:
+            for messages in self.COMPONENT_RULES.run(self).values():
+                validation_results["component_validation"].extend(messages)
+        except Exception as e:
+            validation_results["component_validation"].append(
+                f"Error during component validation: {str(e)}"
+            )
+
         # Update overall status if there are any validation issues
         if (validation_results["mismatches"] or 
             validation_results["workcenter_validation"] or 
-            validation_results["wire_length_validation"]):
+            validation_results["wire_length_validation"] or
+            validation_results["component_validation"]):
             validation_results["status"] = "fail"
             validation_results["message"] = "Validation completed with mismatches"
 
         return validation_results
 
+    # Pipeline components _extract_wire_info_from_doc relies on: token heads come from the parser,
+    # which listens to tok2vec. Tagger, lemmatizer, NER etc. are skipped.
+    NLP_COMPONENTS = ("tok2vec", "parser")
+
+    def _extract_wire_info_batch(self, descriptions, n_process=1, batch_size=256):
+        """Extract wire info for many descriptions at once; returns {description: wire_info}."""
+        unique = list(dict.fromkeys(d for d in descriptions if d))
+        if not unique:
+            return {}
+        nlp = self.nlp
+        disable = [name for name in nlp.pipe_names if name not in self.NLP_COMPONENTS]
+        docs = nlp.pipe(
+            (description.lower() for description in unique),
+            disable=disable,
+            batch_size=batch_size,
+            n_process=n_process
+        )
+        return {
+            description: self._extract_wire_info_from_doc(description, doc)
+            for description, doc in zip(unique, docs)
+        }
+
     def _extract_wire_info_nlp(self, description):
         """Enhanced NLP method to extract wire information with better accuracy."""
         doc = self.nlp(description.lower())  # Process in lowercase for consistency
+        return self._extract_wire_info_from_doc(description, doc)
+
+    def _extract_wire_info_from_doc(self, description, doc):
+        """Pull wire numbers, colors and measurements out of an already processed description."""
         
         # Initialize result dict with all possible fields
         result = {
@@ -1130,21 +1314,10 @@ class SBOMValidator:
         # Fallback: If no structured data found, try pattern matching
         if not any([result['pitch'], result['untwist_a'], result['untwist_b'], result['twist_length']]):
             # Try to extract from common patterns
-            pitch_match = re.search(r'pitch:\s*([\d.]+)', description.lower())
-            if pitch_match:
-                result['pitch'] = float(pitch_match.group(1))
-                
-            untwist_a_match = re.search(r'untwist a:\s*([\d.]+)', description.lower())
-            if untwist_a_match:
-                result['untwist_a'] = float(untwist_a_match.group(1))
-                
-            untwist_b_match = re.search(r'untwist b:\s*([\d.]+)', description.lower())
-            if untwist_b_match:
-                result['untwist_b'] = float(untwist_b_match.group(1))
-                
-            twist_match = re.search(r'twist length:\s*([\d.]+)', description.lower())
-            if twist_match:
-                result['twist_length'] = float(twist_match.group(1))
+            parsed = parse_description(description, ignore_case=True)
+            for field in ('pitch', 'untwist_a', 'untwist_b', 'twist_length'):
+                if getattr(parsed, field) is not None:
+                    result[field] = getattr(parsed, field)
             
             # Lower confidence if we had to use fallback
             result['confidence'] = 0.7
@@ -1216,7 +1389,7 @@ class SBOMValidator:
         
         # Add NLP information
         pdf.cell(col_widths[0], 6, "NLP Model Used:", border=1)
-        pdf.cell(col_widths[1], 6, "en_core_web_sm", border=1, ln=1)
+        pdf.cell(col_widths[1], 6, self.nlp_model, border=1, ln=1)
         
         # Add timestamp
         pdf.ln(5)
@@ -1316,6 +1489,27 @@ class SBOMValidator:
                     pdf.cell(10, 5, "")
                     pdf.multi_cell(0, 5, f"* {mismatch}")
                     pdf.ln(1)
+
+        # =============================================
+        # Component Validation Results
+        # =============================================
+        if validation_results.get("component_validation"):
+            pdf.ln(10)
+            pdf.set_fill_color(31, 73, 125)  # Dark blue
+            pdf.set_text_color(255, 255, 255)  # White
+            pdf.set_font("Arial", 'B', 12)
+            pdf.cell(0, 8, "Component Validation Results", ln=1, fill=True)
+
+            pdf.set_text_color(255, 0, 0)  # Red
+            pdf.set_font("Arial", 'B', 10)
+            pdf.cell(0, 8, "FAILURE: DPF components missing from the SBOM", ln=1)
+
+            pdf.set_text_color(0, 0, 0)  # Black
+            pdf.set_font("Arial", '', 8)
+            for issue in validation_results["component_validation"]:
+                pdf.cell(10, 5, "")
+                pdf.multi_cell(0, 5, f"* {issue}")
+                pdf.ln(1)
         
         # =============================================
         # Summary Section
@@ -1331,7 +1525,8 @@ class SBOMValidator:
         
         workcenter_issues = len(validation_results.get("workcenter_validation", []))
         wire_mismatches = len(validation_results.get("mismatches", []))
-        total_issues = workcenter_issues + wire_mismatches
+        component_issues = len(validation_results.get("component_validation", []))
+        total_issues = workcenter_issues + wire_mismatches + component_issues
         
         # Create summary table
         pdf.set_font("Arial", 'B', 10)
@@ -1358,6 +1553,15 @@ class SBOMValidator:
         pdf.cell(40, 6, str(wire_mismatches), border=1)
         pdf.set_text_color(*status_color)
         pdf.cell(50, 6, status_text, border=1, ln=1)
+
+        # DPF Components row
+        status_color = (255, 0, 0) if component_issues > 0 else (0, 128, 0)
+        status_text = "FAIL" if component_issues > 0 else "PASS"
+        pdf.set_text_color(0, 0, 0)
+        pdf.cell(100, 6, "DPF Components (Tape, Splices, Terminals, Multicores)", border=1)
+        pdf.cell(40, 6, str(component_issues), border=1)
+        pdf.set_text_color(*status_color)
+        pdf.cell(50, 6, status_text, border=1, ln=1)
         
         # Overall Status row
         status_color = (255, 0, 0) if total_issues > 0 else (0, 128, 0)
@@ -1405,14 +1609,12 @@ class SBOMValidator:
         pdf.cell(0, 5, "This is an automatically generated NLP validation report", ln=1, align='C')
         pdf.cell(0, 5, "For any discrepancies, please contact the validation team", ln=1, align='C')
         
-        # Save the PDF to a temporary file
-        report_dir = "temp_reports"
-        os.makedirs(report_dir, exist_ok=True)
+        # Render in memory; the caller decides where (and whether) to store it
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_path = os.path.join(report_dir, f"sbom_nlp_validation_report_{timestamp}.pdf")
-        pdf.output(report_path)
-        
-        return {'report_path': report_path}
+        return {
+            'report_name': f"sbom_nlp_validation_report_{timestamp}.pdf",
+            'content': _pdf_bytes(pdf)
+        }
 
     def _approx_equal(self, a, b, tolerance=0.01):
         """Helper method to compare floating point numbers with tolerance."""
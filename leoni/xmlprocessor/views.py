@@ -3,13 +3,19 @@ from rest_framework.response import Response
 from rest_framework import status
 from lxml import etree
 import pandas as pd
-from .serializers import DatasetGeneration, DataPreparationSerializer, ReportSerializer
+from .serializers import DatasetGeneration, DataPreparationSerializer, ReportSerializer, ReportCursorPagination
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.hashers import check_password, make_password
 from django.core.exceptions import ValidationError
 from rest_framework_simplejwt.tokens import RefreshToken
 from .utils import SBOMValidator
-from .models import User, Report
+from .pipeline import validate_files
+from . import jobs
+from .batch import BatchError, run_batch, extract_archive, report_sources
+from .artifact_cache import get_artifact_cache
+from .parallel import get_executor
+from .instrumentation import stage, histograms
+from .models import User, Report, ValidationJob
 from .permissions import IsAdmin, IsOverseer, IsValidator
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
@@ -18,7 +24,10 @@ from django.utils.timezone import now
 from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from django.http import FileResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+import hmac
+import json
+import io
 import os
 import tempfile
 from django.conf import settings
@@ -34,47 +43,177 @@ from django.core.cache import cache
 @api_view(["POST"])
 def validate(request):
     try:
-        
-        validator = SBOMValidator(
-            xml_file_path=request.FILES['sbom'],
-            excel_file_path=request.FILES['excel_file']
+        with stage('upload'):
+            xml_file = request.FILES['sbom']
+            excel_file = request.FILES['excel_file']
+        wcpr = request.data.get("workcenter_plantreference")
+        wcpar = request.data.get("workcenter_productionareareference")
+        wcusfa = request.data.get("wokrcenter_usesinglefileassembly")
+
+        pdf_content, report_name = validate_files(xml_file, excel_file, wcpr, wcpar, wcusfa)
+
+        with stage('storage_write'):
+            try:
+                report = Report.objects.create(
+                    user=request.user,
+                    sbom=xml_file,
+                    dpf=excel_file
+                )
+            except Exception as e:
+                print(f"Failed to create Report: {str(e)}")
+                raise
+
+            report.content.save(report_name, ContentFile(pdf_content))
+
+        # Stream the bytes we already hold instead of reading the stored copy back
+        response = FileResponse(io.BytesIO(pdf_content), content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="{os.path.basename(report.content.name)}"'
+        return response
+
+    except Exception as e:
+        print(f"Error in validate(): {str(e)}")
+        return Response({"error": str(e)}, status=400)
+
+
+@api_view(["POST"])
+def submit_validation_job(request):
+    try:
+        job = jobs.enqueue(
+            request.user,
+            request.FILES['sbom'],
+            request.FILES['excel_file'],
+            request.data.get("workcenter_plantreference"),
+            request.data.get("workcenter_productionareareference"),
+            request.data.get("wokrcenter_usesinglefileassembly"),
         )
-        validator.wcpr = request.data.get("workcenter_plantreference")
-        validator.wcpar = request.data.get("workcenter_productionareareference")
-        validator.wcusfa = request.data.get("wokrcenter_usesinglefileassembly")
+    except jobs.QueueFull as e:
+        return Response({"error": str(e)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+    except Exception as e:
+        print(f"Error in submit_validation_job(): {str(e)}")
+        return Response({"error": str(e)}, status=400)
 
-        sheetwirelength = validator.get_sheet_by_name("Wires Lengths")
-        sbomsub = validator.get_subassemblies(flatten_attributes=True)
-        results = validator.validate()
-        gen_results = validator.generate_report(results)
+    return Response({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": request.build_absolute_uri(reverse('validation-job-status', kwargs={'pk': job.id})),
+    }, status=status.HTTP_202_ACCEPTED)
 
-        with open(gen_results['report_path'], 'rb') as pdf_file:
-            pdf_content = pdf_file.read()
+@api_view(["GET"])
+def validation_job_status(request, pk):
+    try:
+        job = ValidationJob.objects.get(id=pk, user=request.user)
+    except ValidationJob.DoesNotExist:
+        return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    data = {
+        "job_id": job.id,
+        "status": job.status,
+        "error": job.error or None,
+        "report_id": job.report_id,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+    if job.status == 'done':
+        data["download_url"] = request.build_absolute_uri(reverse('validation-job-download', kwargs={'pk': job.id}))
+    return Response(data)
 
-        try:
-            report = Report.objects.create(
-                user=request.user,
-                sbom=request.FILES['sbom'],
-                dpf=request.FILES['excel_file']
-            )
-        except Exception as e:
-            print(f"Failed to create Report: {str(e)}")
-            raise
+@api_view(["GET"])
+def download_validation_job(request, pk):
+    try:
+        job = ValidationJob.objects.select_related('report').get(id=pk, user=request.user)
+    except ValidationJob.DoesNotExist:
+        return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        report.content.save(
-            os.path.basename(gen_results['report_path']),
-            ContentFile(pdf_content)
-        )
+    if job.status != 'done' or job.report is None:
+        return Response({"error": f"Job is {job.status}", "status": job.status}, status=status.HTTP_409_CONFLICT)
 
-        os.remove(gen_results['report_path'])
-        response = FileResponse(report.content.open('rb'), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{os.path.basename(report.content.name)}"'
-        #return Response({"wires in excel": f"sheets wire: {sheetwirelength["data"]}", "wires in xml": f"xml wire: {sbomsub[6].get('quantity')}"})
-        return response
+    response = FileResponse(job.report.content.open('rb'), content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="{os.path.basename(job.report.content.name)}"'
+    return response
 
-    except Exception as e:
-        print(f"Error in validate(): {str(e)}")
+
+@api_view(["POST"])
+def validate_batch(request):
+    """
+    Validate many SBOMs against one or more DPFs: a zip of .xml/.xlsx files ('archive') or the
+    files of stored reports ('report_ids'); uploaded 'excel_file's replace the DPFs. Streams one
+    JSON line per SBOM/DPF pair as it finishes, then a summary line.
+    """
+    workdir = tempfile.TemporaryDirectory(prefix='sbom-batch-')
+    try:
+        archive = request.FILES.get('archive')
+        report_ids = request.data.getlist('report_ids') if hasattr(request.data, 'getlist') \
+            else request.data.get('report_ids', [])
+        if isinstance(report_ids, (str, int)):
+            report_ids = [report_ids]
+        report_ids = [int(i) for value in report_ids for i in str(value).split(',') if i.strip()]
+
+        if archive is not None:
+            sboms, dpfs = extract_archive(archive, workdir.name)
+        elif report_ids:
+            reports = Report.objects.filter(id__in=report_ids)
+            if getattr(request.user, 'role', None) not in ('admin', 'overseer'):
+                reports = reports.filter(user=request.user)
+            reports = list(reports)
+            missing = sorted(set(report_ids) - {report.id for report in reports})
+            if missing:
+                workdir.cleanup()
+                return Response({"error": f"Reports not found: {missing}"}, status=status.HTTP_404_NOT_FOUND)
+            sboms, dpfs = report_sources(reports)
+        else:
+            workdir.cleanup()
+            return Response({"error": "Send an 'archive' zip or 'report_ids'"}, status=400)
+
+        uploaded_dpfs = request.FILES.getlist('excel_file')
+        if uploaded_dpfs:
+            dpfs = []
+            for number, excel_file in enumerate(uploaded_dpfs):
+                path = os.path.join(workdir.name, f"dpf_{number}_{os.path.basename(excel_file.name)}")
+                with open(path, 'wb') as destination:
+                    for chunk in excel_file.chunks():
+                        destination.write(chunk)
+                dpfs.append((excel_file.name, path))
+
+        workcenter = {
+            'wcpr': request.data.get("workcenter_plantreference"),
+            'wcpar': request.data.get("workcenter_productionareareference"),
+            'wcusfa': request.data.get("wokrcenter_usesinglefileassembly"),
+        }
+        entries = run_batch(
+            sboms, dpfs, workcenter,
+            executor=get_executor('SBOM_BATCH_WORKERS'),
+            artifact_cache=get_artifact_cache()
+        )
+    except (BatchError, ValueError) as e:
+        workdir.cleanup()
         return Response({"error": str(e)}, status=400)
+    except Exception:
+        workdir.cleanup()
+        raise
+
+    def stream():
+        # The extracted files have to outlive the view, until the last item is validated
+        try:
+            for entry in entries:
+                yield json.dumps(entry, default=str) + "\n"
+        finally:
+            workdir.cleanup()
+
+    return StreamingHttpResponse(stream(), content_type='application/x-ndjson')
+
+
+def metrics(request):
+    """
+    Stage duration histograms in the Prometheus text format, served to scrapers sending
+    "Authorization: Bearer <SBOM_METRICS_TOKEN>" (not found at all while no token is set).
+    """
+    token = getattr(settings, 'SBOM_METRICS_TOKEN', '')
+    if not getattr(settings, 'SBOM_INSTRUMENTATION_ENABLED', False) or not token:
+        return HttpResponse(status=404)
+    if not hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', '').encode(), f"Bearer {token}".encode()):
+        return HttpResponse(status=403)
+    return HttpResponse(histograms.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 
 @api_view(["POST"])
@@ -124,9 +263,11 @@ def data_preparation_file_process(request):
 #Validator
 @api_view(["GET"])
 def get_self_reports(request):
-    reports = Report.objects.filter(user=request.user).order_by('-created_at')
-    serializer = ReportSerializer(reports, many=True, context={'request': request})
-    return Response(serializer.data)
+    reports = Report.objects.filter(user=request.user).select_related('user')
+    paginator = ReportCursorPagination()
+    page = paginator.paginate_queryset(reports, request)
+    serializer = ReportSerializer(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
 
 @api_view(['DELETE'])
 def delete_validator_report(request, pk):
@@ -138,6 +279,7 @@ def delete_validator_report(request, pk):
             status=status.HTTP_404_NOT_FOUND
         )
     
+    # sbom/dpf are shared blobs: this drops one reference, the file goes with the last one
     report.sbom.delete(save=False)
     report.dpf.delete(save=False)
     report.content.delete(save=False)
@@ -374,9 +516,11 @@ def send_email(request):
 @api_view(["GET"])
 #@permission_classes([IsOverseer | IsAdmin]) 
 def view_all_reports(request):
-    reports = Report.objects.all().order_by('-created_at')
-    serializer = ReportSerializer(reports, many=True, context={'request': request})
-    return Response(serializer.data)
+    reports = Report.objects.select_related('user')
+    paginator = ReportCursorPagination()
+    page = paginator.paginate_queryset(reports, request)
+    serializer = ReportSerializer(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
 
 @api_view(["POST"])
 def upload_report(request):
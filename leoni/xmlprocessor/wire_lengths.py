@@ -0,0 +1,105 @@
+import re
+
+import numpy as np
+
+LENGTH_UNITS = ('per length', 'length')
+
+_CUT_WIRE = re.compile(r"(\d+\(\d+\))\s+CUT\b", re.IGNORECASE)
+
+
+def first_token_wire_id(name):
+    """Wire id as the first token of the subassembly name ("113 CUT" -> "113")."""
+    name = (name or '').strip()
+    return name.split()[0] if name else None
+
+
+def cut_wire_id(name):
+    """Wire id of a "<wire>(<n>) CUT" subassembly name ("45(2) CUT" -> "45(2)")."""
+    match = _CUT_WIRE.search(name or '')
+    return match.group(1) if match else None
+
+
+def _parse_quantity(value):
+    try:
+        return float(value), False
+    except (TypeError, ValueError):
+        return np.nan, True
+
+
+def _codes(table, name):
+    codes, values = table.codes(name)
+    return np.frombuffer(codes, dtype=codes.typecode), values
+
+
+def wire_length_messages(tables, excel_lengths, wire_id, sheet_label,
+                         skip_empty_quantity=False, tolerance=0.01):
+    """
+    Compare the lengths of the wire subassemblies in `tables` (columnar subassembly tables)
+    with `excel_lengths` ({wire id: length or None}) and return the mismatch messages in
+    subassembly order.
+
+    A subassembly is a wire when its unit is a length unit, it has a quantity (a non-empty
+    one with skip_empty_quantity) and wire_id(name) gives an id. Names, quantities and units
+    are classified once per distinct value through the tables' string dictionaries; the
+    per-row work (filter, join on wire id, tolerance check) is done on NumPy arrays.
+
+    A None length (a listed wire without a value) gives "Missing length value for wire ...".
+    Only validate() builds such maps; validate_with_nlp() reports unreadable lengths as
+    "Invalid length value" while building its map and never passes None here (its old
+    per-row loop would have failed with a TypeError on one).
+    """
+    excel_index = {wire: position for position, wire in enumerate(excel_lengths)}
+    # One trailing dummy slot so rows without a match can still be gathered
+    excel_values = np.array([np.nan if length is None else length for length in excel_lengths.values()]
+                            + [np.nan], dtype=float)
+    excel_missing = np.array([length is None for length in excel_lengths.values()] + [False], dtype=bool)
+    not_found_position = len(excel_lengths)
+
+    messages = []
+    for table in tables:
+        if not len(table) or not {'name', 'quantity', 'unitofmeasure'} <= set(table.columns):
+            continue
+        name_codes, names = _codes(table, 'name')
+        quantity_codes, quantities = _codes(table, 'quantity')
+        unit_codes, units = _codes(table, 'unitofmeasure')
+
+        # Per distinct value
+        wire_ids = [wire_id(name) for name in names]
+        has_wire_id = np.array([bool(wire) for wire in wire_ids], dtype=bool)
+        excel_position = np.array([excel_index.get(wire, not_found_position) if wire else not_found_position
+                                   for wire in wire_ids], dtype=np.intp)
+        is_length_unit = np.array([(unit or '').lower() in LENGTH_UNITS for unit in units], dtype=bool)
+        has_quantity = np.array([q is not None and (bool(q) or not skip_empty_quantity) for q in quantities],
+                                dtype=bool)
+        parsed = [_parse_quantity(q) for q in quantities]
+        quantity_values = np.array([value for value, _ in parsed], dtype=float)
+        quantity_invalid = np.array([invalid for _, invalid in parsed], dtype=bool)
+
+        # Per row
+        rows = np.flatnonzero(is_length_unit[unit_codes] & has_quantity[quantity_codes] & has_wire_id[name_codes])
+        row_names = name_codes[rows]
+        row_quantities = quantity_codes[rows]
+        invalid = quantity_invalid[row_quantities]
+        xml_lengths = quantity_values[row_quantities]
+        position = excel_position[row_names]
+        found = position != not_found_position
+        missing = excel_missing[position]
+        with np.errstate(invalid='ignore'):
+            differs = ~(np.abs(xml_lengths - excel_values[position]) <= tolerance)
+        mismatch = found & ~missing & differs
+        problem = invalid | (found & missing) | mismatch | ~found
+
+        for i in np.flatnonzero(problem):
+            wire = wire_ids[row_names[i]]
+            if invalid[i]:
+                messages.append(f"Invalid quantity value for wire {wire} in XML")
+            elif not found[i]:
+                messages.append(f"Wire {wire} not found in Excel {sheet_label} sheet")
+            elif missing[i]:
+                messages.append(f"Missing length value for wire {wire} in Excel")
+            else:
+                messages.append(
+                    f"Wire length mismatch for {wire}: "
+                    f"XML={float(xml_lengths[i])}, Excel={excel_lengths[wire]}"
+                )
+    return messages
@@ -0,0 +1,100 @@
+import xml.etree.ElementTree as ET
+
+from django.conf import settings
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - lxml is optional, the stdlib engine covers for it
+    etree = None
+
+# Elements the SBOM parser collects inside each <sbom>
+ELEMENT_TAGS = ('sbomsubassembly', 'costresult', 'bomelement')
+
+ENGINES = ('lxml', 'stdlib')
+
+
+def _project(attrib, names):
+    """Copy of an element's attributes, limited to names (all of them when None)."""
+    if names is None:
+        return dict(attrib)
+    return {name: attrib[name] for name in names if name in attrib}
+
+
+def iter_stdlib(source, wanted):
+    """
+    Stream (tag, attributes) for every <sbom> (depth 2) and the wanted elements inside it,
+    with xml.etree.iterparse. wanted is {tag: [attribute names] or None for all}.
+    """
+    # Attributes are copied out as elements start and finished children are dropped from
+    # their parent, so memory stays bounded by the depth of the document, not its size.
+    open_elements = []
+    in_sbom = False
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            open_elements.append(elem)
+            depth = len(open_elements)
+            if depth == 2 and elem.tag == 'sbom':
+                in_sbom = True
+                yield 'sbom', dict(elem.attrib)
+            elif depth > 2 and in_sbom and elem.tag in wanted:
+                names = wanted[elem.tag]
+                if elem.tag == 'sbomsubassembly':
+                    # Only the top-level subassemblies; the table copies the values out itself
+                    if depth == 3:
+                        yield elem.tag, elem.attrib if names is None else _project(elem.attrib, names)
+                else:
+                    yield elem.tag, _project(elem.attrib, names)
+        else:
+            open_elements.pop()
+            if len(open_elements) == 1:
+                in_sbom = False
+            if open_elements:
+                open_elements[-1].clear()
+
+
+if etree is not None:
+    # No DTDs, entities or network access; huge_tree lifts libxml2's depth and text-node
+    # limits that large SBOM exports can hit (entities aren't expanded, so that's safe)
+    _LXML_PARSER_OPTIONS = dict(
+        huge_tree=True, resolve_entities=False, no_network=True, load_dtd=False,
+        remove_comments=True, remove_pis=True, collect_ids=False,
+    )
+    _SBOMS = etree.XPath('/*/sbom')
+    _ELEMENTS = {
+        'sbomsubassembly': etree.XPath('sbomsubassembly'),
+        'costresult': etree.XPath('.//costresult'),
+        'bomelement': etree.XPath('.//bomelement'),
+    }
+
+
+def iter_lxml(source, wanted):
+    """Same events as iter_stdlib from one lxml parse and the precompiled XPath expressions."""
+    root = etree.parse(source, etree.XMLParser(**_LXML_PARSER_OPTIONS)).getroot()
+    for sbom in _SBOMS(root):
+        yield 'sbom', dict(sbom.attrib)
+        # Grouped by tag rather than interleaved; each tag still comes in document order
+        for tag, xpath in _ELEMENTS.items():
+            if tag not in wanted:
+                continue
+            names = wanted[tag]
+            for elem in xpath(sbom):
+                # items()/get() are much cheaper than going through the lxml attrib proxy
+                if names is None:
+                    yield tag, dict(elem.items())
+                else:
+                    get = elem.get
+                    yield tag, {name: value for name in names if (value := get(name)) is not None}
+
+
+def get_engine(name=None):
+    """
+    Event iterator of an engine name; None takes SBOM_XML_ENGINE. 'lxml' falls back to the
+    stdlib engine when lxml isn't installed.
+    """
+    if name is None:
+        name = getattr(settings, 'SBOM_XML_ENGINE', 'stdlib')
+    if name not in ENGINES:
+        raise ValueError(f"Unknown XML engine: {name}")
+    if name == 'lxml' and etree is not None:
+        return iter_lxml
+    return iter_stdlib